@@ -0,0 +1,173 @@
+"""
+Admission control for Me-API Playground
+Per-client token buckets plus load shedding of low-priority routes when the
+database pool is saturated
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+from batch import BATCH_SESSION_KEY
+from database import engine
+from metrics import metrics
+
+ADMISSION_RATE = float(os.getenv("ADMISSION_RATE", "50"))  # requests per second per client
+ADMISSION_BURST = float(os.getenv("ADMISSION_BURST", "100"))
+ADMISSION_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "64"))
+ADMISSION_MAX_POOL_WAIT_MS = float(os.getenv("ADMISSION_MAX_POOL_WAIT_MS", "50"))
+ADMISSION_POOL_SATURATION = float(os.getenv("ADMISSION_POOL_SATURATION", "0.9"))
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))
+# Paths (exact match) that are shed first under load
+ADMISSION_LOW_PRIORITY = [
+    p for p in os.getenv("ADMISSION_LOW_PRIORITY", "/search,/skills/search,/projects,/changes").split(",") if p
+]
+# Probes and long-lived streams are neither rate limited nor counted as in flight
+ADMISSION_EXEMPT = ("/health", "/livez", "/readyz", "/metrics", "/events")
+
+MAX_TRACKED_CLIENTS = 10000
+POOL_WAIT_SMOOTHING = 0.2
+# Seconds for the smoothed wait to halve without new samples; shedding stops
+# the samples (low-priority requests never reach get_db), so it must decay on its own
+POOL_WAIT_HALF_LIFE = 1.0
+
+
+class PoolMonitor:
+    """Smoothed connection checkout wait and current pool utilisation"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._wait_ms = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _decayed(self, now: float) -> float:
+        return self._wait_ms * 0.5 ** ((now - self._updated) / POOL_WAIT_HALF_LIFE)
+
+    @property
+    def wait_ms(self) -> float:
+        return self._decayed(time.monotonic())
+
+    def record_wait(self, seconds: float):
+        metrics.observe("admission.pool_wait_seconds", seconds)
+        with self._lock:
+            now = time.monotonic()
+            current = self._decayed(now)
+            self._wait_ms = current + POOL_WAIT_SMOOTHING * (seconds * 1000 - current)
+            self._updated = now
+
+    def saturation(self) -> float:
+        """Checked-out connections as a fraction of the pool's capacity (0 if unbounded)"""
+        pool = self.engine.pool
+        if not hasattr(pool, "checkedout"):
+            return 0.0
+        capacity = pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+        return pool.checkedout() / capacity if capacity > 0 else 0.0
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, burst: float):
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self, rate: float, burst: float) -> Tuple[bool, float]:
+        """Consume one token; returns (allowed, seconds until a token is available)"""
+        now = time.monotonic()
+        self.tokens = min(burst, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True, 0.0
+        return False, (1 - self.tokens) / rate if rate > 0 else float(ADMISSION_RETRY_AFTER)
+
+
+pool_monitor = PoolMonitor(engine)
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware that rate limits clients (429) and sheds low-priority
+    routes (503) once in-flight requests, pool wait or pool utilisation pass
+    their thresholds. Core profile routes are never shed.
+    """
+
+    def __init__(self, app, rate: float = ADMISSION_RATE, burst: float = ADMISSION_BURST,
+                 max_in_flight: int = ADMISSION_MAX_IN_FLIGHT, max_pool_wait_ms: float = ADMISSION_MAX_POOL_WAIT_MS,
+                 pool_saturation: float = ADMISSION_POOL_SATURATION, low_priority=ADMISSION_LOW_PRIORITY):
+        self.app = app
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.max_pool_wait_ms = max_pool_wait_ms
+        self.pool_saturation = pool_saturation
+        self.low_priority = frozenset(low_priority)
+        self.in_flight = 0
+        self.buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+    async def __call__(self, scope, receive, send):
+        # /batch items were admitted with their batch; charging them again would let a batch throttle itself
+        if scope["type"] != "http" or scope["path"].startswith(ADMISSION_EXEMPT) or BATCH_SESSION_KEY in scope:
+            await self.app(scope, receive, send)
+            return
+
+        allowed, retry_after = self._take_token(self._client_key(scope))
+        if not allowed:
+            metrics.inc("admission.rate_limited")
+            await _reject(send, 429, "Rate limit exceeded", retry_after)
+            return
+
+        if self._is_low_priority(scope["path"]) and self._overloaded():
+            metrics.inc("admission.shed")
+            await _reject(send, 503, "Server busy, try again later", ADMISSION_RETRY_AFTER)
+            return
+
+        self.in_flight += 1
+        metrics.observe("admission.in_flight", self.in_flight)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+
+    def _client_key(self, scope) -> str:
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def _take_token(self, key: str) -> Tuple[bool, float]:
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TokenBucket(self.burst)
+            if len(self.buckets) > MAX_TRACKED_CLIENTS:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(key)
+        return bucket.take(self.rate, self.burst)
+
+    def _is_low_priority(self, path: str) -> bool:
+        # Exact paths: "/projects" is the skill scan, "/projects/all" is not shed
+        return path in self.low_priority
+
+    def _overloaded(self) -> bool:
+        return (
+            self.in_flight >= self.max_in_flight
+            or pool_monitor.wait_ms >= self.max_pool_wait_ms
+            or pool_monitor.saturation() >= self.pool_saturation
+        )
+
+
+async def _reject(send, status: int, detail: str, retry_after: float):
+    body = json.dumps({"detail": detail}).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("latin-1")),
+            (b"retry-after", str(max(1, int(retry_after + 0.999))).encode("latin-1")),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
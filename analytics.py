@@ -0,0 +1,103 @@
+"""
+Precomputed analytics rollups for Me-API Playground
+Skill level distribution per category, technology usage by project start
+month and current versus past employment, rebuilt in the background and
+served as pre-encoded JSON
+"""
+
+import json
+import os
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+import models
+from background import SnapshotRefresher
+
+ANALYTICS_REFRESH_INTERVAL = float(os.getenv("ANALYTICS_REFRESH_INTERVAL", "30"))
+
+UNCATEGORIZED = "uncategorized"
+UNDATED = "undated"
+
+
+def skill_levels(db: Session) -> dict:
+    """Skill count per category and level"""
+    skills = models.Skill.__table__
+    category = func.coalesce(skills.c.category, UNCATEGORIZED)
+    level = func.coalesce(skills.c.level, "intermediate")
+    rows = db.execute(
+        select(category, level, func.count()).group_by(category, level).order_by(category, level)
+    ).all()
+    categories: Dict[str, Dict[str, int]] = defaultdict(dict)
+    for name, lvl, count in rows:
+        categories[name][lvl] = count
+    return {
+        "categories": [
+            {"category": name, "total": sum(levels.values()), "levels": levels}
+            for name, levels in categories.items()
+        ],
+        "total": sum(count for _, _, count in rows),
+    }
+
+
+def technology_trends(db: Session) -> dict:
+    """Projects using each technology, by project start month (YYYY-MM)"""
+    projects = models.Project.__table__
+    by_technology: Dict[str, Dict[str, int]] = {}
+    display: Dict[str, str] = {}
+    months = set()
+    for start_date, technologies in db.execute(select(projects.c.start_date, projects.c.technologies)):
+        month = start_date.strftime("%Y-%m") if start_date else UNDATED
+        months.add(month)
+        # A technology listed twice in one project counts once
+        for key, name in {t.strip().lower(): t.strip() for t in technologies or [] if t and t.strip()}.items():
+            display.setdefault(key, name)
+            counts = by_technology.setdefault(key, {})
+            counts[month] = counts.get(month, 0) + 1
+    return {
+        "months": sorted(months),
+        "technologies": sorted(
+            (
+                {"technology": display[key], "total": sum(counts.values()), "by_month": dict(sorted(counts.items()))}
+                for key, counts in by_technology.items()
+            ),
+            key=lambda item: (-item["total"], item["technology"].lower()),
+        ),
+    }
+
+
+def employment(db: Session) -> dict:
+    """Current versus past positions, and profiles with at least one current position"""
+    work = models.WorkExperience.__table__
+    is_current = func.coalesce(work.c.is_current, False)
+    current, past, employed = db.execute(
+        select(
+            func.count(case((is_current, 1))),
+            func.count(case((~is_current, 1))),
+            func.count(func.distinct(case((is_current, work.c.profile_id)))),
+        )
+    ).one()
+    return {"current": current, "past": past, "total": current + past, "profiles_currently_employed": employed}
+
+
+ROLLUPS = {
+    "skill-levels": skill_levels,
+    "technology-trends": technology_trends,
+    "employment": employment,
+}
+
+
+def build_rollups(db: Session) -> Dict[str, bytes]:
+    """Every rollup, encoded to JSON once so requests only copy bytes"""
+    generated_at = datetime.now(timezone.utc).isoformat()
+    encoded = {}
+    for name, compute in ROLLUPS.items():
+        payload = dict(compute(db), generated_at=generated_at)
+        encoded[name] = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return encoded
+
+
+rollups = SnapshotRefresher("analytics", build_rollups, ANALYTICS_REFRESH_INTERVAL)
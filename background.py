@@ -0,0 +1,102 @@
+"""
+Background refresh of derived in-memory structures for Me-API Playground
+A SnapshotRefresher rebuilds (or incrementally updates) a structure in a
+worker thread whenever the change log moves, and swaps it in atomically
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+import change_log
+from database import SessionLocal
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Above this many pending changes a full rebuild is cheaper than replaying them
+MAX_INCREMENTAL_CHANGES = 500
+
+
+class SnapshotRefresher:
+    """
+    Keeps build(db) up to date with the database.
+
+    Args:
+        name: Label used in logs and metrics
+        build: Builds the structure from scratch; runs in a worker thread
+        interval: Seconds between change log checks
+        apply_changes: Optional incremental path, called as
+            apply_changes(db, value, changes) with change log entries; it
+            updates value in place (or returns a replacement)
+    """
+
+    def __init__(self, name: str, build: Callable[[Session], Any], interval: float,
+                 apply_changes: Optional[Callable[[Session, Any, List[dict]], Any]] = None):
+        self.name = name
+        self.build = build
+        self.interval = interval
+        self.apply_changes = apply_changes
+        self.value: Any = None
+        self.token: Optional[int] = None
+        self.built_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=f"refresh-{self.name}")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def get(self):
+        """Current value, building it on first use"""
+        if self.value is None:
+            await self.refresh()
+        return self.value
+
+    async def refresh(self, force: bool = False):
+        async with self._lock:
+            await run_in_threadpool(self._refresh_sync, force)
+
+    def _refresh_sync(self, force: bool):
+        db = SessionLocal()
+        try:
+            token = change_log.latest_token(db)
+            if not force and self.value is not None and token == self.token:
+                return
+            started = time.perf_counter()
+            if not force and self.value is not None and self.apply_changes is not None:
+                changes = change_log.get_changes(db, self.token, MAX_INCREMENTAL_CHANGES + 1)
+                if len(changes) <= MAX_INCREMENTAL_CHANGES:
+                    result = self.apply_changes(db, self.value, changes)
+                    if result is not None:
+                        self.value = result
+                    self.token = changes[-1]["token"] if changes else token
+                    metrics.observe(f"refresh.{self.name}.incremental_seconds", time.perf_counter() - started)
+                    return
+            value = self.build(db)
+            # Swap in one assignment; readers never see a half-built value
+            self.value, self.token, self.built_at = value, token, time.time()
+            metrics.observe(f"refresh.{self.name}.rebuild_seconds", time.perf_counter() - started)
+        finally:
+            db.close()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Refreshing {self.name} failed: {e}")
@@ -0,0 +1,121 @@
+"""
+Batch request dispatcher for Me-API Playground
+Runs a list of sub-requests against the app in-process and collects their responses
+"""
+
+import asyncio
+import json
+import os
+from typing import Any, Dict, List
+from urllib.parse import urlsplit
+
+from sqlalchemy.orm import Session
+
+import profile_schemas
+
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "20"))
+
+# Scope key under which sub-requests find the batch's shared DB session
+BATCH_SESSION_KEY = "batch_session"
+
+# Methods that do not write and can therefore run concurrently
+SAFE_METHODS = {"GET", "HEAD"}
+
+
+async def run_batch(app, items: List[profile_schemas.BatchRequestItem], db: Session, parent_scope: dict) -> List[Dict[str, Any]]:
+    """
+    Execute sub-requests and return one response dict per item, in order.
+
+    Consecutive reads are dispatched together with asyncio.gather; each write
+    runs on its own so later items observe its effects.
+    """
+    results: List[Dict[str, Any]] = [None] * len(items)
+    pending_reads: List[int] = []
+
+    async def flush_reads():
+        if not pending_reads:
+            return
+        responses = await asyncio.gather(*(_dispatch(app, items[i], db, parent_scope) for i in pending_reads))
+        for index, response in zip(pending_reads, responses):
+            results[index] = response
+        pending_reads.clear()
+
+    for index, item in enumerate(items):
+        if item.method.upper() in SAFE_METHODS:
+            pending_reads.append(index)
+            continue
+        await flush_reads()
+        results[index] = await _dispatch(app, item, db, parent_scope)
+    await flush_reads()
+
+    for item, result in zip(items, results):
+        result["id"] = item.id
+    return results
+
+
+async def _dispatch(app, item: profile_schemas.BatchRequestItem, db: Session, parent_scope: dict) -> Dict[str, Any]:
+    """Run one sub-request through the ASGI app and capture its response"""
+    url = urlsplit(item.path)
+    # Nested batches and never-ending event streams cannot be multiplexed
+    if not url.path.startswith("/") or url.path.rstrip("/") == "/batch" or url.path.startswith("/events"):
+        return {"status": 400, "headers": {}, "body": {"detail": "Invalid sub-request path"}}
+
+    body = b"" if item.body is None else json.dumps(item.body).encode("utf-8")
+    try:
+        headers = [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in (item.headers or {}).items()]
+    except UnicodeEncodeError:
+        # HTTP header values are latin-1; reject this item only, not the whole batch
+        return {"status": 400, "headers": {}, "body": {"detail": "Sub-request headers must be latin-1 encodable"}}
+    headers = [h for h in headers if h[0] not in (b"content-length", b"accept-encoding")]
+    if body:
+        headers.append((b"content-type", b"application/json"))
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+
+    scope = {
+        "type": "http",
+        "asgi": parent_scope.get("asgi", {"version": "3.0"}),
+        "http_version": parent_scope.get("http_version", "1.1"),
+        "method": item.method.upper(),
+        "scheme": parent_scope.get("scheme", "http"),
+        "server": parent_scope.get("server"),
+        "client": parent_scope.get("client"),
+        "root_path": parent_scope.get("root_path", ""),
+        "path": url.path,
+        "raw_path": url.path.encode("utf-8"),
+        "query_string": url.query.encode("utf-8"),
+        "headers": headers,
+        BATCH_SESSION_KEY: db,
+    }
+
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # Sub-requests never disconnect; block like an idle client would
+        await asyncio.Event().wait()
+
+    response = {"status": 500, "headers": {}, "chunks": []}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {k.decode("latin-1"): v.decode("latin-1") for k, v in message.get("headers", [])}
+        elif message["type"] == "http.response.body":
+            response["chunks"].append(message.get("body", b""))
+
+    try:
+        await app(scope, receive, send)
+    except Exception as e:
+        return {"status": 500, "headers": {}, "body": {"detail": f"Sub-request failed: {e}"}}
+
+    raw = b"".join(response["chunks"])
+    content_type = response["headers"].get("content-type", "")
+    if content_type.startswith("application/json") and raw:
+        payload: Any = json.loads(raw)
+    else:
+        payload = raw.decode("utf-8", errors="replace") if raw else None
+    headers = {k: v for k, v in response["headers"].items() if k not in ("content-length", "content-type")}
+    return {"status": response["status"], "headers": headers, "body": payload}
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for Me-API Playground data access paths
+Runs against a throwaway SQLite database so real data is never touched
+
+Usage:
+    python benchmark.py writes --profiles 200 --iterations 500
+    python benchmark.py reads --profiles 1000 --page-size 100 --iterations 200
+    python benchmark.py read-model --profiles 10000 --iterations 200
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import models
+import profile_crud
+import profile_documents
+import profile_schemas
+import read_path
+from read_model import ReadModel
+
+
+def make_database(profiles: int, skills_per_profile: int = 5, projects_per_profile: int = 0):
+    """Create a temporary seeded SQLite database and return (sessionmaker, path)"""
+    fd, path = tempfile.mkstemp(suffix=".db", prefix="meapi_bench_")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    models.Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = Session()
+    for i in range(profiles):
+        profile = models.Profile(
+            name=f"Bench User {i}",
+            email=f"bench{i}@example.com",
+            bio="Benchmark profile " * 10,
+            location="Benchmark City",
+        )
+        profile.skills = [
+            models.Skill(name=f"Skill{j}", level="intermediate", category="programming")
+            for j in range(skills_per_profile)
+        ]
+        profile.projects = [
+            models.Project(title=f"Project {i}.{j}", description="Benchmark project " * 5,
+                           technologies=["Python", "FastAPI", f"Tech{j}"], github_url=f"https://github.com/bench/{i}-{j}")
+            for j in range(projects_per_profile)
+        ]
+        db.add(profile)
+    db.commit()
+    db.close()
+    return Session, engine, path
+
+
+def count_statements(engine):
+    """Attach a statement counter to an engine; returns a one-item list holding the count"""
+    counter = [0]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        counter[0] += 1
+
+    return counter
+
+
+def time_calls(fn, iterations: int):
+    """Run fn(i) iterations times and return per-call latencies in microseconds"""
+    samples = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - started) * 1e6)
+    return samples
+
+
+def report(label: str, samples, statements: int, iterations: int):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"  {label:<28} mean {statistics.mean(samples):8.1f} us   "
+          f"p50 {statistics.median(samples):8.1f} us   p95 {p95:8.1f} us   "
+          f"{statements / iterations:.1f} stmts/call")
+
+
+def bench_writes(args):
+    """Compare ORM load/mutate/commit/refresh against UPDATE/DELETE ... RETURNING"""
+    Session, engine, path = make_database(args.profiles)
+    counter = count_statements(engine)
+    try:
+        print(f"📝 Write path benchmark ({args.profiles} profiles, {args.iterations} iterations)")
+        db = Session()
+
+        def orm_update(i):
+            profile_id = i % args.profiles + 1
+            profile_crud._update_orm(db, models.Profile, profile_id, {"location": f"City {i}"})
+
+        def returning_update(i):
+            profile_id = i % args.profiles + 1
+            update = profile_schemas.ProfileUpdate(location=f"Town {i}")
+            profile_crud.update_profile(db, profile_id, update)
+
+        for label, fn in (("update (ORM)", orm_update), ("update (RETURNING)", returning_update)):
+            counter[0] = 0
+            samples = time_calls(fn, args.iterations)
+            report(label, samples, counter[0], args.iterations)
+
+        # Each delete variant removes its own half of the skills
+        skill_count = args.profiles * 5
+        half = min(args.iterations, skill_count // 2)
+
+        def orm_delete(i):
+            profile_crud._delete_orm(db, models.Skill, i + 1)
+
+        def returning_delete(i):
+            profile_crud.delete_skill(db, half + i + 1)
+
+        for label, fn in (("delete (ORM)", orm_delete), ("delete (RETURNING)", returning_delete)):
+            counter[0] = 0
+            samples = time_calls(fn, half)
+            report(label, samples, counter[0], half)
+        db.close()
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+def measure_allocations(fn, iterations: int):
+    """Mean peak traced memory per call in KiB"""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for i in range(iterations):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            fn(i)
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+    return statistics.mean(peaks) / 1024
+
+
+def bench_reads(args):
+    """Compare ORM + response model serialization against Core rows encoded straight to JSON"""
+    Session, engine, path = make_database(args.profiles, projects_per_profile=2)
+    counter = count_statements(engine)
+    page = args.page_size
+    profiles_adapter = TypeAdapter(List[profile_schemas.Profile])
+    projects_adapter = TypeAdapter(List[profile_schemas.Project])
+    skills_adapter = TypeAdapter(List[profile_schemas.Skill])
+
+    def serialize(adapter, objects) -> bytes:
+        # What FastAPI does with a response_model: validate from attributes, encode, dump
+        return JSONResponse(jsonable_encoder(adapter.validate_python(objects, from_attributes=True))).body
+
+    try:
+        print(f"📖 Read path benchmark ({args.profiles} profiles, {page}-row pages, {args.iterations} iterations)")
+        db = Session()
+        pages = max(1, args.profiles // page)
+
+        cases = (
+            ("profiles page (ORM)",
+             lambda i: serialize(profiles_adapter, profile_crud.get_all_profiles(db, i % pages * page, page))),
+            ("profiles page (Core)",
+             lambda i: read_path.render(read_path.list_profiles(db, i % pages * page, page))),
+            ("projects page (ORM)",
+             lambda i: serialize(projects_adapter, profile_crud.get_all_projects(db, i % pages * page, page))),
+            ("projects page (Core)",
+             lambda i: read_path.render(read_path.list_projects(db, i % pages * page, page))),
+            ("skills search (ORM)",
+             lambda i: serialize(skills_adapter, profile_crud.search_skills(db, "Skill1")[:page])),
+            ("skills search (Core)",
+             lambda i: read_path.render(read_path.search_skills(db, "Skill1")[:page])),
+            ("global search (ORM)",
+             lambda i: JSONResponse(jsonable_encoder(profile_crud.global_search(db, "bench", page))).body),
+            ("global search (Core)",
+             lambda i: read_path.render(read_path.global_search(db, "bench", page))),
+        )
+        for label, fn in cases:
+            fn(0)  # compile and cache the statement outside the measurement
+            db.expunge_all()
+            counter[0] = 0
+            samples = time_calls(lambda i: (fn(i), db.expunge_all()), args.iterations)
+            report(label, samples, counter[0], args.iterations)
+            print(f"  {'':<28} peak {measure_allocations(lambda i: (fn(i), db.expunge_all()), min(args.iterations, 50)):8.1f} KiB/call")
+        db.close()
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+def bench_read_model(args):
+    """Compare the DB read paths against the array-backed in-memory read model and stored documents"""
+    Session, engine, path = make_database(args.profiles, projects_per_profile=2)
+    counter = count_statements(engine)
+    page = args.page_size
+    complete_adapter = TypeAdapter(profile_schemas.ProfileComplete)
+    skills_adapter = TypeAdapter(List[profile_schemas.Skill])
+
+    try:
+        print(f"🧠 Read model benchmark ({args.profiles} profiles, {page}-row pages, {args.iterations} iterations)")
+        db = Session()
+        model = ReadModel()
+        started = time.perf_counter()
+        model.load(db)
+        loaded = time.perf_counter() - started
+        usage = model.memory_usage()
+        total = usage["arrays_bytes"] + usage["string_pool_bytes"]
+        per_100k = total * 100_000 / max(args.profiles, 1) / 2**20
+        print(f"  loaded in {loaded:.2f}s: arrays {usage['arrays_bytes'] / 2**20:.2f} MiB, "
+              f"string pool {usage['string_pool_bytes'] / 2**20:.2f} MiB ({usage['strings']} strings), "
+              f"~{per_100k:.1f} MiB per 100k profiles")
+        profile_documents.rebuild(db)
+
+        pages = max(1, args.profiles // page)
+        profile = lambda i: i % args.profiles + 1
+        cases = (
+            ("profile document (DB)",
+             lambda i: JSONResponse(jsonable_encoder(complete_adapter.validate_python(
+                 profile_crud.get_complete_profile(db, profile(i)), from_attributes=True))).body),
+            ("profile document (memory)", lambda i: read_path.render(model.get_document(db, profile(i)))),
+            ("profile document (stored)", lambda i: profile_documents.get(db, profile(i))),
+            ("profile skills (DB)",
+             lambda i: JSONResponse(jsonable_encoder(skills_adapter.validate_python(
+                 profile_crud.get_skills_by_profile(db, profile(i)), from_attributes=True))).body),
+            ("profile skills (memory)", lambda i: read_path.render(model.get_children(db, profile(i), "skills"))),
+            ("profiles page (DB)", lambda i: read_path.render(read_path.list_profiles(db, i % pages * page, page))),
+            ("profiles page (memory)", lambda i: read_path.render(model.list_profiles(db, i % pages * page, page))),
+            ("projects page (DB)", lambda i: read_path.render(read_path.list_projects(db, i % pages * page, page))),
+            ("projects page (memory)", lambda i: read_path.render(model.list_projects(db, i % pages * page, page))),
+            ("skills search (DB)", lambda i: read_path.render(read_path.search_skills(db, "Skill1")[:page])),
+            ("skills search (memory)", lambda i: read_path.render(model.search_skills(db, "Skill1")[:page])),
+            ("top skills (DB)", lambda i: profile_crud.get_top_skills(db, 10)),
+            ("top skills (memory)", lambda i: model.top_skills(db, 10)),
+        )
+        for label, fn in cases:
+            fn(0)
+            db.expunge_all()
+            counter[0] = 0
+            samples = time_calls(lambda i: (fn(i), db.expunge_all()), args.iterations)
+            report(label, samples, counter[0], args.iterations)
+        db.close()
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Me-API Playground benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    writes = subparsers.add_parser("writes", help="Single-statement write path vs ORM round trips")
+    writes.add_argument("--profiles", type=int, default=200)
+    writes.add_argument("--iterations", type=int, default=500)
+    writes.set_defaults(func=bench_writes)
+
+    reads = subparsers.add_parser("reads", help="Core select() + DTO JSON read path vs ORM + response models")
+    reads.add_argument("--profiles", type=int, default=1000)
+    reads.add_argument("--page-size", type=int, default=100)
+    reads.add_argument("--iterations", type=int, default=200)
+    reads.set_defaults(func=bench_reads)
+
+    memory = subparsers.add_parser("read-model", help="In-memory array read model vs the DB read paths")
+    memory.add_argument("--profiles", type=int, default=10000)
+    memory.add_argument("--page-size", type=int, default=100)
+    memory.add_argument("--iterations", type=int, default=200)
+    memory.set_defaults(func=bench_read_model)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
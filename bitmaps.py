@@ -0,0 +1,200 @@
+"""
+Bitmaps over profile IDs for Me-API Playground
+RoaringBitmap splits IDs into 65536-wide containers, kept as sorted arrays
+when sparse and as Python ints when dense, so set operations and counts on
+dense containers run word-at-a-time on arbitrary-precision integers
+"""
+
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+# Containers holding at most this many members are kept as sorted arrays
+ARRAY_CONTAINER_MAX = 4096
+
+
+def _bits_of(container) -> int:
+    if isinstance(container, int):
+        return container
+    # Set bits in a buffer and convert once; OR-ing into an int copies it per member
+    buffer = bytearray(8192)
+    for low in container:
+        buffer[low >> 3] |= 1 << (low & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _members_of(bits: int) -> List[int]:
+    members = []
+    while bits:
+        low = bits & -bits
+        members.append(low.bit_length() - 1)
+        bits ^= low
+    return members
+
+
+def _cardinality(container) -> int:
+    return bin(container).count("1") if isinstance(container, int) else len(container)
+
+
+def _normalize(container):
+    """Pick the smaller representation; None for an empty container"""
+    if isinstance(container, int):
+        if not container:
+            return None
+        if bin(container).count("1") <= ARRAY_CONTAINER_MAX:
+            return _members_of(container)
+        return container
+    if not container:
+        return None
+    return _bits_of(container) if len(container) > ARRAY_CONTAINER_MAX else container
+
+
+def _and(a, b):
+    if isinstance(a, list) and isinstance(b, list):
+        other = set(b)
+        return _normalize([x for x in a if x in other])
+    if isinstance(a, list):
+        return _normalize([x for x in a if b >> x & 1])
+    if isinstance(b, list):
+        return _normalize([x for x in b if a >> x & 1])
+    return _normalize(a & b)
+
+
+def _or(a, b):
+    if isinstance(a, list) and isinstance(b, list) and len(a) + len(b) <= ARRAY_CONTAINER_MAX:
+        return sorted(set(a).union(b))
+    return _normalize(_bits_of(a) | _bits_of(b))
+
+
+def _andnot(a, b):
+    if isinstance(a, list):
+        if isinstance(b, list):
+            other = set(b)
+            return _normalize([x for x in a if x not in other])
+        return _normalize([x for x in a if not b >> x & 1])
+    return _normalize(a & ~_bits_of(b))
+
+
+class RoaringBitmap:
+    """
+    Compressed bitmap in the style of Roaring: members are split by their
+    high 16 bits into containers, each a sorted array of low bits when sparse
+    (<= ARRAY_CONTAINER_MAX members) or a 65536-bit int when dense. Set
+    operations only touch containers present on both sides.
+    """
+
+    __slots__ = ("containers",)
+
+    def __init__(self, containers: Optional[Dict[int, object]] = None):
+        self.containers: Dict[int, object] = containers or {}
+
+    @classmethod
+    def of(cls, members: Iterable[int]) -> "RoaringBitmap":
+        """Bitmap of members, building each container in one pass"""
+        lows: Dict[int, List[int]] = {}
+        for member in members:
+            lows.setdefault(member >> 16, []).append(member & 0xFFFF)
+        return cls({high: _normalize(sorted(set(values))) for high, values in lows.items()})
+
+    def copy(self) -> "RoaringBitmap":
+        return RoaringBitmap({high: list(c) if isinstance(c, list) else c for high, c in self.containers.items()})
+
+    def add(self, member: int):
+        high, low = member >> 16, member & 0xFFFF
+        container = self.containers.get(high)
+        if container is None:
+            self.containers[high] = [low]
+        elif isinstance(container, int):
+            self.containers[high] = container | 1 << low
+        else:
+            i = bisect_left(container, low)
+            if i == len(container) or container[i] != low:
+                container.insert(i, low)
+                if len(container) > ARRAY_CONTAINER_MAX:
+                    self.containers[high] = _bits_of(container)
+
+    def discard(self, member: int):
+        high, low = member >> 16, member & 0xFFFF
+        container = self.containers.get(high)
+        if container is None:
+            return
+        if isinstance(container, int):
+            container = _normalize(container & ~(1 << low))
+        else:
+            i = bisect_left(container, low)
+            if i < len(container) and container[i] == low:
+                del container[i]
+            container = container or None
+        if container is None:
+            del self.containers[high]
+        else:
+            self.containers[high] = container
+
+    def __contains__(self, member: int) -> bool:
+        container = self.containers.get(member >> 16)
+        if container is None:
+            return False
+        low = member & 0xFFFF
+        if isinstance(container, int):
+            return bool(container >> low & 1)
+        i = bisect_left(container, low)
+        return i < len(container) and container[i] == low
+
+    def _combine(self, other: "RoaringBitmap", op, keep_left: bool, keep_right: bool) -> "RoaringBitmap":
+        containers = {}
+        if keep_right:
+            highs = self.containers.keys() | other.containers.keys()
+        elif keep_left:
+            highs = self.containers.keys()
+        else:
+            highs = self.containers.keys() & other.containers.keys()
+        for high in highs:
+            a, b = self.containers.get(high), other.containers.get(high)
+            if a is not None and b is not None:
+                result = op(a, b)
+            elif a is not None and keep_left:
+                result = list(a) if isinstance(a, list) else a
+            elif b is not None:
+                result = list(b) if isinstance(b, list) else b
+            else:
+                result = None
+            if result is not None:
+                containers[high] = result
+        return RoaringBitmap(containers)
+
+    def __and__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        return self._combine(other, _and, False, False)
+
+    def __or__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        return self._combine(other, _or, True, True)
+
+    def __sub__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        return self._combine(other, _andnot, True, False)
+
+    def intersection_count(self, other: "RoaringBitmap") -> int:
+        """len(self & other) without keeping the intersection"""
+        count = 0
+        for high in self.containers.keys() & other.containers.keys():
+            a, b = self.containers[high], other.containers[high]
+            if isinstance(a, list) and isinstance(b, list):
+                count += len(set(a).intersection(b))
+            else:
+                count += bin(_bits_of(a) & _bits_of(b)).count("1")
+        return count
+
+    def __bool__(self) -> bool:
+        return bool(self.containers)
+
+    def __len__(self) -> int:
+        return sum(_cardinality(c) for c in self.containers.values())
+
+    def __iter__(self) -> Iterator[int]:
+        """Members in ascending order"""
+        for high in sorted(self.containers):
+            container = self.containers[high]
+            base = high << 16
+            for low in (_members_of(container) if isinstance(container, int) else container):
+                yield base | low
+
+    def __repr__(self):
+        return f"RoaringBitmap({list(self)})"
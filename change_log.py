@@ -0,0 +1,100 @@
+"""
+Change data capture for Me-API Playground
+Every profile_crud write appends to change_log in the same transaction;
+clients sync incrementally with GET /changes?since=<token>
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select, bindparam
+from sqlalchemy.orm import Session
+
+import models
+
+CHANGE_LOG_RETENTION_SECONDS = int(os.getenv("CHANGE_LOG_RETENTION_SECONDS", "86400"))
+CHANGE_LOG_COMPACT_INTERVAL = int(os.getenv("CHANGE_LOG_COMPACT_INTERVAL", "3600"))
+
+ENTITY_TYPES = {
+    models.Profile: "profile",
+    models.Skill: "skill",
+    models.Project: "project",
+    models.WorkExperience: "work_experience",
+    models.ProfileLink: "profile_link",
+}
+
+_table = models.ChangeLog.__table__
+
+# One statement per change: the per-entity version is computed inline
+_insert_change = insert(_table).values(
+    entity_type=bindparam("entity_type"),
+    entity_id=bindparam("entity_id"),
+    profile_id=bindparam("profile_id"),
+    op=bindparam("op"),
+    version=select(func.coalesce(func.max(_table.c.version), 0) + 1).where(
+        _table.c.entity_type == bindparam("entity_type"),
+        _table.c.entity_id == bindparam("entity_id"),
+    ).scalar_subquery(),
+)
+
+
+def record_changes(db: Session, model, op: str, rows: Iterable[Tuple[int, Optional[int]]]):
+    """
+    Append change entries for (entity_id, profile_id) pairs.
+
+    Must be called before the write's commit so the entries share its transaction.
+    """
+    entity_type = ENTITY_TYPES[model]
+    params = [
+        {"entity_type": entity_type, "entity_id": entity_id, "profile_id": profile_id, "op": op}
+        for entity_id, profile_id in rows
+    ]
+    if params:
+        db.execute(_insert_change, params)
+
+
+def record_change(db: Session, model, op: str, entity_id: int, profile_id: Optional[int]):
+    """Append a single change entry"""
+    record_changes(db, model, op, [(entity_id, profile_id)])
+
+
+def get_changes(db: Session, since: int = 0, limit: int = 500) -> List[dict]:
+    """Changes with a token greater than since, oldest first"""
+    rows = db.execute(
+        select(_table).where(_table.c.id > since).order_by(_table.c.id).limit(limit)
+    ).mappings()
+    return [
+        {
+            "token": row["id"],
+            "entity_type": row["entity_type"],
+            "entity_id": row["entity_id"],
+            "profile_id": row["profile_id"],
+            "op": row["op"],
+            "version": row["version"],
+            "timestamp": row["created_at"],
+        }
+        for row in rows
+    ]
+
+
+def latest_token(db: Session) -> int:
+    """Highest token written so far (0 for an empty log)"""
+    return db.execute(select(func.coalesce(func.max(_table.c.id), 0))).scalar()
+
+
+def compact(db: Session, retention_seconds: int = CHANGE_LOG_RETENTION_SECONDS) -> int:
+    """
+    Drop superseded entries older than the retention window.
+
+    The newest entry of every entity is always kept, so replaying the
+    compacted log from any token still yields the current state of each
+    entity (deletes stay as tombstones). Returns the number of rows removed.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=retention_seconds)
+    latest_per_entity = select(func.max(_table.c.id)).group_by(_table.c.entity_type, _table.c.entity_id)
+    result = db.execute(
+        delete(_table).where(_table.c.created_at < cutoff, _table.c.id.not_in(latest_per_entity))
+    )
+    db.commit()
+    return result.rowcount
@@ -0,0 +1,238 @@
+"""
+Columnar in-memory snapshot of the profile tables for Me-API Playground
+Each table is loaded into NumPy column arrays (strings dictionary-encoded,
+fixed-width dtypes elsewhere) with a small vectorized filter/group-by API
+"""
+
+import os
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import models
+from background import SnapshotRefresher
+
+COLUMNAR_REFRESH_INTERVAL = float(os.getenv("COLUMNAR_REFRESH_INTERVAL", "30"))
+
+# "column op value", e.g. level=expert, start_date>=2024-01-01
+_CONDITION = re.compile(r"^\s*([a-z_]+)\s*(!=|>=|<=|=|>|<)\s*(.*?)\s*$")
+
+
+class QueryError(ValueError):
+    """Invalid table, column or condition in a columnar query"""
+
+
+class DictColumn:
+    """
+    Dictionary-encoded string column: one interned copy of each distinct
+    value plus the narrowest unsigned code array. Code 0 is NULL.
+    """
+
+    def __init__(self, values: Sequence[Optional[str]]):
+        dictionary: Dict[str, int] = {}
+        codes = [dictionary.setdefault(v, len(dictionary) + 1) if v is not None else 0 for v in values]
+        self.values: List[Optional[str]] = [None] + list(dictionary)
+        dtype = np.uint8 if len(self.values) <= 0xFF else np.uint16 if len(self.values) <= 0xFFFF else np.uint32
+        self.codes = np.array(codes, dtype=dtype)
+        self._lowered: Dict[str, List[int]] = {}
+        for code, value in enumerate(self.values[1:], start=1):
+            self._lowered.setdefault(value.lower(), []).append(code)
+
+    def __len__(self):
+        return len(self.codes)
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + sum(len(v) for v in self.values[1:])
+
+    def codes_for(self, value: str) -> List[int]:
+        """Codes whose value equals value, ignoring case"""
+        return self._lowered.get(value.lower(), [])
+
+    def decode(self, code: int) -> Optional[str]:
+        return self.values[code]
+
+
+class ColumnTable:
+    """Equal-length columns of one table"""
+
+    def __init__(self, columns: Dict[str, object]):
+        self.columns = columns
+        self.rows = len(next(iter(columns.values()))) if columns else 0
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self.columns.values())
+
+    def column(self, name: str):
+        if name not in self.columns:
+            raise QueryError(f"Unknown column '{name}'; expected one of {', '.join(self.columns)}")
+        return self.columns[name]
+
+    def mask(self, conditions: List[str]) -> np.ndarray:
+        """AND of conditions like "level=expert" or "start_date>=2024-01-01" """
+        mask = np.ones(self.rows, dtype=bool)
+        for condition in conditions:
+            match = _CONDITION.match(condition)
+            if not match:
+                raise QueryError(f"Invalid condition '{condition}'")
+            name, op, raw = match.groups()
+            mask &= self._compare(self.column(name), op, raw.strip('"'))
+        return mask
+
+    def _compare(self, column, op: str, raw: str) -> np.ndarray:
+        if isinstance(column, DictColumn):
+            if op not in ("=", "!="):
+                raise QueryError(f"Operator '{op}' is not supported on text columns")
+            matched = np.isin(column.codes, column.codes_for(raw))
+            return matched if op == "=" else ~matched
+        try:
+            if column.dtype == bool:
+                value = raw.lower() in ("1", "true", "yes")
+            elif np.issubdtype(column.dtype, np.datetime64):
+                value = np.datetime64(raw, "D")
+            else:
+                value = column.dtype.type(raw)
+        except (ValueError, OverflowError):
+            raise QueryError(f"Invalid value '{raw}' for column of type {column.dtype}")
+        return {
+            "=": np.equal, "!=": np.not_equal, ">=": np.greater_equal,
+            "<=": np.less_equal, ">": np.greater, "<": np.less,
+        }[op](column, value)
+
+    def group_codes(self, name: str, mask: np.ndarray) -> Tuple[np.ndarray, List]:
+        """Per-row group codes for the masked rows and the value of each code"""
+        column = self.column(name)
+        if isinstance(column, DictColumn):
+            return column.codes[mask].astype(np.int64), column.values
+        uniques, inverse = np.unique(column[mask], return_inverse=True)
+        return inverse.astype(np.int64), [_to_python(v) for v in uniques]
+
+
+def _to_python(value):
+    if isinstance(value, np.datetime64):
+        return None if np.isnat(value) else str(value)
+    return value.item() if hasattr(value, "item") else value
+
+
+def _dates(values) -> np.ndarray:
+    return np.array([v.date() if v else None for v in values], dtype="datetime64[D]")
+
+
+class ColumnarSnapshot:
+    """All profile tables as ColumnTables, keyed by table name"""
+
+    def __init__(self, tables: Dict[str, ColumnTable]):
+        self.tables = tables
+
+    def table(self, name: str) -> ColumnTable:
+        if name not in self.tables:
+            raise QueryError(f"Unknown table '{name}'; expected one of {', '.join(self.tables)}")
+        return self.tables[name]
+
+    def describe(self) -> dict:
+        return {
+            name: {
+                "rows": table.rows,
+                "bytes": table.nbytes,
+                "columns": {
+                    column: "dictionary" if isinstance(values, DictColumn) else str(values.dtype)
+                    for column, values in table.columns.items()
+                },
+            }
+            for name, table in self.tables.items()
+        }
+
+    def query(self, table: str, where: Optional[List[str]] = None, group_by: Optional[List[str]] = None,
+              count_distinct: Optional[str] = None, limit: int = 100) -> dict:
+        """
+        Filter rows with AND-ed conditions, then count them per group.
+
+        Returns {"total": matched rows, "groups": [{<group columns>, "count"}]},
+        groups sorted by count descending. With count_distinct, each group
+        counts distinct values of that column instead of rows.
+        """
+        t = self.table(table)
+        mask = t.mask(where or [])
+        total = int(mask.sum())
+        if count_distinct:
+            distinct_column = t.group_codes(count_distinct, mask)[0]
+        if not group_by:
+            count = len(np.unique(distinct_column)) if count_distinct else total
+            return {"total": total, "groups": [{"count": count}]}
+
+        codes, decoders = zip(*(t.group_codes(name, mask) for name in group_by))
+        keys, group_of_row = np.unique(np.stack(codes, axis=1), axis=0, return_inverse=True)
+        group_of_row = group_of_row.reshape(-1)
+        if count_distinct:
+            pairs = np.unique(np.stack([group_of_row, distinct_column], axis=1), axis=0)
+            counts = np.bincount(pairs[:, 0], minlength=len(keys))
+        else:
+            counts = np.bincount(group_of_row, minlength=len(keys))
+        order = np.argsort(-counts, kind="stable")[:limit]
+        groups = []
+        for g in order:
+            row = {name: decoders[i][keys[g, i]] for i, name in enumerate(group_by)}
+            row["count"] = int(counts[g])
+            groups.append(row)
+        return {"total": total, "groups": groups}
+
+
+def build_snapshot(db: Session) -> ColumnarSnapshot:
+    """Load profiles, skills, projects, project technologies and work experience into columns"""
+    p, s, pr, w = (m.__table__ for m in (models.Profile, models.Skill, models.Project, models.WorkExperience))
+
+    profiles = db.execute(select(p.c.id, p.c.location, p.c.created_at)).all()
+    skills = db.execute(select(s.c.id, s.c.profile_id, s.c.name, s.c.level, s.c.category)).all()
+    projects = db.execute(
+        select(pr.c.id, pr.c.profile_id, pr.c.start_date, pr.c.end_date, pr.c.is_active, pr.c.technologies)
+    ).all()
+    work = db.execute(
+        select(w.c.id, w.c.profile_id, w.c.company, w.c.start_date, w.c.end_date, w.c.is_current, w.c.location)
+    ).all()
+    technologies = [(r[0], r[1], t) for r in projects for t in (r[5] or []) if t]
+
+    def ids(rows, i=0):
+        return np.array([r[i] for r in rows], dtype=np.int32)
+
+    return ColumnarSnapshot({
+        "profiles": ColumnTable({
+            "id": ids(profiles),
+            "location": DictColumn([r[1] for r in profiles]),
+            "created_at": _dates([r[2] for r in profiles]),
+        }),
+        "skills": ColumnTable({
+            "id": ids(skills),
+            "profile_id": ids(skills, 1),
+            "name": DictColumn([r[2] for r in skills]),
+            "level": DictColumn([r[3] for r in skills]),
+            "category": DictColumn([r[4] for r in skills]),
+        }),
+        "projects": ColumnTable({
+            "id": ids(projects),
+            "profile_id": ids(projects, 1),
+            "start_date": _dates([r[2] for r in projects]),
+            "end_date": _dates([r[3] for r in projects]),
+            "is_active": np.array([bool(r[4]) for r in projects], dtype=bool),
+        }),
+        "project_technologies": ColumnTable({
+            "project_id": ids(technologies),
+            "profile_id": ids(technologies, 1),
+            "technology": DictColumn([t[2] for t in technologies]),
+        }),
+        "work_experiences": ColumnTable({
+            "id": ids(work),
+            "profile_id": ids(work, 1),
+            "company": DictColumn([r[2] for r in work]),
+            "start_date": _dates([r[3] for r in work]),
+            "end_date": _dates([r[4] for r in work]),
+            "is_current": np.array([bool(r[5]) for r in work], dtype=bool),
+            "location": DictColumn([r[6] for r in work]),
+        }),
+    })
+
+
+snapshot = SnapshotRefresher("columnar", build_snapshot, COLUMNAR_REFRESH_INTERVAL)
@@ -0,0 +1,148 @@
+"""
+Response compression middleware for Me-API Playground
+Gzip-encodes responses above a size threshold, streaming bodies chunk by chunk
+"""
+
+import os
+import time
+import zlib
+from typing import Iterable, Optional
+
+from metrics import metrics
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "6"))
+COMPRESSION_EXCLUDE = [p for p in os.getenv("COMPRESSION_EXCLUDE", "").split(",") if p]
+
+# Media types that are already compressed or must reach the client unbuffered
+DEFAULT_EXCLUDED_MEDIA_TYPES = ("text/event-stream", "image/", "video/", "audio/", "application/zip", "application/gzip")
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware that gzip-encodes responses.
+
+    Args:
+        app: Wrapped ASGI application
+        minimum_size: Complete bodies smaller than this are sent as-is
+        level: zlib compression level (1 = fastest, 9 = smallest)
+        exclude_paths: Path prefixes that opt out of compression
+        exclude_media_types: Content-Type prefixes that are never compressed
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        level: int = COMPRESSION_LEVEL,
+        exclude_paths: Iterable[str] = (),
+        exclude_media_types: Iterable[str] = DEFAULT_EXCLUDED_MEDIA_TYPES,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+        self.exclude_paths = tuple(exclude_paths) + tuple(COMPRESSION_EXCLUDE)
+        self.exclude_media_types = tuple(exclude_media_types)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for key, value in scope.get("headers", []):
+            if key == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        if not _accepts_gzip(accept_encoding):
+            await self.app(scope, receive, send)
+            return
+
+        responder = _GzipResponder(send, self.minimum_size, self.level, self.exclude_media_types)
+        await self.app(scope, receive, responder.send)
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    for part in accept_encoding.lower().split(","):
+        token, _, params = part.strip().partition(";")
+        if token.strip() in ("gzip", "*"):
+            params = params.strip()
+            return not (params.startswith("q=") and params[2:].strip() in ("0", "0.0", "0.00", "0.000"))
+    return False
+
+
+class _GzipResponder:
+    """Wraps the ASGI send callable for a single response"""
+
+    def __init__(self, send, minimum_size: int, level: int, exclude_media_types):
+        self._send = send
+        self.minimum_size = minimum_size
+        self.level = level
+        self.exclude_media_types = exclude_media_types
+        self.start_message: Optional[dict] = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def send(self, message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Hold the start message until the first body chunk decides the encoding
+            self.start_message = message
+            return
+        if message_type != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            if not self._should_compress(body, more_body):
+                self.passthrough = True
+                metrics.inc("compression.responses_skipped")
+                await self._send(self.start_message)
+                await self._send(message)
+                return
+            self.compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+            headers = [
+                (k, v) for k, v in self.start_message.get("headers", [])
+                if k not in (b"content-length", b"vary")
+            ]
+            vary = [v for k, v in self.start_message.get("headers", []) if k == b"vary"]
+            headers.append((b"content-encoding", b"gzip"))
+            headers.append((b"vary", b", ".join(vary + [b"Accept-Encoding"])))
+
+            if not more_body:
+                # Complete body: compress in one go and send an exact Content-Length
+                data = self._compress(body, zlib.Z_FINISH)
+                headers.append((b"content-length", str(len(data)).encode("latin-1")))
+                metrics.inc("compression.responses_compressed")
+                await self._send({**self.start_message, "headers": headers})
+                await self._send({"type": "http.response.body", "body": data})
+                return
+
+            metrics.inc("compression.responses_streamed")
+            await self._send({**self.start_message, "headers": headers})
+
+        # Streaming: sync-flush each chunk so the client receives it immediately
+        data = self._compress(body, zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    def _should_compress(self, body: bytes, more_body: bool) -> bool:
+        headers = dict(self.start_message.get("headers", []))
+        if b"content-encoding" in headers:
+            return False
+        content_type = headers.get(b"content-type", b"").decode("latin-1")
+        if content_type.startswith(self.exclude_media_types):
+            return False
+        if more_body:
+            return True
+        return len(body) >= self.minimum_size
+
+    def _compress(self, body: bytes, flush_mode: int) -> bytes:
+        started = time.thread_time()
+        data = self.compressor.compress(body) + self.compressor.flush(flush_mode)
+        metrics.observe("compression.cpu_seconds", time.thread_time() - started)
+        metrics.inc("compression.bytes_in", len(body))
+        metrics.inc("compression.bytes_out", len(data))
+        return data
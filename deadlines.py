@@ -0,0 +1,136 @@
+"""
+Request deadlines for Me-API Playground
+Each request gets a deadline that is enforced inside SQL execution, so slow
+statements are cancelled instead of running on after the client gave up
+"""
+
+import math
+import os
+import re
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from sqlalchemy import event
+
+from metrics import metrics
+
+REQUEST_DEADLINE_MS = int(os.getenv("REQUEST_DEADLINE_MS", "5000"))
+REQUEST_DEADLINE_MAX_MS = int(os.getenv("REQUEST_DEADLINE_MAX_MS", "30000"))
+DEADLINE_HEADER = "x-request-deadline-ms"
+# Leading SELECT keyword, for the per-statement MySQL optimizer hint
+_SELECT = re.compile(r"^\s*SELECT\b", re.IGNORECASE)
+# SQLite VM instructions between deadline checks
+SQLITE_PROGRESS_STEPS = int(os.getenv("SQLITE_PROGRESS_STEPS", "1000"))
+
+
+def _parse_route_deadlines(value: str) -> Dict[str, int]:
+    routes = {}
+    for item in value.split(","):
+        path, _, ms = item.partition("=")
+        if path and ms:
+            routes[path.strip()] = int(ms)
+    return routes
+
+
+# Per-route defaults (exact path), e.g. DEADLINE_ROUTES="/search=2000,/projects=2000"
+ROUTE_DEADLINES = _parse_route_deadlines(
+    os.getenv("DEADLINE_ROUTES", "/search=2000,/skills/search=2000,/projects=2000")
+)
+
+# Absolute time.monotonic() deadline of the current request, if any
+current_deadline: ContextVar[Optional[float]] = ContextVar("current_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """The request ran past its deadline"""
+
+
+def remaining_ms() -> Optional[float]:
+    deadline = current_deadline.get()
+    if deadline is None:
+        return None
+    return (deadline - time.monotonic()) * 1000
+
+
+def is_cancellation(exc: BaseException) -> bool:
+    """Whether a database error is a statement cancelled by this request's (expired) deadline"""
+    if isinstance(exc, DeadlineExceeded):
+        return True
+    remaining = remaining_ms()
+    if remaining is None or remaining > 0:
+        # Timeouts configured elsewhere, or errors that merely mention the words
+        return False
+    message = str(getattr(exc, "orig", exc)).lower()
+    return (
+        message == "interrupted"  # SQLite progress handler (sqlite3.OperationalError)
+        or "canceling statement due to statement timeout" in message  # PostgreSQL
+        or "maximum statement execution time exceeded" in message  # MySQL
+    )
+
+
+def _sqlite_progress_handler() -> int:
+    deadline = current_deadline.get()
+    # Non-zero aborts the running statement with "interrupted"
+    return 1 if deadline is not None and time.monotonic() >= deadline else 0
+
+
+def install(engine):
+    """Enforce request deadlines on every statement run through engine"""
+    dialect = engine.dialect.name
+
+    if dialect == "sqlite":
+        @event.listens_for(engine, "connect")
+        def _install_progress_handler(dbapi_connection, connection_record):
+            dbapi_connection.set_progress_handler(_sqlite_progress_handler, SQLITE_PROGRESS_STEPS)
+
+    @event.listens_for(engine, "before_cursor_execute", retval=True)
+    def _apply_deadline(conn, cursor, statement, parameters, context, executemany):
+        remaining = remaining_ms()
+        if remaining is None:
+            return statement, parameters
+        if remaining <= 0:
+            metrics.inc("deadline.expired_before_execute")
+            raise DeadlineExceeded("Request deadline exceeded before statement start")
+        # Rounded up so a statement is never cancelled before the deadline itself
+        timeout = math.ceil(remaining)
+        if dialect == "postgresql":
+            # Scoped to the transaction, so it never outlives this request on a pooled connection
+            cursor.execute(f"SET LOCAL statement_timeout = {timeout}")
+        elif dialect in ("mysql", "mariadb"):
+            # Per-statement hint rather than SET SESSION, which would stick to the pooled connection
+            statement = _SELECT.sub(f"SELECT /*+ MAX_EXECUTION_TIME({timeout}) */", statement, count=1)
+        return statement, parameters
+
+
+class DeadlineMiddleware:
+    """
+    ASGI middleware that sets the deadline for each request.
+
+    The deadline comes from the X-Request-Deadline-Ms header (capped at
+    REQUEST_DEADLINE_MAX_MS), else the route default, else REQUEST_DEADLINE_MS.
+    """
+
+    def __init__(self, app, default_ms: int = REQUEST_DEADLINE_MS, routes: Dict[str, int] = ROUTE_DEADLINES):
+        self.app = app
+        self.default_ms = default_ms
+        self.routes = routes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith("/events"):
+            await self.app(scope, receive, send)
+            return
+        token = current_deadline.set(time.monotonic() + self._deadline_ms(scope) / 1000)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_deadline.reset(token)
+
+    def _deadline_ms(self, scope) -> int:
+        for key, value in scope.get("headers", []):
+            if key == DEADLINE_HEADER.encode("latin-1"):
+                try:
+                    return max(1, min(int(value), REQUEST_DEADLINE_MAX_MS))
+                except ValueError:
+                    break
+        return self.routes.get(scope["path"], self.default_ms)
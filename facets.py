@@ -0,0 +1,172 @@
+"""
+Faceted profile search for Me-API Playground
+Keeps one bitmap of profile IDs per facet value (skill category, skill
+level, location, technology, company) and per search term, so filtering and
+facet counting are bitmap intersections instead of GROUP BY queries
+"""
+
+import os
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import models
+from background import SnapshotRefresher
+from bitmaps import RoaringBitmap
+
+FACET_REFRESH_INTERVAL = float(os.getenv("FACET_REFRESH_INTERVAL", "5"))
+FACETS = ("category", "level", "location", "technology", "company")
+
+# Change log entity types that alter a profile's facets or search terms
+FACET_ENTITIES = {"profile", "skill", "project", "work_experience"}
+
+_WORD = re.compile(r"[\w.+#-]+")
+
+Key = Tuple[str, str]  # (facet or "term", lowercased value)
+
+
+def load_entries(db: Session, profile_ids: Optional[Iterable[int]] = None) -> Dict[int, Dict[Key, str]]:
+    """Facet values and search terms per profile, keyed by (facet, lowercased value) with display values"""
+    p, s, pr, w = (m.__table__ for m in (models.Profile, models.Skill, models.Project, models.WorkExperience))
+    ids = None if profile_ids is None else list(profile_ids)
+
+    def rows(*columns):
+        query = select(*columns)
+        if ids is not None:
+            query = query.where(columns[0].in_(ids))
+        return db.execute(query)
+
+    entries: Dict[int, Dict[Key, str]] = defaultdict(dict)
+
+    def add(profile_id, facet, value, term=True):
+        if value and str(value).strip():
+            value = str(value).strip()
+            entries[profile_id].setdefault((facet, value.lower()), value)
+            if term:
+                for word in _WORD.findall(value.lower()):
+                    entries[profile_id].setdefault(("term", word), word)
+
+    for profile_id, name, location in rows(p.c.id, p.c.name, p.c.location):
+        entries[profile_id]  # profiles without any facet value still match an empty filter
+        add(profile_id, "name", name)
+        add(profile_id, "location", location)
+    for profile_id, name, level, category in rows(s.c.profile_id, s.c.name, s.c.level, s.c.category):
+        add(profile_id, "skill", name)
+        add(profile_id, "level", level, term=False)
+        add(profile_id, "category", category, term=False)
+    for profile_id, technologies in rows(pr.c.profile_id, pr.c.technologies):
+        for technology in technologies or []:
+            add(profile_id, "technology", technology)
+    for profile_id, company in rows(w.c.profile_id, w.c.company):
+        add(profile_id, "company", company)
+    return entries
+
+
+class FacetIndex:
+    """
+    Bitmaps of profile IDs per facet value and search term.
+
+    Filters on one facet are OR-ed, filters on different facets AND-ed; each
+    facet matches at the profile level, so category=cloud&level=expert means
+    "some cloud skill and some expert skill".
+    """
+
+    def __init__(self):
+        self.bitmaps: Dict[Key, RoaringBitmap] = {}
+        self.display: Dict[Key, str] = {}
+        self.by_profile: Dict[int, Set[Key]] = {}
+        self.all = RoaringBitmap()
+        self._lock = threading.Lock()
+
+    def load(self, entries: Dict[int, Dict[Key, str]]):
+        """Replace every profile's facet values, building each bitmap once"""
+        members: Dict[Key, List[int]] = defaultdict(list)
+        display: Dict[Key, str] = {}
+        for profile_id, profile_entries in entries.items():
+            for key, value in profile_entries.items():
+                members[key].append(profile_id)
+                display.setdefault(key, value)
+        bitmaps = {key: RoaringBitmap.of(ids) for key, ids in members.items()}
+        with self._lock:
+            self.bitmaps, self.display = bitmaps, display
+            self.by_profile = {profile_id: set(profile_entries) for profile_id, profile_entries in entries.items()}
+            self.all = RoaringBitmap.of(entries)
+
+    def set_profile(self, profile_id: int, entries: Optional[Dict[Key, str]]):
+        """Replace a profile's facet values; None removes the profile"""
+        with self._lock:
+            self._set_profile_locked(profile_id, entries)
+
+    def _set_profile_locked(self, profile_id: int, entries: Optional[Dict[Key, str]]):
+        for key in self.by_profile.pop(profile_id, ()):
+            bitmap = self.bitmaps[key]
+            bitmap.discard(profile_id)
+            if not bitmap:
+                del self.bitmaps[key]
+                del self.display[key]
+        self.all.discard(profile_id)
+        if entries is None:
+            return
+        self.all.add(profile_id)
+        self.by_profile[profile_id] = set(entries)
+        for key, value in entries.items():
+            self.bitmaps.setdefault(key, RoaringBitmap()).add(profile_id)
+            self.display.setdefault(key, value)
+
+    def _term(self, word: str) -> RoaringBitmap:
+        # Prefix match over the term vocabulary, so "pyth" finds python
+        matched = RoaringBitmap()
+        for (facet, value), bitmap in self.bitmaps.items():
+            if facet == "term" and value.startswith(word):
+                matched = matched | bitmap
+        return matched
+
+    def search(self, q: Optional[str], filters: Dict[str, List[str]]) -> Tuple[RoaringBitmap, Dict[str, List[dict]]]:
+        """Matched profiles and, per facet, the number of matches carrying each value"""
+        with self._lock:
+            return self._search_locked(q, filters)
+
+    def _search_locked(self, q: Optional[str], filters: Dict[str, List[str]]) -> Tuple[RoaringBitmap, Dict[str, List[dict]]]:
+        matched = self.all.copy()
+        for word in _WORD.findall((q or "").lower()):
+            matched = matched & self._term(word)
+        for facet, values in filters.items():
+            if values:
+                selected = RoaringBitmap()
+                for value in values:
+                    selected = selected | self.bitmaps.get((facet, value.strip().lower()), RoaringBitmap())
+                matched = matched & selected
+
+        counts: Dict[str, List[dict]] = {facet: [] for facet in FACETS}
+        for key, bitmap in self.bitmaps.items():
+            if key[0] in counts:
+                count = bitmap.intersection_count(matched)
+                if count:
+                    counts[key[0]].append({"value": self.display[key], "count": count})
+        for values in counts.values():
+            values.sort(key=lambda item: (-item["count"], item["value"].lower()))
+        return matched, counts
+
+
+def build_index(db: Session) -> FacetIndex:
+    index = FacetIndex()
+    index.load(load_entries(db))
+    return index
+
+
+def apply_changes(db: Session, index: FacetIndex, changes: List[dict]):
+    """Reload the facet values of profiles touched by the given change log entries"""
+    affected = {c["profile_id"] for c in changes if c["entity_type"] in FACET_ENTITIES and c["profile_id"]}
+    if not affected:
+        return
+    entries = load_entries(db, affected)
+    for profile_id in affected:
+        # Deleted profiles have no profiles row and load no entries
+        index.set_profile(profile_id, entries.get(profile_id))
+
+
+facet_index = SnapshotRefresher("facets", build_index, FACET_REFRESH_INTERVAL, apply_changes)
@@ -0,0 +1,152 @@
+"""
+Liveness, readiness and database health for Me-API Playground
+/livez is answered from memory; /readyz turns ready once startup warm-up
+(pool connections, compiled statements, stats caches) has finished; a
+background prober keeps the database status current for both /readyz and
+/health so probes never query the database themselves
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+
+import change_log
+import live_stats
+import profile_crud
+import read_path
+from database import SessionLocal, engine
+from metrics import metrics
+from profile_registry import profile_ids
+from read_model import READ_MODEL_ENABLED, read_model
+from skill_index import skill_index
+
+logger = logging.getLogger(__name__)
+
+HEALTH_PROBE_INTERVAL = float(os.getenv("HEALTH_PROBE_INTERVAL", "5"))
+# Connections opened ahead of traffic; capped at the pool size
+WARMUP_POOL_CONNECTIONS = int(os.getenv("WARMUP_POOL_CONNECTIONS", "5"))
+
+
+class HealthState:
+    """Process health, updated by warm-up and the prober and read by the probe routes"""
+
+    def __init__(self, probe_interval: float = HEALTH_PROBE_INTERVAL):
+        self.probe_interval = probe_interval
+        self.started_at = time.time()
+        self.ready = False
+        self.warmup_seconds: Optional[float] = None
+        self.database = "unknown"
+        self.database_checked_at: Optional[float] = None
+        self.database_latency_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._warmup_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="health-prober")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def probe(self) -> bool:
+        """Check the database once and record the result"""
+        started = time.perf_counter()
+        try:
+            await run_in_threadpool(_select_one)
+        except Exception as e:
+            if self.database != "disconnected":
+                logger.error(f"Database connection failed: {e}")
+            self.database, self.last_error = "disconnected", str(e)
+            metrics.inc("health.probe_failures")
+        else:
+            self.database, self.last_error = "connected", None
+            self.database_latency_ms = round((time.perf_counter() - started) * 1000, 2)
+        self.database_checked_at = time.time()
+        return self.database == "connected"
+
+    async def ensure_probed(self):
+        """Probe once if the prober has not run yet (e.g. the app was started without lifespan)"""
+        if self.database_checked_at is None:
+            await self.probe()
+
+    async def warm_up(self):
+        """Prime the process for traffic, then mark it ready; safe to retry after a failure"""
+        async with self._warmup_lock:
+            if self.ready:
+                return
+            started = time.perf_counter()
+            try:
+                await run_in_threadpool(_warm_up_database)
+                await live_stats.broadcaster.refresh()
+            except Exception as e:
+                logger.error(f"Warm-up failed: {e}")
+                self.last_error = str(e)
+                return
+            self.warmup_seconds = round(time.perf_counter() - started, 3)
+            metrics.observe("health.warmup_seconds", self.warmup_seconds)
+            self.ready = True
+            logger.info(f"Warm-up finished in {self.warmup_seconds}s")
+
+    def readiness(self) -> dict:
+        return {
+            "status": "ready" if self.is_ready() else "not ready",
+            "warmed_up": self.ready,
+            "warmup_seconds": self.warmup_seconds,
+            "database": self.database,
+            "database_checked_at": self.database_checked_at,
+            "database_latency_ms": self.database_latency_ms,
+            "error": self.last_error,
+        }
+
+    def is_ready(self) -> bool:
+        return self.ready and self.database == "connected"
+
+    async def _run(self):
+        while True:
+            if await self.probe() and not self.ready:
+                await self.warm_up()
+            await asyncio.sleep(self.probe_interval)
+
+
+def _select_one():
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+def _warm_up_database():
+    # Open pool connections up front so the first requests do not pay for connect + PRAGMAs
+    pool_size = engine.pool.size() if hasattr(engine.pool, "size") else 1
+    connections = [engine.connect() for _ in range(max(1, min(WARMUP_POOL_CONNECTIONS, pool_size)))]
+    for connection in connections:
+        connection.execute(text("SELECT 1"))
+        connection.close()
+
+    # Run the hot read paths once so their statements land in the compiled cache
+    db = SessionLocal()
+    try:
+        change_log.latest_token(db)
+        profile_crud.get_stats(db)
+        profile_crud.get_top_skills(db, live_stats.LIVE_STATS_TOP_SKILLS)
+        read_path.list_profiles(db, 0, 1)
+        read_path.list_projects(db, 0, 1)
+        profile_ids.load(db)
+        skill_index.ensure_loaded(db)
+        if READ_MODEL_ENABLED:
+            read_model.ensure_loaded(db)
+    finally:
+        db.close()
+
+
+state = HealthState()
@@ -0,0 +1,136 @@
+"""
+Interval index for time-range queries over work experience and projects
+Overlap ("active at any point between A and B") and stabbing ("active on
+day D") queries over date intervals, with open-ended intervals treated as
+running to infinity
+"""
+
+import os
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import models
+from background import SnapshotRefresher
+
+INTERVAL_INDEX_REFRESH_INTERVAL = float(os.getenv("INTERVAL_INDEX_REFRESH_INTERVAL", "10"))
+
+# End ordinal of open-ended intervals (is_current, or active with no end_date)
+OPEN_END = np.iinfo(np.int64).max
+
+
+def _ordinal(value) -> int:
+    if isinstance(value, datetime):
+        value = value.date()
+    return value.toordinal()
+
+
+class IntervalIndex:
+    """
+    Static interval index: intervals sorted by start, plus a sparse table
+    answering "which interval in this range of positions ends last" in O(1).
+
+    A query [lo, hi] first bisects to the prefix of intervals starting on or
+    before hi. Within a range of that prefix, the interval ending last either
+    ends before lo, so nothing in the range matches and it is dropped, or it
+    is reported and the range splits around it. Every range examined reports
+    an interval or is dropped, so queries run in O(log n + k) for k matches.
+    """
+
+    def __init__(self, ids: List[int], starts: List[int], ends: List[int]):
+        order = np.argsort(np.array(starts, dtype=np.int64), kind="stable")
+        self.ids = np.array(ids, dtype=np.int64)[order]
+        self.starts = np.array(starts, dtype=np.int64)[order]
+        self.ends = np.array(ends, dtype=np.int64)[order]
+        # latest[j][i]: position of the largest end in [i, i + 2**j)
+        self.latest = [np.arange(len(self.ends), dtype=np.int64)]
+        width = 1
+        while 2 * width <= len(self.ends):
+            previous = self.latest[-1]
+            left, right = previous[:len(previous) - width], previous[width:]
+            self.latest.append(np.where(self.ends[left] >= self.ends[right], left, right))
+            width *= 2
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _latest_ending(self, lo: int, hi: int) -> int:
+        """Position of the interval ending last among positions [lo, hi)"""
+        level = (hi - lo).bit_length() - 1
+        left, right = self.latest[level][lo], self.latest[level][hi - (1 << level)]
+        return int(left if self.ends[left] >= self.ends[right] else right)
+
+    def overlapping(self, lo: int, hi: int) -> List[int]:
+        """IDs of intervals with start <= hi and end >= lo, ordered by start"""
+        found: List[int] = []
+        # Ranges still to search and positions to report, popped in start order
+        pending = [(0, int(np.searchsorted(self.starts, hi, side="right")))]
+        while pending:
+            first, last = pending.pop()
+            if last is None:
+                found.append(int(self.ids[first]))
+                continue
+            if first >= last:
+                continue
+            position = self._latest_ending(first, last)
+            if self.ends[position] < lo:
+                continue
+            pending.extend(((position + 1, last), (position, None), (first, position)))
+        return found
+
+    def stabbing(self, point: int) -> List[int]:
+        """IDs of intervals containing point"""
+        return self.overlapping(point, point)
+
+
+class TimelineIndexes:
+    """Interval indexes over work experience (overall and per company) and projects"""
+
+    def __init__(self, work: IntervalIndex, work_by_company: Dict[str, IntervalIndex], projects: IntervalIndex):
+        self.work = work
+        self.work_by_company = work_by_company
+        self.projects = projects
+
+    def work_overlapping(self, lo: date, hi: date, company: Optional[str] = None) -> List[int]:
+        index = self.work if company is None else self.work_by_company.get(company.strip().lower())
+        return index.overlapping(_ordinal(lo), _ordinal(hi)) if index is not None else []
+
+    def projects_overlapping(self, lo: date, hi: date) -> List[int]:
+        return self.projects.overlapping(_ordinal(lo), _ordinal(hi))
+
+
+def build_indexes(db: Session) -> TimelineIndexes:
+    w, p = models.WorkExperience.__table__, models.Project.__table__
+
+    work_rows = db.execute(select(w.c.id, w.c.company, w.c.start_date, w.c.end_date, w.c.is_current)).all()
+    columns: Dict[str, List[List[int]]] = {}
+    for row_id, company, start, end, is_current in work_rows:
+        # Current positions and ones without an end date are still running
+        end_ordinal = OPEN_END if is_current or end is None else _ordinal(end)
+        for key in (None, company.strip().lower()):
+            ids, starts, ends = columns.setdefault(key, [[], [], []])
+            ids.append(row_id)
+            starts.append(_ordinal(start))
+            ends.append(end_ordinal)
+    work_all = IntervalIndex(*columns.pop(None, [[], [], []]))
+    by_company = {key: IntervalIndex(*values) for key, values in columns.items()}
+
+    ids, starts, ends = [], [], []
+    # Projects without a start date cannot be placed on the timeline
+    for row_id, start, end, is_active in db.execute(
+        select(p.c.id, p.c.start_date, p.c.end_date, p.c.is_active).where(p.c.start_date.isnot(None))
+    ):
+        ids.append(row_id)
+        starts.append(_ordinal(start))
+        if end is not None:
+            ends.append(_ordinal(end))
+        else:
+            # Active with no end runs on; finished with no end is known only by its start
+            ends.append(OPEN_END if is_active else _ordinal(start))
+    return TimelineIndexes(work_all, by_company, IntervalIndex(ids, starts, ends))
+
+
+timeline = SnapshotRefresher("intervals", build_indexes, INTERVAL_INDEX_REFRESH_INTERVAL)
@@ -0,0 +1,160 @@
+"""
+Cross-worker cache invalidation for Me-API Playground
+Each worker polls for commits made by any process (SQLite PRAGMA data_version,
+otherwise the change log high-water mark) and replays new change log entries
+into its in-process caches, so a write served by one worker reaches the
+others within INVALIDATION_POLL_INTERVAL
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import change_log
+from database import SQLALCHEMY_DATABASE_URL, SessionLocal
+from metrics import metrics
+from profile_registry import profile_ids
+from read_model import read_model
+from skill_index import skill_index
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_POLL_INTERVAL = float(os.getenv("INVALIDATION_POLL_INTERVAL", "0.25"))
+# More pending changes than this and caches are reset instead of patched
+INVALIDATION_MAX_CHANGES = int(os.getenv("INVALIDATION_MAX_CHANGES", "500"))
+
+Handler = Callable[[Session, List[dict]], None]
+
+
+class InvalidationBus:
+    """
+    Polls for commits from other connections and hands new change log
+    entries to the registered handlers.
+
+    handlers are called as handler(db, changes) to evict or patch the keys
+    the changes touch; reset handlers run instead when the worker fell too
+    far behind to replay.
+    """
+
+    def __init__(self, interval: float = INVALIDATION_POLL_INTERVAL, max_changes: int = INVALIDATION_MAX_CHANGES):
+        self.interval = interval
+        self.max_changes = max_changes
+        self.token: Optional[int] = None
+        self._handlers: List[Handler] = []
+        self._reset_handlers: List[Callable[[], None]] = []
+        self._data_version = None
+        self._probe = None
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, handler: Handler, reset: Callable[[], None]):
+        self._handlers.append(handler)
+        self._reset_handlers.append(reset)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="invalidation-bus")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._probe is not None:
+            self._probe.close()
+            self._probe.engine.dispose()
+            self._probe = None
+
+    def _database_changed(self) -> bool:
+        """Cheap check for commits since the last poll; always True where it cannot tell"""
+        if not SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+            return True
+        if self._probe is None:
+            # data_version is per connection, so the probe keeps one connection of its own
+            engine = create_engine(
+                SQLALCHEMY_DATABASE_URL, poolclass=StaticPool, connect_args={"check_same_thread": False}
+            )
+            self._probe = engine.connect()
+        version = self._probe.exec_driver_sql("PRAGMA data_version").scalar()
+        changed = version != self._data_version
+        self._data_version = version
+        return changed
+
+    def poll(self):
+        """One poll; runs in a worker thread"""
+        if not self._database_changed() and self.token is not None:
+            return
+        db = SessionLocal()
+        try:
+            latest = change_log.latest_token(db)
+            if self.token is None or latest < self.token:
+                # First poll, or the database was replaced underneath us
+                self.token = latest
+                return
+            if latest == self.token:
+                return
+            changes = change_log.get_changes(db, self.token, self.max_changes + 1)
+            # Compaction keeps each entity's newest entry, so replaying a compacted range is still exact
+            if len(changes) > self.max_changes:
+                logger.info(f"Invalidation bus is {latest - self.token} changes behind; resetting caches")
+                for reset in self._reset_handlers:
+                    reset()
+                metrics.inc("invalidation.resets")
+                self.token = latest
+                return
+            for handler in self._handlers:
+                handler(db, changes)
+            self.token = changes[-1]["token"]
+            metrics.inc("invalidation.changes_applied", len(changes))
+            lag = (datetime.utcnow() - changes[0]["timestamp"]).total_seconds()
+            metrics.observe("invalidation.lag_seconds", max(lag, 0.0))
+        finally:
+            db.close()
+
+    async def _run(self):
+        while True:
+            try:
+                await run_in_threadpool(self.poll)
+            except Exception as e:
+                logger.error(f"Invalidation poll failed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+def apply_profile_changes(db: Session, changes: List[dict]):
+    """Patch the profile ID registry and the skill bitmap index for the touched profiles"""
+    last_profile_op = {}
+    skill_profiles = set()
+    for change in changes:
+        if change["entity_type"] == "profile":
+            last_profile_op[change["entity_id"]] = change["op"]
+        elif change["entity_type"] == "skill" and change["profile_id"]:
+            skill_profiles.add(change["profile_id"])
+    for profile_id, op in last_profile_op.items():
+        if op == "delete":
+            profile_ids.discard(profile_id)
+            skill_index.remove_profile(profile_id)
+        elif op == "create":
+            profile_ids.add(profile_id)
+            skill_index.add_profile(profile_id)
+    for profile_id in skill_profiles:
+        if last_profile_op.get(profile_id) != "delete":
+            skill_index.reindex_profile(db, profile_id)
+
+
+def reset_profile_caches():
+    profile_ids.invalidate()
+    skill_index.invalidate()
+
+
+bus = InvalidationBus()
+bus.subscribe(apply_profile_changes, reset_profile_caches)
+bus.subscribe(read_model.apply_changes, read_model.invalidate)
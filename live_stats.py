@@ -0,0 +1,206 @@
+"""
+Live stats broadcaster for Me-API Playground
+One shared computation feeds every Server-Sent Events subscriber
+"""
+
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+import change_log
+import profile_crud
+from database import SessionLocal
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+LIVE_STATS_POLL_INTERVAL = float(os.getenv("LIVE_STATS_POLL_INTERVAL", "1.0"))
+LIVE_STATS_HEARTBEAT = float(os.getenv("LIVE_STATS_HEARTBEAT", "15"))
+LIVE_STATS_BUFFER = int(os.getenv("LIVE_STATS_BUFFER", "16"))
+LIVE_STATS_TOP_SKILLS = int(os.getenv("LIVE_STATS_TOP_SKILLS", "10"))
+LIVE_STATS_HISTORY = 64
+
+# Queued in place of dropped events; the stream sends a full snapshot instead
+RESYNC = object()
+
+
+def format_event(event: str, data: Any, event_id: Optional[int] = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def diff_stats(old: Dict[str, Any], new: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Delta between two snapshots, or None when nothing changed"""
+    counts = {k: new["counts"][k] for k in new["counts"] if old["counts"].get(k) != new["counts"][k]}
+    old_top = {s["name"]: s["count"] for s in old["top_skills"]}
+    new_top = {s["name"]: s["count"] for s in new["top_skills"]}
+    top_skills = {
+        "added": [{"name": n, "count": c} for n, c in new_top.items() if n not in old_top],
+        "removed": [n for n in old_top if n not in new_top],
+        "changed": [{"name": n, "count": c} for n, c in new_top.items() if n in old_top and old_top[n] != c],
+    }
+    order_changed = [s["name"] for s in old["top_skills"]] != [s["name"] for s in new["top_skills"]]
+    if not counts and not any(top_skills.values()) and not order_changed:
+        return None
+    delta: Dict[str, Any] = {"counts": counts, "top_skills": top_skills}
+    if order_changed:
+        delta["order"] = [s["name"] for s in new["top_skills"]]
+    return delta
+
+
+class Subscriber:
+    def __init__(self, buffer: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer)
+
+    def offer(self, event: str):
+        """Enqueue without blocking; a full buffer is replaced by a resync marker"""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            metrics.inc("live_stats.slow_consumer_resyncs")
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+
+class StatsBroadcaster:
+    """
+    Polls the change log high-water mark while anyone is listening and,
+    when it moves, recomputes stats once and pushes the delta to everyone.
+    """
+
+    def __init__(self, poll_interval: float = LIVE_STATS_POLL_INTERVAL, buffer: int = LIVE_STATS_BUFFER):
+        self.poll_interval = poll_interval
+        self.buffer = buffer
+        self.token: Optional[int] = None
+        self.snapshot: Optional[Dict[str, Any]] = None
+        self.subscribers: List[Subscriber] = []
+        self.history: deque = deque(maxlen=LIVE_STATS_HISTORY)  # (token, rendered delta event)
+        self.history_floor: Optional[int] = None  # deltas after this token are all in history
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="live-stats")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def subscribe(self) -> Subscriber:
+        subscriber = Subscriber(self.buffer)
+        self.subscribers.append(subscriber)
+        metrics.inc("live_stats.subscriptions")
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        if subscriber in self.subscribers:
+            self.subscribers.remove(subscriber)
+
+    def snapshot_event(self) -> str:
+        return format_event("snapshot", self.snapshot, self.token)
+
+    def replay_since(self, last_event_id: Optional[str]) -> Optional[List[str]]:
+        """Deltas after last_event_id, or None if they are no longer in history"""
+        if last_event_id is None:
+            return None
+        try:
+            last = int(last_event_id)
+        except ValueError:
+            return None
+        if last == self.token:
+            return []
+        if self.history_floor is None or not self.history_floor <= last < self.token:
+            return None
+        return [event for token, event in self.history if token > last]
+
+    async def refresh(self):
+        """Recompute the snapshot if the change log moved; publish any delta"""
+        async with self._lock:
+            token, snapshot = await run_in_threadpool(self._compute, self.token)
+            if token == self.token:
+                return
+            metrics.inc("live_stats.recomputations")
+            previous, self.token = self.snapshot, token
+            self.snapshot = snapshot
+            if previous is None:
+                self.history_floor = token
+                return
+            delta = diff_stats(previous, snapshot)
+            if delta is None:
+                return
+            event = format_event("delta", delta, token)
+            if len(self.history) == self.history.maxlen:
+                self.history_floor = self.history[0][0]
+            self.history.append((token, event))
+            for subscriber in list(self.subscribers):
+                subscriber.offer(event)
+
+    def _compute(self, known_token: Optional[int]):
+        db = SessionLocal()
+        try:
+            token = change_log.latest_token(db)
+            if token == known_token:
+                return token, self.snapshot
+            snapshot = {
+                "counts": profile_crud.get_stats(db),
+                "top_skills": profile_crud.get_top_skills(db, LIVE_STATS_TOP_SKILLS),
+            }
+            return token, snapshot
+        finally:
+            db.close()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if not self.subscribers:
+                continue
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Live stats refresh failed: {e}")
+
+
+broadcaster = StatsBroadcaster()
+
+
+async def event_stream(request, last_event_id: Optional[str]):
+    """SSE body for one client: catch-up events, then deltas and heartbeats"""
+    # Cheap when nothing changed: a single high-water-mark query
+    await broadcaster.refresh()
+    subscriber = broadcaster.subscribe()
+    try:
+        yield "retry: 3000\n\n"
+        replay = broadcaster.replay_since(last_event_id)
+        if replay is None:
+            yield broadcaster.snapshot_event()
+        else:
+            for event in replay:
+                yield event
+
+        while True:
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), LIVE_STATS_HEARTBEAT)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": heartbeat\n\n"
+                continue
+            yield broadcaster.snapshot_event() if event is RESYNC else event
+    finally:
+        broadcaster.unsubscribe(subscriber)
@@ -1,28 +1,116 @@
-from fastapi import FastAPI, HTTPException, Depends, Query
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
+from fastapi.encoders import jsonable_encoder
+from contextlib import asynccontextmanager
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 import models
 import profile_schemas
 import profile_crud
+import profile_filters
 from database import SessionLocal, engine
-from datetime import datetime
+from profile_registry import profile_ids
+from write_queue import write_queue, QueueFullError, WRITE_COALESCING
+from static_assets import asset_store, STATIC_RELOAD
+from compression import CompressionMiddleware
+from admission import AdmissionControlMiddleware, pool_monitor
+import deadlines
+from sqlalchemy.exc import OperationalError, StatementError
+from metrics import metrics
+import batch
+import change_log
+import live_stats
+import skill_analytics
+import profile_similarity
+import analytics
+import columnar
+import intervals
+import facets
+import invalidation
+import health
+import read_path
+import profile_documents
+from read_model import read_model, READ_MODEL_ENABLED
+from skill_index import skill_index, parse_query, MatchQueryError
+import asyncio
+import itertools
+from fastapi.concurrency import run_in_threadpool
+from datetime import date, datetime
 import logging 
+import os
+import time
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Cancel SQL statements that outlive their request's deadline
+deadlines.install(engine)
+
 # Create database tables
 models.Base.metadata.create_all(bind=engine)
+profile_filters.ensure_indexes(engine)
+
+# Load frontend assets into memory once; "/" is served without disk I/O
+asset_store.register("index", os.path.join("static", "index.html"), "text/html; charset=utf-8")
+
+def _compact_change_log():
+    db = SessionLocal()
+    try:
+        removed = change_log.compact(db)
+        if removed:
+            logger.info(f"Compacted change log: removed {removed} superseded entries")
+    finally:
+        db.close()
+
+async def _compact_change_log_periodically():
+    while True:
+        await asyncio.sleep(change_log.CHANGE_LOG_COMPACT_INTERVAL)
+        try:
+            await run_in_threadpool(_compact_change_log)
+        except Exception as e:
+            logger.error(f"Change log compaction failed: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if STATIC_RELOAD:
+        asset_store.start_watching()
+    if WRITE_COALESCING:
+        await write_queue.start()
+    compactor = asyncio.create_task(_compact_change_log_periodically())
+    live_stats.broadcaster.start()
+    skill_analytics.cooccurrence.start()
+    profile_similarity.similarity_index.start()
+    analytics.rollups.start()
+    columnar.snapshot.start()
+    intervals.timeline.start()
+    facets.facet_index.start()
+    invalidation.bus.start()
+    # Probes the database, then warms up; /readyz reports ready once that finishes
+    health.state.start()
+    yield
+    await health.state.stop()
+    await invalidation.bus.stop()
+    await facets.facet_index.stop()
+    await intervals.timeline.stop()
+    await columnar.snapshot.stop()
+    await analytics.rollups.stop()
+    await profile_similarity.similarity_index.stop()
+    await skill_analytics.cooccurrence.stop()
+    await live_stats.broadcaster.stop()
+    compactor.cancel()
+    await write_queue.stop()
+    asset_store.stop_watching()
 
 app = FastAPI(
     title="Me-API Playground",
     description="A comprehensive profile management API playground for showcasing skills, projects, and experience",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -34,35 +122,110 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Gzip JSON responses above COMPRESSION_MIN_SIZE; streaming bodies are compressed per chunk
+app.add_middleware(CompressionMiddleware)
+
+# Per-request deadline, enforced inside SQL execution (see deadlines.py)
+app.add_middleware(deadlines.DeadlineMiddleware)
+
+# Outermost: rate limit per client and shed low-priority routes before any work is done
+app.add_middleware(AdmissionControlMiddleware)
+
+@app.exception_handler(deadlines.DeadlineExceeded)
+@app.exception_handler(OperationalError)
+@app.exception_handler(StatementError)
+async def deadline_exceeded_handler(request: Request, exc: Exception):
+    """Map statements cancelled by the request deadline to 504"""
+    cause = getattr(exc, "orig", None) or exc
+    if not deadlines.is_cancellation(cause):
+        raise exc
+    route = request.scope.get("route")
+    metrics.inc("deadline.cancelled")
+    metrics.inc(f"deadline.cancelled.{route.path if route else request.url.path}")
+    return JSONResponse(status_code=504, content={"detail": "Request deadline exceeded"})
+
 # Mount static files for frontend (only if directory exists)
-import os
 if os.path.exists("static"):
     app.mount("/static", StaticFiles(directory="static"), name="static")
 
 # Dependency to get database session
-def get_db():
+def get_db(request: Request):
+    # Sub-requests of POST /batch share the batch's session
+    shared = request.scope.get(batch.BATCH_SESSION_KEY)
+    if shared is not None:
+        yield shared
+        return
     db = SessionLocal()
     try:
+        # Check out the connection up front so pool wait time feeds admission control
+        started = time.perf_counter()
+        db.connection()
+        pool_monitor.record_wait(time.perf_counter() - started)
         yield db
     finally:
         db.close()
 
-# Health Check Endpoint
+def _require_profile(db: Session, profile_id: int):
+    """
+    Raise 404 for unknown profile IDs.
+    
+    Known IDs are checked in memory; a registry miss costs one primary key
+    lookup before the 404.
+    """
+    if not profile_ids.exists(db, profile_id):
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+async def _write(db: Session, fn, *args):
+    """
+    Run a profile_crud write function.
+    
+    With WRITE_COALESCING on, the call is queued and group-committed with
+    other concurrent writes; otherwise it runs on the request's session.
+    """
+    if write_queue.running:
+        try:
+            return await write_queue.submit(fn, *args)
+        except QueueFullError:
+            raise HTTPException(status_code=503, detail="Too many pending writes", headers={"Retry-After": "1"})
+    return fn(db, *args)
+
+# Health Check Endpoints
+@app.get("/livez", tags=["Health"])
+async def liveness():
+    """
+    Liveness probe: the process is up and its event loop is responsive.
+    
+    Answered from memory without touching the database.
+    """
+    return {"status": "alive", "uptime_seconds": round(time.time() - health.state.started_at, 3)}
+
+@app.get("/readyz", tags=["Health"])
+async def readiness():
+    """
+    Readiness probe: warm-up has finished and the last database probe succeeded.
+    
+    Returns:
+        200 with warm-up and database probe details when ready, 503 otherwise
+    """
+    await health.state.ensure_probed()
+    return JSONResponse(
+        status_code=200 if health.state.is_ready() else 503,
+        content=health.state.readiness(),
+    )
+
 @app.get("/health", response_model=profile_schemas.HealthCheck, tags=["Health"])
-async def health_check(db: Session = Depends(get_db)):
+async def health_check():
     """
-    Health check endpoint for liveness checks.
+    Health status of the API and database.
+    
+    The database status comes from the background prober (every
+    HEALTH_PROBE_INTERVAL seconds) rather than a query per request.
     
     Returns:
         Health status of the API and database
     """
-    try:
-        # Test database connection
-        db.execute("SELECT 1")
-        db_status = "connected"
-    except Exception as e:
-        logger.error(f"Database connection failed: {e}")
-        db_status = "disconnected"
+    await health.state.ensure_probed()
+    db_status = health.state.database
     
     return {
         "status": "healthy" if db_status == "connected" else "unhealthy",
@@ -71,17 +234,26 @@ async def health_check(db: Session = Depends(get_db)):
         "version": "1.0.0"
     }
 
+@app.get("/metrics", tags=["Health"])
+async def get_metrics():
+    """
+    In-process counters and timing summaries (compression CPU time, bytes saved, ...).
+    """
+    return metrics.snapshot()
+
 # Root endpoint
 @app.get("/", response_class=HTMLResponse, tags=["Frontend"])
-async def root():
+async def root(request: Request):
     """
-    Serve the main frontend page.
+    Serve the main frontend page from memory.
+    
+    The page is precompressed at startup and negotiated via Accept-Encoding;
+    clients revalidate with If-None-Match and get a 304 when unchanged.
     """
-    try:
-        with open("static/index.html", "r",encoding="utf-8") as f:
-            return HTMLResponse(content=f.read())
-    except FileNotFoundError:
-        return HTMLResponse(content="""
+    asset = asset_store.get("index")
+    if asset is not None:
+        return asset.respond(request)
+    return HTMLResponse(content="""
         <html>
             <head><title>Me-API Playground</title></head>
             <body>
@@ -108,42 +280,172 @@ async def create_profile(profile: profile_schemas.ProfileCreate, db: Session = D
     if existing_profile:
         raise HTTPException(status_code=400, detail="Email already exists")
     
-    return profile_crud.create_profile(db, profile)
+    try:
+        return await _write(db, profile_crud.create_profile, profile)
+    except IntegrityError:
+        # Lost a race with a concurrent create using the same email
+        raise HTTPException(status_code=400, detail="Email already exists")
 
 @app.get("/profiles", response_model=List[profile_schemas.Profile], tags=["Profiles"])
 async def list_profiles(
     skip: int = Query(0, ge=0, description="Number of profiles to skip"),
     limit: int = Query(100, ge=1, le=100, description="Maximum number of profiles to return"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields, e.g. name,email,skills.name"),
+    include: Optional[str] = Query(None, description="Comma-separated relations, e.g. skills,links"),
+    filter_: Optional[str] = Query(None, alias="filter", description='Filter expression, e.g. location:"San Francisco" AND skill:python'),
+    explain: bool = Query(False, description="Return the generated SQL and query plan instead of profiles"),
     db: Session = Depends(get_db)
 ):
     """
     List all profiles with pagination.
     
+    Filter terms are field:value pairs combined with AND (or juxtaposition),
+    OR, NOT and parentheses. Fields: name, email, location, education and
+    project/position (substring); skill, level, category and worked_at
+    (exact, * wildcard); technology (project technology).
+    
     Args:
         skip: Number of profiles to skip
         limit: Maximum number of profiles to return
+        fields: Optional sparse fieldset; only these columns are selected
+        include: Optional relations to load alongside each profile
+        filter_: Optional filter expression
+        explain: Return the SQL, bound values and EXPLAIN QUERY PLAN output
         
     Returns:
         List of profiles
     """
-    return profile_crud.get_all_profiles(db, skip=skip, limit=limit)
+    where, params = None, {}
+    if filter_:
+        try:
+            where, params = profile_filters.compile_filter(filter_)
+        except profile_filters.FilterError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    if explain:
+        query = profile_filters.filtered_profiles_query(where).offset(skip).limit(limit)
+        return JSONResponse(content=jsonable_encoder(profile_filters.explain(db, query, params)))
+    if fields or include:
+        return _sparse_response(db, fields, include, skip=skip, limit=limit, where=where, params=params)
+    if READ_MODEL_ENABLED and where is None:
+        return read_path.json_response(read_model.list_profiles(db, skip, limit))
+    return read_path.json_response(read_path.list_profiles(db, skip, limit, where, params))
+
+def _sparse_response(db: Session, fields: Optional[str], include: Optional[str], profile_id: Optional[int] = None, **page):
+    """Run a sparse fieldset query and return its JSON, bypassing the full response model"""
+    try:
+        profile_columns, relations = profile_crud.parse_fieldset(fields, include)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    profiles = profile_crud.get_sparse_profiles(db, profile_columns, relations, profile_id=profile_id, **page)
+    if profile_id is None:
+        return JSONResponse(content=jsonable_encoder(profiles))
+    if not profiles:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return JSONResponse(content=jsonable_encoder(profiles[0]))
+
+def _read_model_response(db: Session, profile_id: int, relation: Optional[str] = None):
+    """Serve a profile (or one of its relations) from the in-memory read model"""
+    _require_profile(db, profile_id)
+    found = read_model.get_children(db, profile_id, relation) if relation else read_model.get_document(db, profile_id)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return read_path.json_response(found)
+
+# Declared before /profiles/{profile_id} so "match" is not parsed as an ID
+@app.get("/profiles/match", response_model=profile_schemas.ProfileMatchResponse, tags=["Profiles"])
+async def match_profiles(
+    q: str = Query(..., min_length=1, description='Skill expression, e.g. python AND docker AND (aws OR gcp) AND python>=advanced'),
+    skip: int = Query(0, ge=0, description="Number of profiles to skip"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of profiles to return"),
+    db: Session = Depends(get_db)
+):
+    """
+    Find profiles by a boolean expression over their skills.
+    
+    Terms are skill names (quote names with spaces), optionally with a level
+    comparison: `python=expert`, `python>=advanced`, `go<advanced`. Terms
+    combine with AND (or juxtaposition), OR, NOT and parentheses. Levels
+    are ordered beginner < intermediate < advanced < expert.
+    
+    Args:
+        q: Match expression
+        skip: Number of profiles to skip
+        limit: Maximum number of profiles to return
+        
+    Returns:
+        Matching profiles ordered by ID and the total number of matches
+    """
+    try:
+        expression = parse_query(q)
+    except MatchQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    matched = skill_index.evaluate(db, expression)
+    page = list(itertools.islice(iter(matched), skip, skip + limit))
+    return {"query": q, "results": profile_crud.get_profiles_by_ids(db, page), "total": len(matched)}
 
 @app.get("/profiles/{profile_id}", response_model=profile_schemas.ProfileComplete, tags=["Profiles"])
-async def get_profile(profile_id: int, db: Session = Depends(get_db)):
+async def get_profile(
+    profile_id: int,
+    fields: Optional[str] = Query(None, description="Comma-separated fields, e.g. name,email,skills.name"),
+    include: Optional[str] = Query(None, description="Comma-separated relations, e.g. skills,links"),
+    db: Session = Depends(get_db)
+):
     """
     Get a complete profile with all related data.
     
+    Served from the pre-rendered profile_documents row, which is regenerated
+    in the same transaction as every write to the profile.
+    
     Args:
         profile_id: ID of the profile to retrieve
+        fields: Optional sparse fieldset; only these columns are selected
+        include: Optional relations to load; others are not queried
         
     Returns:
         Complete profile information including skills, projects, work experience, and links
     """
+    if fields or include:
+        return _sparse_response(db, fields, include, profile_id=profile_id)
+    if READ_MODEL_ENABLED:
+        return _read_model_response(db, profile_id)
+    document = profile_documents.get(db, profile_id)
+    if document is not None:
+        return Response(content=document, media_type="application/json")
+
+    # Not rendered yet (rows written outside profile_crud, before a rebuild)
+    metrics.inc("profile_documents.misses")
     profile = profile_crud.get_complete_profile(db, profile_id)
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     return profile
 
+@app.get("/profiles/{profile_id}/similar", response_model=profile_schemas.SimilarProfilesResponse, tags=["Profiles"])
+async def get_similar_profiles(
+    profile_id: int,
+    limit: int = Query(10, ge=1, le=50, description="Number of similar profiles to return"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get profiles with overlapping skills, project technologies and companies.
+    
+    Candidates come from a MinHash LSH index kept up to date from the change
+    log, so similarity is an estimate of the Jaccard overlap of feature sets.
+    
+    Args:
+        profile_id: ID of the profile to compare against
+        limit: Number of similar profiles to return
+        
+    Returns:
+        Similar profiles ranked by estimated similarity
+    """
+    _require_profile(db, profile_id)
+    index = await profile_similarity.similarity_index.get()
+    similar = index.similar(profile_id, limit)
+    names = profile_crud.get_profile_names(db, [item["profile_id"] for item in similar])
+    # Profiles deleted since the last refresh are skipped
+    similar = [dict(item, name=names[item["profile_id"]]) for item in similar if item["profile_id"] in names]
+    return {"profile_id": profile_id, "similar": similar}
+
 @app.put("/profiles/{profile_id}", response_model=profile_schemas.Profile, tags=["Profiles"])
 async def update_profile(
     profile_id: int, 
@@ -160,7 +462,7 @@ async def update_profile(
     Returns:
         Updated profile information
     """
-    profile = profile_crud.update_profile(db, profile_id, profile_update)
+    profile = await _write(db, profile_crud.update_profile, profile_id, profile_update)
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     return profile
@@ -176,7 +478,7 @@ async def delete_profile(profile_id: int, db: Session = Depends(get_db)):
     Returns:
         Success message
     """
-    success = profile_crud.delete_profile(db, profile_id)
+    success = await _write(db, profile_crud.delete_profile, profile_id)
     if not success:
         raise HTTPException(status_code=404, detail="Profile not found")
     return {"message": "Profile deleted successfully"}
@@ -198,12 +500,11 @@ async def add_skill(
     Returns:
         Created skill information
     """
-    # Check if profile exists
-    profile = profile_crud.get_profile(db, profile_id)
-    if not profile:
+    _require_profile(db, profile_id)
+    created = await _write(db, profile_crud.create_skill, profile_id, skill)
+    if created is None:
         raise HTTPException(status_code=404, detail="Profile not found")
-    
-    return profile_crud.create_skill(db, profile_id, skill)
+    return created
 
 @app.get("/profiles/{profile_id}/skills", response_model=List[profile_schemas.Skill], tags=["Skills"])
 async def get_profile_skills(profile_id: int, db: Session = Depends(get_db)):
@@ -216,12 +517,13 @@ async def get_profile_skills(profile_id: int, db: Session = Depends(get_db)):
     Returns:
         List of skills for the profile
     """
-    # Check if profile exists
-    profile = profile_crud.get_profile(db, profile_id)
-    if not profile:
+    if READ_MODEL_ENABLED:
+        return _read_model_response(db, profile_id, "skills")
+    _require_profile(db, profile_id)
+    skills = profile_crud.get_skills_by_profile(db, profile_id)
+    if skills is None:
         raise HTTPException(status_code=404, detail="Profile not found")
-    
-    return profile_crud.get_skills_by_profile(db, profile_id)
+    return skills
 
 @app.get("/skills/top", response_model=profile_schemas.TopSkillsResponse, tags=["Skills"])
 async def get_top_skills(
@@ -237,9 +539,40 @@ async def get_top_skills(
     Returns:
         List of most common skills with their counts
     """
-    skills = profile_crud.get_top_skills(db, limit)
+    if READ_MODEL_ENABLED:
+        skills = read_model.top_skills(db, limit)
+    else:
+        skills = profile_crud.get_top_skills(db, limit)
     return {"skills": skills, "total": len(skills)}
 
+@app.get("/skills/{name}/related", response_model=profile_schemas.RelatedSkillsResponse, tags=["Skills"])
+async def get_related_skills(
+    name: str,
+    limit: int = Query(10, ge=1, le=50, description="Number of related skills to return"),
+    sort: str = Query("count", pattern="^(count|lift)$", description="Rank by co-occurrence count or lift")
+):
+    """
+    Get skills most often listed by profiles that also list the given skill.
+    
+    Served from a precomputed co-occurrence matrix that is refreshed in the
+    background, so results may lag writes by SKILL_ANALYTICS_REFRESH_INTERVAL.
+    Each sort keeps its own top SKILL_ANALYTICS_TOP_K over every pair, so
+    sort=lift ranks all co-occurring skills, not just the most frequent ones.
+    
+    Args:
+        name: Skill name (case-insensitive)
+        limit: Number of related skills to return
+        sort: "count" or "lift"
+        
+    Returns:
+        Related skills with co-occurrence count, confidence and lift
+    """
+    snapshot = await skill_analytics.cooccurrence.get()
+    related = snapshot.related(name, limit, sort)
+    if related is None:
+        raise HTTPException(status_code=404, detail="Skill not found")
+    return {"skill": name, "profiles": int(snapshot.totals[snapshot.index[name.lower()]]), "related": related}
+
 # Projects Management Endpoints
 @app.post("/profiles/{profile_id}/projects", response_model=profile_schemas.Project, tags=["Projects"])
 async def add_project(
@@ -257,12 +590,11 @@ async def add_project(
     Returns:
         Created project information
     """
-    # Check if profile exists
-    profile = profile_crud.get_profile(db, profile_id)
-    if not profile:
+    _require_profile(db, profile_id)
+    created = await _write(db, profile_crud.create_project, profile_id, project)
+    if created is None:
         raise HTTPException(status_code=404, detail="Profile not found")
-    
-    return profile_crud.create_project(db, profile_id, project)
+    return created
 
 @app.get("/profiles/{profile_id}/projects", response_model=List[profile_schemas.Project], tags=["Projects"])
 async def get_profile_projects(profile_id: int, db: Session = Depends(get_db)):
@@ -275,12 +607,13 @@ async def get_profile_projects(profile_id: int, db: Session = Depends(get_db)):
     Returns:
         List of projects for the profile
     """
-    # Check if profile exists
-    profile = profile_crud.get_profile(db, profile_id)
-    if not profile:
+    if READ_MODEL_ENABLED:
+        return _read_model_response(db, profile_id, "projects")
+    _require_profile(db, profile_id)
+    projects = profile_crud.get_projects_by_profile(db, profile_id)
+    if projects is None:
         raise HTTPException(status_code=404, detail="Profile not found")
-    
-    return profile_crud.get_projects_by_profile(db, profile_id)
+    return projects
 
 @app.get("/projects", response_model=profile_schemas.ProjectSearchResponse, tags=["Projects"])
 async def search_projects_by_skill(
@@ -315,10 +648,72 @@ async def list_all_projects(
     Returns:
         List of projects
     """
-    return profile_crud.get_all_projects(db, skip=skip, limit=limit)
+    if READ_MODEL_ENABLED:
+        return read_path.json_response(read_model.list_projects(db, skip=skip, limit=limit))
+    return read_path.json_response(read_path.list_projects(db, skip=skip, limit=limit))
+
+def _date_range(start: date, end: Optional[date]):
+    """Validate a query range; a missing end makes it a single day"""
+    end = end or start
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    return start, end
+
+@app.get("/projects/active", response_model=profile_schemas.ProjectSearchResponse, tags=["Projects"])
+async def get_active_projects(
+    start: date = Query(..., description="Range start (YYYY-MM-DD)"),
+    end: Optional[date] = Query(None, description="Range end (YYYY-MM-DD); omit for a single day"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of projects to return"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get projects active at any point between start and end.
+    
+    Active projects without an end date run on indefinitely. Projects
+    without a start date are not included.
+    
+    Args:
+        start: Range start
+        end: Range end (defaults to start)
+        limit: Maximum number of projects to return
+        
+    Returns:
+        Matching projects ordered by start date, and the total number of matches
+    """
+    start, end = _date_range(start, end)
+    timeline = await intervals.timeline.get()
+    ids = timeline.projects_overlapping(start, end)
+    return {"projects": profile_crud.get_projects_by_ids(db, ids[:limit]), "total": len(ids)}
 
 
 # Work Experience Management Endpoints
+@app.get("/work/overlapping", response_model=profile_schemas.WorkExperienceSearchResponse, tags=["Work Experience"])
+async def get_overlapping_work_experience(
+    start: date = Query(..., description="Range start (YYYY-MM-DD)"),
+    end: Optional[date] = Query(None, description="Range end (YYYY-MM-DD); omit for a single day"),
+    company: Optional[str] = Query(None, description="Only positions at this company (case-insensitive)"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of positions to return"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get positions held at any point between start and end.
+    
+    Current positions and positions without an end date count as ongoing.
+    
+    Args:
+        start: Range start
+        end: Range end (defaults to start)
+        company: Optional company filter
+        limit: Maximum number of positions to return
+        
+    Returns:
+        Matching work experience ordered by start date, and the total number of matches
+    """
+    start, end = _date_range(start, end)
+    timeline = await intervals.timeline.get()
+    ids = timeline.work_overlapping(start, end, company)
+    return {"work_experiences": profile_crud.get_work_experiences_by_ids(db, ids[:limit]), "total": len(ids)}
+
 @app.post("/profiles/{profile_id}/work", response_model=profile_schemas.WorkExperience, tags=["Work Experience"])
 async def add_work_experience(
     profile_id: int, 
@@ -335,12 +730,11 @@ async def add_work_experience(
     Returns:
         Created work experience information
     """
-    # Check if profile exists
-    profile = profile_crud.get_profile(db, profile_id)
-    if not profile:
+    _require_profile(db, profile_id)
+    created = await _write(db, profile_crud.create_work_experience, profile_id, work_exp)
+    if created is None:
         raise HTTPException(status_code=404, detail="Profile not found")
-    
-    return profile_crud.create_work_experience(db, profile_id, work_exp)
+    return created
 
 @app.get("/profiles/{profile_id}/work", response_model=List[profile_schemas.WorkExperience], tags=["Work Experience"])
 async def get_profile_work_experience(profile_id: int, db: Session = Depends(get_db)):
@@ -353,12 +747,13 @@ async def get_profile_work_experience(profile_id: int, db: Session = Depends(get
     Returns:
         List of work experiences for the profile
     """
-    # Check if profile exists
-    profile = profile_crud.get_profile(db, profile_id)
-    if not profile:
+    if READ_MODEL_ENABLED:
+        return _read_model_response(db, profile_id, "work_experiences")
+    _require_profile(db, profile_id)
+    work_experiences = profile_crud.get_work_experiences_by_profile(db, profile_id)
+    if work_experiences is None:
         raise HTTPException(status_code=404, detail="Profile not found")
-    
-    return profile_crud.get_work_experiences_by_profile(db, profile_id)
+    return work_experiences
 
 # Profile Links Management Endpoints
 @app.post("/profiles/{profile_id}/links", response_model=profile_schemas.ProfileLink, tags=["Profile Links"])
@@ -377,12 +772,11 @@ async def add_profile_link(
     Returns:
         Created link information
     """
-    # Check if profile exists
-    profile = profile_crud.get_profile(db, profile_id)
-    if not profile:
+    _require_profile(db, profile_id)
+    created = await _write(db, profile_crud.create_profile_link, profile_id, link)
+    if created is None:
         raise HTTPException(status_code=404, detail="Profile not found")
-    
-    return profile_crud.create_profile_link(db, profile_id, link)
+    return created
 
 @app.get("/profiles/{profile_id}/links", response_model=List[profile_schemas.ProfileLink], tags=["Profile Links"])
 async def get_profile_links(profile_id: int, db: Session = Depends(get_db)):
@@ -395,12 +789,13 @@ async def get_profile_links(profile_id: int, db: Session = Depends(get_db)):
     Returns:
         List of links for the profile
     """
-    # Check if profile exists
-    profile = profile_crud.get_profile(db, profile_id)
-    if not profile:
+    if READ_MODEL_ENABLED:
+        return _read_model_response(db, profile_id, "links")
+    _require_profile(db, profile_id)
+    links = profile_crud.get_links_by_profile(db, profile_id)
+    if links is None:
         raise HTTPException(status_code=404, detail="Profile not found")
-    
-    return profile_crud.get_links_by_profile(db, profile_id)
+    return links
 
 # Search Endpoints
 @app.get("/search", response_model=profile_schemas.SearchResponse, tags=["Search"])
@@ -419,8 +814,36 @@ async def global_search(
     Returns:
         Search results across all content types
     """
-    results = profile_crud.global_search(db, q, limit)
-    return {"results": results, "total": len(results), "query": q}
+    results = read_path.global_search(db, q, limit)
+    return read_path.json_response({"results": results, "total": len(results), "query": q})
+
+@app.get("/search/faceted", response_model=profile_schemas.FacetedSearchResponse, tags=["Search"])
+async def faceted_search(
+    q: Optional[str] = Query(None, description="Words matched (by prefix) against names, skills, technologies, companies and locations"),
+    category: List[str] = Query([], description="Skill category; repeat to OR values"),
+    level: List[str] = Query([], description="Skill level; repeat to OR values"),
+    location: List[str] = Query([], description="Profile location; repeat to OR values"),
+    technology: List[str] = Query([], description="Project technology; repeat to OR values"),
+    company: List[str] = Query([], description="Company worked at; repeat to OR values"),
+    skip: int = Query(0, ge=0, description="Number of profiles to skip"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of profiles to return"),
+    db: Session = Depends(get_db)
+):
+    """
+    Search profiles and narrow them by facets, with result counts per facet value.
+    
+    Different facets are AND-ed and repeated values of one facet are OR-ed,
+    e.g. `?category=cloud&level=expert&location=Seattle, WA`.
+    
+    Returns:
+        Matching profiles (by ID), the total number of matches, and for each
+        facet the values present in the matches with their counts
+    """
+    index = await facets.facet_index.get()
+    filters = {"category": category, "level": level, "location": location, "technology": technology, "company": company}
+    matched, counts = index.search(q, filters)
+    page = list(itertools.islice(iter(matched), skip, skip + limit))
+    return {"results": profile_crud.get_profiles_by_ids(db, page), "total": len(matched), "facets": counts}
 
 # Skills Search Endpoint
 @app.get("/skills/search", response_model=List[profile_schemas.Skill], tags=["Skills"])
@@ -439,19 +862,148 @@ async def search_skills(
     Returns:
         List of matching skills
     """
-    return profile_crud.search_skills(db, skill, level)
+    if READ_MODEL_ENABLED:
+        return read_path.json_response(read_model.search_skills(db, skill, level))
+    return read_path.json_response(read_path.search_skills(db, skill, level))
 
 @app.get("/stats")
-def get_stats(db: Session = Depends(get_db)):
-    profiles_count = db.query(models.Profile).count()
-    skills_count = db.query(models.Skill).count()
-    projects_count = db.query(models.Project).count()
+async def get_stats(db: Session = Depends(get_db)):
+    if READ_MODEL_ENABLED:
+        return read_model.stats(db)
+    return profile_crud.get_stats(db)
 
-    return {
-        "profiles": profiles_count,
-        "skills": skills_count,
-        "projects": projects_count
-    }
+# Analytics Endpoints
+async def _rollup_response(name: str) -> Response:
+    """Serve a precomputed rollup; the body was encoded when it was built"""
+    encoded = await analytics.rollups.get()
+    return Response(content=encoded[name], media_type="application/json")
+
+@app.get("/analytics/skill-levels", tags=["Analytics"])
+async def get_skill_level_rollup():
+    """
+    Skill level distribution per skill category.
+    
+    Returns:
+        Categories with total and per-level skill counts
+    """
+    return await _rollup_response("skill-levels")
+
+@app.get("/analytics/technology-trends", tags=["Analytics"])
+async def get_technology_trend_rollup():
+    """
+    Technology usage by project start month.
+    
+    Returns:
+        Technologies (most used first) with project counts per YYYY-MM month
+    """
+    return await _rollup_response("technology-trends")
+
+@app.get("/analytics/employment", tags=["Analytics"])
+async def get_employment_rollup():
+    """
+    Current versus past employment.
+    
+    Returns:
+        Current and past position counts and profiles currently employed
+    """
+    return await _rollup_response("employment")
+
+@app.get("/analytics/snapshot", tags=["Analytics"])
+async def describe_columnar_snapshot():
+    """
+    Tables, row counts, column encodings and memory of the columnar snapshot.
+    """
+    snapshot = await columnar.snapshot.get()
+    return {"built_at": columnar.snapshot.built_at, "tables": snapshot.describe()}
+
+@app.get("/analytics/query", tags=["Analytics"])
+async def query_columnar_snapshot(
+    table: str = Query(..., description="Table, e.g. skills, projects, project_technologies, work_experiences"),
+    where: List[str] = Query([], description="Conditions AND-ed together, e.g. level=expert or start_date>=2024-01-01"),
+    group_by: Optional[str] = Query(None, description="Comma-separated columns to group by"),
+    count_distinct: Optional[str] = Query(None, description="Count distinct values of this column instead of rows"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of groups")
+):
+    """
+    Ad-hoc filter and group-by over the in-memory columnar snapshot.
+    
+    Args:
+        table: Table to query
+        where: Repeatable conditions (=, != on text; =, !=, <, <=, >, >= on numbers and dates)
+        group_by: Columns to group by
+        count_distinct: Column whose distinct values are counted per group
+        limit: Maximum number of groups
+        
+    Returns:
+        Matched row count and counts per group, largest first
+    """
+    snapshot = await columnar.snapshot.get()
+    columns = [c.strip() for c in group_by.split(",") if c.strip()] if group_by else None
+    try:
+        return await run_in_threadpool(snapshot.query, table, where, columns, count_distinct, limit)
+    except columnar.QueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/events/stats", tags=["Live"])
+async def stream_stats(request: Request):
+    """
+    Server-Sent Events stream of dashboard stats and top skills.
+    
+    Sends a `snapshot` event first (or replays missed `delta` events when
+    reconnecting with Last-Event-ID), then a `delta` event whenever a write
+    changes the counts or the top skills. Idle streams get heartbeat comments.
+    """
+    return StreamingResponse(
+        live_stats.event_stream(request, request.headers.get("last-event-id")),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# Change Data Capture Endpoint
+@app.get("/changes", response_model=profile_schemas.ChangesResponse, tags=["Sync"])
+async def get_changes(
+    since: int = Query(0, ge=0, description="Return changes after this token"),
+    limit: int = Query(500, ge=1, le=5000, description="Maximum number of changes to return"),
+    db: Session = Depends(get_db)
+):
+    """
+    Incremental sync: every create/update/delete after the given token.
+    
+    Args:
+        since: Token from a previous response's `next` (0 for a full sync)
+        limit: Maximum number of changes to return
+        
+    Returns:
+        Changes in token order, the next token and whether more are pending
+    """
+    changes = change_log.get_changes(db, since, limit + 1)
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    next_token = changes[-1]["token"] if changes else since
+    return {"changes": changes, "next": next_token, "has_more": has_more}
+
+# Batch Endpoint
+@app.post("/batch", response_model=profile_schemas.BatchResponse, tags=["Batch"])
+async def run_batch(batch_request: profile_schemas.BatchRequest, request: Request, db: Session = Depends(get_db)):
+    """
+    Execute several API calls in one round trip.
+    
+    Sub-requests run in-process over one database session. Consecutive GETs
+    run concurrently; writes run in order.
+    
+    Args:
+        batch_request: List of sub-requests (method, path, optional body)
+        
+    Returns:
+        One response per sub-request with its status code and body
+    """
+    if len(batch_request.requests) > batch.BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: at most {batch.BATCH_MAX_SIZE} requests allowed"
+        )
+    responses = await batch.run_batch(app, batch_request.requests, db, request.scope)
+    return {"responses": responses, "total": len(responses)}
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, JSON, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, JSON, Boolean, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
@@ -83,6 +83,39 @@ class ProfileLink(Base):
     # Relationships
     profile = relationship("Profile", back_populates="links")
 
+# Change Data Capture
+class ChangeLog(Base):
+    __tablename__ = "change_log"
+    
+    id = Column(Integer, primary_key=True)  # monotonic sync token
+    entity_type = Column(String(30), nullable=False)  # profile, skill, project, work_experience, profile_link
+    entity_id = Column(Integer, nullable=False)
+    profile_id = Column(Integer, index=True)  # owning profile, for cache invalidation
+    op = Column(String(10), nullable=False)  # create, update, delete
+    version = Column(Integer, nullable=False)  # per-entity counter
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index("ix_change_log_entity", "entity_type", "entity_id"),
+        # AUTOINCREMENT keeps tokens monotonic even after compaction deletes rows
+        {"sqlite_autoincrement": True},
+    )
+
+# Pre-rendered read side: GET /profiles/{id} bodies (see profile_documents.py)
+class ProfileDocument(Base):
+    __tablename__ = "profile_documents"
+    
+    profile_id = Column(Integer, primary_key=True)  # no FK: removed in the same transaction as its profile
+    document = Column(LargeBinary, nullable=False)  # ProfileComplete JSON, UTF-8
+    version = Column(Integer, nullable=False)  # bumped on every regeneration
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+# Expression indexes serving the EXISTS subqueries of /profiles?filter= (see profile_filters.py)
+FILTER_INDEXES = (
+    Index("ix_skills_profile_lower_name", Skill.profile_id, func.lower(Skill.name)),
+    Index("ix_work_experiences_profile_lower_company", WorkExperience.profile_id, func.lower(WorkExperience.company)),
+)
+
 # Legacy Wallet Management Models (keeping for backward compatibility)
 class User(Base):
     __tablename__ = "users"
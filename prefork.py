@@ -0,0 +1,237 @@
+"""
+Pre-fork process supervisor for running Me-API Playground in production
+The app is imported once in the parent, then forked into N uvicorn workers
+that share one listening socket. The supervisor respawns workers that exit
+(e.g. after --max-requests) and performs rolling restarts on SIGHUP.
+"""
+
+import logging
+import os
+import random
+import select
+import signal
+import socket
+import sys
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger("prefork")
+
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "0")) or os.cpu_count() or 1
+MAX_REQUESTS_PER_WORKER = int(os.getenv("MAX_REQUESTS_PER_WORKER", "0"))  # 0 = never recycle
+MAX_REQUESTS_JITTER = int(os.getenv("MAX_REQUESTS_JITTER", "0"))
+GRACEFUL_TIMEOUT = float(os.getenv("GRACEFUL_TIMEOUT", "30"))
+WORKER_BOOT_TIMEOUT = float(os.getenv("WORKER_BOOT_TIMEOUT", "60"))
+
+
+class StartupCheckError(RuntimeError):
+    """The database is not safe to share between worker processes"""
+
+
+def check_sqlite_multiprocess(engine):
+    """
+    Make sure a SQLite database can be shared by several processes.
+
+    In-memory databases are private to one process and are rejected. File
+    databases are switched to WAL (persistent for the file) so readers in
+    one worker do not block the writer in another.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    database = engine.url.database
+    if not database or database == ":memory:" or "mode=memory" in str(engine.url):
+        raise StartupCheckError("In-memory SQLite cannot be shared between workers; use a database file")
+    with engine.connect() as connection:
+        mode = connection.exec_driver_sql("PRAGMA journal_mode").scalar()
+        if mode.lower() != "wal":
+            mode = connection.exec_driver_sql("PRAGMA journal_mode=WAL").scalar()
+        if mode.lower() != "wal":
+            raise StartupCheckError(f"SQLite journal_mode is {mode!r}; WAL is required for multiple workers")
+        timeout = connection.exec_driver_sql("PRAGMA busy_timeout").scalar()
+    logger.info(f"SQLite {database}: journal_mode=wal, busy_timeout={timeout}ms")
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class PreforkSupervisor:
+    """
+    Forks and supervises uvicorn workers serving app on a shared socket.
+
+    Signals: SIGHUP rolls workers one at a time (a replacement must report
+    ready before the old worker is asked to stop); SIGTERM/SIGINT stop all
+    workers gracefully. Workers that exit on their own are respawned.
+    """
+
+    def __init__(self, app, sock: socket.socket, workers: int = WEB_CONCURRENCY,
+                 max_requests: int = MAX_REQUESTS_PER_WORKER, max_requests_jitter: int = MAX_REQUESTS_JITTER,
+                 graceful_timeout: float = GRACEFUL_TIMEOUT, engines=()):
+        self.app = app
+        self.sock = sock
+        self.workers = max(1, workers)
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.graceful_timeout = graceful_timeout
+        self.engines = engines
+        self.children: Dict[int, int] = {}  # pid -> worker slot
+        self.started: Dict[int, float] = {}
+        self._stopping = False
+        self._reload_requested = False
+
+    # Parent
+    def run(self) -> int:
+        for engine in self.engines:
+            # Never share pooled connections across fork
+            engine.dispose()
+        signal.signal(signal.SIGHUP, self._on_hup)
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+
+        for slot in range(self.workers):
+            self.spawn(slot)
+        logger.info(f"Supervisor {os.getpid()} running {self.workers} workers")
+
+        while not self._stopping:
+            if self._reload_requested:
+                self._reload_requested = False
+                self.rolling_restart()
+            self.reap(respawn=True)
+            time.sleep(0.2)
+
+        self.stop_all()
+        return 0
+
+    def spawn(self, slot: int, wait_ready: bool = False) -> Optional[int]:
+        ready_read, ready_write = os.pipe() if wait_ready else (None, None)
+        pid = os.fork()
+        if pid == 0:
+            if ready_read is not None:
+                os.close(ready_read)
+            try:
+                self._worker_main(ready_write)
+            finally:
+                os._exit(0)
+        self.children[pid] = slot
+        self.started[pid] = time.monotonic()
+        if not wait_ready:
+            return pid
+        os.close(ready_write)
+        try:
+            if not self._wait_ready(ready_read):
+                logger.error(f"Worker {pid} did not become ready within {WORKER_BOOT_TIMEOUT}s")
+                self._terminate(pid)
+                return None
+        finally:
+            os.close(ready_read)
+        return pid
+
+    def _wait_ready(self, fd: int) -> bool:
+        readable, _, _ = select.select([fd], [], [], WORKER_BOOT_TIMEOUT)
+        return bool(readable) and os.read(fd, 1) == b"1"
+
+    def rolling_restart(self):
+        """Replace workers one at a time; each replacement is ready before its predecessor stops"""
+        logger.info("Rolling restart")
+        for pid, slot in list(self.children.items()):
+            if self._stopping:
+                return
+            if self.spawn(slot, wait_ready=True) is None:
+                logger.error("Rolling restart aborted; keeping the remaining old workers")
+                return
+            self._terminate(pid)
+
+    def reap(self, respawn: bool):
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            slot = self.children.pop(pid, None)
+            started = self.started.pop(pid, 0.0)
+            if slot is None:
+                continue
+            code = os.waitstatus_to_exitcode(status) if hasattr(os, "waitstatus_to_exitcode") else status
+            logger.info(f"Worker {pid} exited ({code})")
+            if respawn and not self._stopping:
+                if time.monotonic() - started < 1.0:
+                    # Back off instead of fork-looping on a worker that crashes at boot
+                    time.sleep(1.0)
+                self.spawn(slot)
+
+    def _terminate(self, pid: int):
+        """SIGTERM one worker (uvicorn drains in-flight requests) and SIGKILL it after the grace period"""
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            self.children.pop(pid, None)
+            return
+        deadline = time.monotonic() + self.graceful_timeout
+        while time.monotonic() < deadline:
+            done, _ = os.waitpid(pid, os.WNOHANG)
+            if done:
+                self.children.pop(pid, None)
+                self.started.pop(pid, None)
+                return
+            time.sleep(0.1)
+        logger.warning(f"Worker {pid} did not stop within {self.graceful_timeout}s; killing it")
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+        self.children.pop(pid, None)
+        self.started.pop(pid, None)
+
+    def stop_all(self):
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + self.graceful_timeout
+        while self.children and time.monotonic() < deadline:
+            self.reap(respawn=False)
+            time.sleep(0.1)
+        for pid in list(self.children):
+            os.kill(pid, signal.SIGKILL)
+        self.reap(respawn=False)
+
+    def _on_hup(self, signum, frame):
+        self._reload_requested = True
+
+    def _on_stop(self, signum, frame):
+        self._stopping = True
+
+    # Child
+    def _worker_main(self, ready_fd: Optional[int]):
+        import uvicorn
+
+        for signum in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, signal.SIG_DFL)
+        for engine in self.engines:
+            # Drop the parent's pool without closing its connections
+            engine.dispose(close=False)
+
+        limit = None
+        if self.max_requests > 0:
+            limit = self.max_requests + random.randint(0, max(self.max_requests_jitter, 0))
+
+        class Server(uvicorn.Server):
+            async def startup(self, sockets=None):
+                await super().startup(sockets=sockets)
+                if ready_fd is not None:
+                    os.write(ready_fd, b"1")
+                    os.close(ready_fd)
+
+        config = uvicorn.Config(
+            self.app, lifespan="on", limit_max_requests=limit,
+            timeout_graceful_shutdown=int(self.graceful_timeout), log_level="info",
+        )
+        Server(config).run(sockets=[self.sock])
+        sys.stdout.flush()
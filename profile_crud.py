@@ -1,8 +1,154 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, and_, desc
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import func, or_, and_, desc, select, update, delete
 from typing import List, Dict, Any, Optional
 import models
 import profile_schemas
+import profile_documents
+from profile_registry import profile_ids
+from skill_index import skill_index
+from read_model import read_model
+from change_log import record_change, record_changes
+
+# Single-statement write helpers
+def _owner_id(model, row) -> int:
+    """Profile that owns a row (the row itself for profiles)"""
+    return row.id if model is models.Profile else row.profile_id
+
+def _owner_column(table):
+    return table.c.profile_id if "profile_id" in table.c else table.c.id
+
+def _after_write(db: Session, profile_id: int):
+    """Refresh a profile in the in-memory read model once a write to it is committed"""
+    if read_model.loaded:
+        read_model.reload_profile(db, profile_id)
+
+def _update_returning(db: Session, model, row_id: int, values: Dict[str, Any]):
+    """
+    Apply values to one row with UPDATE ... RETURNING and return the new row.
+
+    Returns None when no row matched. Falls back to the ORM path on dialects
+    without RETURNING support.
+    """
+    table = model.__table__
+    if not db.get_bind().dialect.update_returning:
+        return _update_orm(db, model, row_id, values)
+    if not values:
+        return db.execute(select(table).where(table.c.id == row_id)).first()
+    row = db.execute(
+        update(table).where(table.c.id == row_id).values(**values).returning(*table.c)
+    ).first()
+    if row is None:
+        # The UPDATE opened a write transaction; release it (and SQLite's write lock) now
+        db.rollback()
+        return None
+    record_change(db, model, "update", row.id, _owner_id(model, row))
+    profile_documents.refresh(db, _owner_id(model, row))
+    db.commit()
+    _after_write(db, _owner_id(model, row))
+    return row
+
+def _update_orm(db: Session, model, row_id: int, values: Dict[str, Any]):
+    """Load, mutate, commit and refresh an ORM object (SELECT + UPDATE + SELECT)"""
+    db_obj = db.query(model).filter(model.id == row_id).first()
+    if not db_obj:
+        return None
+    for field, value in values.items():
+        setattr(db_obj, field, value)
+    if values:
+        record_change(db, model, "update", db_obj.id, _owner_id(model, db_obj))
+        db.flush()
+        profile_documents.refresh(db, _owner_id(model, db_obj))
+    db.commit()
+    db.refresh(db_obj)
+    if values:
+        _after_write(db, _owner_id(model, db_obj))
+    return db_obj
+
+def _delete_returning(db: Session, model, row_id: int) -> Optional[int]:
+    """Delete one row with DELETE ... RETURNING; returns its owning profile ID, None when no row matched"""
+    table = model.__table__
+    if not db.get_bind().dialect.delete_returning:
+        return _delete_orm(db, model, row_id)
+    deleted = db.execute(
+        delete(table).where(table.c.id == row_id).returning(table.c.id, _owner_column(table))
+    ).first()
+    if deleted is None:
+        db.rollback()
+        return None
+    record_change(db, model, "delete", deleted[0], deleted[1])
+    profile_documents.refresh(db, deleted[1])
+    db.commit()
+    _after_write(db, deleted[1])
+    return deleted[1]
+
+def _delete_orm(db: Session, model, row_id: int) -> Optional[int]:
+    """Load then delete an ORM object, cascading through its relationships"""
+    db_obj = db.query(model).filter(model.id == row_id).first()
+    if not db_obj:
+        return None
+    owner_id = _owner_id(model, db_obj)
+    if model is models.Profile:
+        for relation, child_model in (("skills", models.Skill), ("projects", models.Project),
+                                      ("work_experiences", models.WorkExperience), ("links", models.ProfileLink)):
+            record_changes(db, child_model, "delete", [(child.id, row_id) for child in getattr(db_obj, relation)])
+    record_change(db, model, "delete", db_obj.id, owner_id)
+    db.delete(db_obj)
+    db.flush()
+    profile_documents.refresh(db, owner_id)
+    db.commit()
+    _after_write(db, owner_id)
+    return owner_id
+
+def _insert_child(db: Session, db_obj):
+    """
+    Insert a row that references a profile.
+
+    The FOREIGN KEY constraint doubles as the existence check: returns None
+    when the profile does not exist instead of querying for it first.
+    """
+    # Take the document lock before the insert: the FOREIGN KEY check's shared
+    # lock on the profile would otherwise deadlock with a concurrent writer
+    profile_documents.lock(db, (db_obj.profile_id,))
+    db.add(db_obj)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        return None
+    record_change(db, type(db_obj), "create", db_obj.id, db_obj.profile_id)
+    profile_documents.refresh(db, db_obj.profile_id)
+    db.commit()
+    db.refresh(db_obj)
+    _after_write(db, db_obj.profile_id)
+    return db_obj
+
+def _rows_by_ids(db: Session, model, ids: List[int]):
+    """Rows with the given IDs, in the order of ids (missing IDs are skipped)"""
+    if not ids:
+        return []
+    by_id = {row.id: row for row in db.query(model).filter(model.id.in_(ids))}
+    return [by_id[i] for i in ids if i in by_id]
+
+def _children_of_profile(db: Session, model, profile_id: int, order_by=None):
+    """
+    Fetch a profile's child rows with the existence check folded in.
+
+    Selects from profiles LEFT JOIN the child table, so one statement tells
+    apart "no such profile" (None) from "profile without children" ([]).
+    Children come in insertion (ID) order after order_by; without an explicit
+    ORDER BY the planner's index choice would decide.
+    """
+    query = db.query(models.Profile.id, model).outerjoin(
+        model, model.profile_id == models.Profile.id
+    ).filter(models.Profile.id == profile_id)
+    if order_by is not None:
+        query = query.order_by(order_by)
+    query = query.order_by(model.id)
+    rows = query.all()
+    if not rows:
+        return None
+    return [child for _, child in rows if child is not None]
 
 # Profile CRUD Operations
 def get_profile(db: Session, profile_id: int):
@@ -17,84 +163,100 @@ def create_profile(db: Session, profile: profile_schemas.ProfileCreate):
     """Create a new profile"""
     db_profile = models.Profile(**profile.dict())
     db.add(db_profile)
+    db.flush()
+    record_change(db, models.Profile, "create", db_profile.id, db_profile.id)
+    profile_documents.refresh(db, db_profile.id)
     db.commit()
     db.refresh(db_profile)
+    profile_ids.add(db_profile.id)
+    skill_index.add_profile(db_profile.id)
+    _after_write(db, db_profile.id)
     return db_profile
 
 def update_profile(db: Session, profile_id: int, profile_update: profile_schemas.ProfileUpdate):
     """Update a profile"""
-    db_profile = get_profile(db, profile_id)
-    if not db_profile:
-        return None
-    
-    update_data = profile_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_profile, field, value)
-    
-    db.commit()
-    db.refresh(db_profile)
-    return db_profile
+    return _update_returning(db, models.Profile, profile_id, profile_update.dict(exclude_unset=True))
 
 def delete_profile(db: Session, profile_id: int):
     """Delete a profile and all related data"""
-    db_profile = get_profile(db, profile_id)
-    if not db_profile:
-        return False
-    
-    db.delete(db_profile)
-    db.commit()
-    return True
+    if not db.get_bind().dialect.delete_returning:
+        deleted = _delete_orm(db, models.Profile, profile_id) is not None
+        if deleted:
+            profile_ids.discard(profile_id)
+            skill_index.remove_profile(profile_id)
+        return deleted
+    # Children first, then the profile itself, all in one transaction
+    for model in (models.Skill, models.Project, models.WorkExperience, models.ProfileLink):
+        table = model.__table__
+        child_ids = db.execute(
+            delete(table).where(table.c.profile_id == profile_id).returning(table.c.id)
+        ).scalars().all()
+        record_changes(db, model, "delete", [(child_id, profile_id) for child_id in child_ids])
+    deleted = _delete_returning(db, models.Profile, profile_id) is not None
+    if deleted:
+        profile_ids.discard(profile_id)
+        skill_index.remove_profile(profile_id)
+    return deleted
 
 def get_all_profiles(db: Session, skip: int = 0, limit: int = 100):
     """Get all profiles with pagination"""
     return db.query(models.Profile).offset(skip).limit(limit).all()
 
+def get_profiles_by_ids(db: Session, profile_ids: List[int]):
+    """Get profiles by ID, keeping the given order"""
+    return _rows_by_ids(db, models.Profile, profile_ids)
+
+def get_profile_names(db: Session, profile_ids: List[int]) -> Dict[int, str]:
+    """Map profile IDs to names in one query"""
+    if not profile_ids:
+        return {}
+    table = models.Profile.__table__
+    return dict(db.execute(select(table.c.id, table.c.name).where(table.c.id.in_(profile_ids))).all())
+
 # Skill CRUD Operations
 def create_skill(db: Session, profile_id: int, skill: profile_schemas.SkillCreate):
-    """Add a skill to a profile"""
+    """Add a skill to a profile (None if the profile does not exist)"""
     db_skill = models.Skill(profile_id=profile_id, **skill.dict())
-    db.add(db_skill)
-    db.commit()
-    db.refresh(db_skill)
-    return db_skill
+    created = _insert_child(db, db_skill)
+    if created is not None:
+        skill_index.reindex_profile(db, profile_id)
+    return created
 
 def get_skills_by_profile(db: Session, profile_id: int):
-    """Get all skills for a profile"""
-    return db.query(models.Skill).filter(models.Skill.profile_id == profile_id).all()
+    """Get all skills for a profile (None if the profile does not exist)"""
+    return _children_of_profile(db, models.Skill, profile_id)
 
 def update_skill(db: Session, skill_id: int, skill_update: profile_schemas.SkillUpdate):
     """Update a skill"""
-    db_skill = db.query(models.Skill).filter(models.Skill.id == skill_id).first()
-    if not db_skill:
-        return None
-    
-    update_data = skill_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_skill, field, value)
-    
-    db.commit()
-    db.refresh(db_skill)
-    return db_skill
+    updated = _update_returning(db, models.Skill, skill_id, skill_update.dict(exclude_unset=True))
+    if updated is not None:
+        skill_index.reindex_profile(db, updated.profile_id)
+    return updated
 
 def delete_skill(db: Session, skill_id: int):
     """Delete a skill"""
-    db_skill = db.query(models.Skill).filter(models.Skill.id == skill_id).first()
-    if not db_skill:
-        return False
-    
-    db.delete(db_skill)
-    db.commit()
-    return True
+    profile_id = _delete_returning(db, models.Skill, skill_id)
+    if profile_id is not None:
+        skill_index.reindex_profile(db, profile_id)
+    return profile_id is not None
 
 def get_top_skills(db: Session, limit: int = 10):
     """Get most common skills across all profiles"""
     skill_counts = db.query(
         models.Skill.name,
         func.count(models.Skill.id).label('count')
-    ).group_by(models.Skill.name).order_by(desc('count')).limit(limit).all()
+    ).group_by(models.Skill.name).order_by(desc('count'), models.Skill.name).limit(limit).all()
     
     return [{"name": skill.name, "count": skill.count} for skill in skill_counts]
 
+def get_stats(db: Session):
+    """Row counts shown on the dashboard"""
+    return {
+        "profiles": db.query(models.Profile).count(),
+        "skills": db.query(models.Skill).count(),
+        "projects": db.query(models.Project).count(),
+    }
+
 def search_skills(db: Session, skill_name: str, level: Optional[str] = None):
     """Search for skills by name and optionally by level"""
     query = db.query(models.Skill).filter(
@@ -108,16 +270,13 @@ def search_skills(db: Session, skill_name: str, level: Optional[str] = None):
 
 # Project CRUD Operations
 def create_project(db: Session, profile_id: int, project: profile_schemas.ProjectCreate):
-    """Add a project to a profile"""
+    """Add a project to a profile (None if the profile does not exist)"""
     db_project = models.Project(profile_id=profile_id, **project.dict())
-    db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
-    return db_project
+    return _insert_child(db, db_project)
 
 def get_projects_by_profile(db: Session, profile_id: int):
-    """Get all projects for a profile"""
-    return db.query(models.Project).filter(models.Project.profile_id == profile_id).all()
+    """Get all projects for a profile (None if the profile does not exist)"""
+    return _children_of_profile(db, models.Project, profile_id)
 
 def get_projects_by_skill(db: Session, skill: str):
     """Get projects that use a specific skill/technology"""
@@ -130,6 +289,10 @@ def get_all_projects(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.Project).offset(skip).limit(limit).all()
 
 
+def get_projects_by_ids(db: Session, project_ids: List[int]):
+    """Get projects by ID, keeping the given order"""
+    return _rows_by_ids(db, models.Project, project_ids)
+
 def search_projects(db: Session, query: str, limit: int = 10):
     """Search projects by title, description, or technologies"""
     return db.query(models.Project).filter(
@@ -142,103 +305,53 @@ def search_projects(db: Session, query: str, limit: int = 10):
 
 def update_project(db: Session, project_id: int, project_update: profile_schemas.ProjectUpdate):
     """Update a project"""
-    db_project = db.query(models.Project).filter(models.Project.id == project_id).first()
-    if not db_project:
-        return None
-    
-    update_data = project_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_project, field, value)
-    
-    db.commit()
-    db.refresh(db_project)
-    return db_project
+    return _update_returning(db, models.Project, project_id, project_update.dict(exclude_unset=True))
 
 def delete_project(db: Session, project_id: int):
     """Delete a project"""
-    db_project = db.query(models.Project).filter(models.Project.id == project_id).first()
-    if not db_project:
-        return False
-    
-    db.delete(db_project)
-    db.commit()
-    return True
+    return _delete_returning(db, models.Project, project_id) is not None
 
 # Work Experience CRUD Operations
 def create_work_experience(db: Session, profile_id: int, work_exp: profile_schemas.WorkExperienceCreate):
-    """Add work experience to a profile"""
+    """Add work experience to a profile (None if the profile does not exist)"""
     db_work = models.WorkExperience(profile_id=profile_id, **work_exp.dict())
-    db.add(db_work)
-    db.commit()
-    db.refresh(db_work)
-    return db_work
+    return _insert_child(db, db_work)
 
 def get_work_experiences_by_profile(db: Session, profile_id: int):
-    """Get all work experiences for a profile"""
-    return db.query(models.WorkExperience).filter(
-        models.WorkExperience.profile_id == profile_id
-    ).order_by(desc(models.WorkExperience.start_date)).all()
+    """Get all work experiences for a profile (None if the profile does not exist)"""
+    return _children_of_profile(
+        db, models.WorkExperience, profile_id, order_by=desc(models.WorkExperience.start_date)
+    )
+
+def get_work_experiences_by_ids(db: Session, work_ids: List[int]):
+    """Get work experiences by ID, keeping the given order"""
+    return _rows_by_ids(db, models.WorkExperience, work_ids)
 
 def update_work_experience(db: Session, work_id: int, work_update: profile_schemas.WorkExperienceUpdate):
     """Update work experience"""
-    db_work = db.query(models.WorkExperience).filter(models.WorkExperience.id == work_id).first()
-    if not db_work:
-        return None
-    
-    update_data = work_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_work, field, value)
-    
-    db.commit()
-    db.refresh(db_work)
-    return db_work
+    return _update_returning(db, models.WorkExperience, work_id, work_update.dict(exclude_unset=True))
 
 def delete_work_experience(db: Session, work_id: int):
     """Delete work experience"""
-    db_work = db.query(models.WorkExperience).filter(models.WorkExperience.id == work_id).first()
-    if not db_work:
-        return False
-    
-    db.delete(db_work)
-    db.commit()
-    return True
+    return _delete_returning(db, models.WorkExperience, work_id) is not None
 
 # Profile Link CRUD Operations
 def create_profile_link(db: Session, profile_id: int, link: profile_schemas.ProfileLinkCreate):
-    """Add a profile link"""
+    """Add a profile link (None if the profile does not exist)"""
     db_link = models.ProfileLink(profile_id=profile_id, **link.dict())
-    db.add(db_link)
-    db.commit()
-    db.refresh(db_link)
-    return db_link
+    return _insert_child(db, db_link)
 
 def get_links_by_profile(db: Session, profile_id: int):
-    """Get all links for a profile"""
-    return db.query(models.ProfileLink).filter(models.ProfileLink.profile_id == profile_id).all()
+    """Get all links for a profile (None if the profile does not exist)"""
+    return _children_of_profile(db, models.ProfileLink, profile_id)
 
 def update_profile_link(db: Session, link_id: int, link_update: profile_schemas.ProfileLinkUpdate):
     """Update a profile link"""
-    db_link = db.query(models.ProfileLink).filter(models.ProfileLink.id == link_id).first()
-    if not db_link:
-        return None
-    
-    update_data = link_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_link, field, value)
-    
-    db.commit()
-    db.refresh(db_link)
-    return db_link
+    return _update_returning(db, models.ProfileLink, link_id, link_update.dict(exclude_unset=True))
 
 def delete_profile_link(db: Session, link_id: int):
     """Delete a profile link"""
-    db_link = db.query(models.ProfileLink).filter(models.ProfileLink.id == link_id).first()
-    if not db_link:
-        return False
-    
-    db.delete(db_link)
-    db.commit()
-    return True
+    return _delete_returning(db, models.ProfileLink, link_id) is not None
 
 # Search and Query Functions
 def global_search(db: Session, query: str, limit: int = 10):
@@ -316,3 +429,99 @@ def get_complete_profile(db: Session, profile_id: int):
         "work_experiences": get_work_experiences_by_profile(db, profile_id),
         "links": get_links_by_profile(db, profile_id),
     }
+
+
+# Sparse Fieldsets
+# Relations that can be requested with ?include=, keyed by their response name
+SPARSE_RELATIONS = {
+    "skills": models.Skill,
+    "projects": models.Project,
+    "work_experiences": models.WorkExperience,
+    "links": models.ProfileLink,
+}
+
+def parse_fieldset(fields: Optional[str], include: Optional[str]):
+    """
+    Parse ?fields= and ?include= into the columns to select.
+
+    Returns a tuple (profile_columns, relations) where relations maps a relation
+    name to its column names. Raises ValueError for unknown names.
+    """
+    profile_table = models.Profile.__table__
+    requested = [f.strip() for f in (fields or "").split(",") if f.strip()]
+    included = [r.strip() for r in (include or "").split(",") if r.strip()]
+
+    profile_columns = []
+    relation_columns: Dict[str, List[str]] = {}
+    for name in requested:
+        relation, _, column = name.partition(".")
+        if column:
+            if relation not in SPARSE_RELATIONS:
+                raise ValueError(f"Unknown relation '{relation}'")
+            if column not in SPARSE_RELATIONS[relation].__table__.c:
+                raise ValueError(f"Unknown field '{name}'")
+            relation_columns.setdefault(relation, []).append(column)
+        elif name in profile_table.c:
+            profile_columns.append(name)
+        else:
+            raise ValueError(f"Unknown field '{name}'")
+
+    for relation in included:
+        if relation not in SPARSE_RELATIONS:
+            raise ValueError(f"Unknown relation '{relation}'")
+        # Included without dotted fields: load every column of the relation
+        relation_columns.setdefault(relation, [])
+
+    if not requested:
+        profile_columns = list(profile_table.c.keys())
+    elif "id" not in profile_columns:
+        profile_columns.insert(0, "id")
+
+    relations = {}
+    for relation, columns in relation_columns.items():
+        table = SPARSE_RELATIONS[relation].__table__
+        if not columns:
+            columns = list(table.c.keys())
+        elif "id" not in columns:
+            columns.insert(0, "id")
+        relations[relation] = columns
+    return profile_columns, relations
+
+def get_sparse_profiles(db: Session, profile_columns: List[str], relations: Dict[str, List[str]],
+                        profile_id: Optional[int] = None, skip: int = 0, limit: int = 100,
+                        where=None, params: Optional[Dict[str, Any]] = None):
+    """
+    Select only the requested profile columns and relations (one query per relation).
+
+    where/params optionally restrict the profiles, e.g. with a compiled /profiles filter.
+    """
+    profile_table = models.Profile.__table__
+    query = select(*[profile_table.c[name] for name in profile_columns])
+    if where is not None:
+        query = query.where(where)
+    if profile_id is not None:
+        query = query.where(profile_table.c.id == profile_id)
+    else:
+        query = query.order_by(profile_table.c.id).offset(skip).limit(limit)
+    profiles = [dict(row) for row in db.execute(query, params or {}).mappings()]
+    if not profiles or not relations:
+        return profiles
+
+    by_id = {profile["id"]: profile for profile in profiles}
+    for relation, columns in relations.items():
+        model = SPARSE_RELATIONS[relation]
+        table = model.__table__
+        child_query = select(table.c.profile_id.label("_profile_id"), *[table.c[name] for name in columns]).where(
+            table.c.profile_id.in_(list(by_id))
+        )
+        if model is models.WorkExperience:
+            child_query = child_query.order_by(desc(table.c.start_date), table.c.id)
+        else:
+            child_query = child_query.order_by(table.c.id)
+
+        for profile in profiles:
+            profile[relation] = []
+        for row in db.execute(child_query).mappings():
+            child = dict(row)
+            by_id[child.pop("_profile_id")][relation].append(child)
+    return profiles
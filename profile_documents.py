@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Pre-rendered profile documents for Me-API Playground
+profile_documents holds the complete JSON of each profile, exactly as
+GET /profiles/{id} serves it, plus a version. profile_crud regenerates a
+profile's row in the same transaction as every write to that profile, so
+reads are a single primary key lookup returning stored bytes
+
+Usage:
+    python profile_documents.py rebuild [--profile ID ...]
+    python profile_documents.py verify [--profile ID ...]
+"""
+
+import argparse
+import sys
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+import models
+import read_path
+from metrics import metrics
+from read_model import load_documents
+
+REBUILD_BATCH_SIZE = 500
+
+_table = models.ProfileDocument.__table__
+_profiles = models.Profile.__table__
+
+
+def render(db: Session, profile_ids: Iterable[int]) -> Dict[int, bytes]:
+    """Documents rendered from the live tables for the given profiles (missing profiles are skipped)"""
+    return {profile_id: read_path.render(document) for profile_id, document in load_documents(db, profile_ids).items()}
+
+
+def lock(db: Session, profile_ids: Iterable[int]):
+    """
+    Lock the profiles rows so concurrent writers render their documents one at a time.
+
+    Without it two writers to one profile under READ COMMITTED can each render
+    before the other commits, and the later _store keeps a document missing
+    the other's change. SQLite already serializes writers, so it is skipped.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return
+    # FOR NO KEY UPDATE on PostgreSQL, so foreign key checks of child inserts do not conflict
+    db.execute(select(_profiles.c.id).where(_profiles.c.id.in_(list(profile_ids))).with_for_update(key_share=True)).all()
+
+
+def _store(db: Session, profile_id: int, document: bytes):
+    updated = db.execute(
+        update(_table).where(_table.c.profile_id == profile_id)
+        .values(document=document, version=_table.c.version + 1, updated_at=func.now())
+    )
+    if updated.rowcount == 0:
+        db.execute(insert(_table).values(profile_id=profile_id, document=document, version=1))
+
+
+def refresh(db: Session, profile_id: int):
+    """
+    Regenerate one profile's document from the rows visible to db.
+
+    Must be called before the write's commit so the document shares its
+    transaction; removes the document when the profile no longer exists.
+    """
+    lock(db, (profile_id,))
+    document = render(db, (profile_id,)).get(profile_id)
+    if document is None:
+        db.execute(delete(_table).where(_table.c.profile_id == profile_id))
+    else:
+        _store(db, profile_id, document)
+    metrics.inc("profile_documents.regenerated")
+
+
+def get(db: Session, profile_id: int) -> Optional[bytes]:
+    """The stored document of a profile, None if there is none"""
+    return db.execute(select(_table.c.document).where(_table.c.profile_id == profile_id)).scalar()
+
+
+def _profile_ids(db: Session, only: Optional[List[int]]) -> List[int]:
+    if only:
+        return sorted(set(only))
+    return list(db.execute(select(_profiles.c.id).order_by(_profiles.c.id)).scalars())
+
+
+def rebuild(db: Session, profile_ids: Optional[List[int]] = None, batch_size: int = REBUILD_BATCH_SIZE) -> Dict[str, int]:
+    """Regenerate documents (all profiles by default) and drop documents of deleted profiles"""
+    ids = _profile_ids(db, profile_ids)
+    written = 0
+    for start in range(0, len(ids), batch_size):
+        chunk = ids[start:start + batch_size]
+        lock(db, chunk)
+        documents = render(db, chunk)
+        for profile_id in chunk:
+            if profile_id in documents:
+                _store(db, profile_id, documents[profile_id])
+                written += 1
+            else:
+                db.execute(delete(_table).where(_table.c.profile_id == profile_id))
+        db.commit()
+    has_profile = select(_profiles.c.id).where(_profiles.c.id == _table.c.profile_id).exists()
+    removed = 0 if profile_ids else db.execute(delete(_table).where(~has_profile)).rowcount
+    db.commit()
+    return {"written": written, "removed": removed}
+
+
+def verify(db: Session, profile_ids: Optional[List[int]] = None, batch_size: int = REBUILD_BATCH_SIZE) -> Dict[str, List[int]]:
+    """Compare stored documents with documents rendered from live data"""
+    ids = _profile_ids(db, profile_ids)
+    report = {"checked": [], "stale": [], "missing": [], "orphaned": []}
+    for start in range(0, len(ids), batch_size):
+        chunk = ids[start:start + batch_size]
+        expected = render(db, chunk)
+        stored = dict(db.execute(select(_table.c.profile_id, _table.c.document).where(_table.c.profile_id.in_(chunk))).all())
+        for profile_id in chunk:
+            if profile_id not in expected:
+                if profile_id in stored:
+                    report["orphaned"].append(profile_id)
+                continue
+            report["checked"].append(profile_id)
+            if profile_id not in stored:
+                report["missing"].append(profile_id)
+            elif bytes(stored[profile_id]) != expected[profile_id]:
+                report["stale"].append(profile_id)
+    if not profile_ids:
+        orphans = select(_table.c.profile_id).where(
+            ~select(_profiles.c.id).where(_profiles.c.id == _table.c.profile_id).exists()
+        )
+        report["orphaned"].extend(db.execute(orphans).scalars())
+    return report
+
+
+def main(argv=None) -> int:
+    from database import SessionLocal, engine
+
+    parser = argparse.ArgumentParser(description="Rebuild or verify pre-rendered profile documents")
+    parser.add_argument("command", choices=("rebuild", "verify"))
+    parser.add_argument("--profile", type=int, action="append", help="Only this profile ID (repeatable)")
+    args = parser.parse_args(argv)
+
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if args.command == "rebuild":
+            result = rebuild(db, args.profile)
+            print(f"✅ Wrote {result['written']} documents, removed {result['removed']} orphaned")
+            return 0
+        report = verify(db, args.profile)
+        problems = {kind: ids for kind, ids in report.items() if kind != "checked" and ids}
+        print(f"🔍 Checked {len(report['checked'])} documents")
+        for kind, ids in problems.items():
+            shown = ", ".join(map(str, ids[:20])) + (" ..." if len(ids) > 20 else "")
+            print(f"❌ {len(ids)} {kind}: {shown}")
+        if problems:
+            print("Run `python profile_documents.py rebuild` to regenerate them")
+            return 1
+        print("✅ All documents match live data")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
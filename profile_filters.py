@@ -0,0 +1,238 @@
+"""
+Filter expression language for GET /profiles
+Parses expressions like `location:"San Francisco" AND skill:python AND worked_at:TechCorp`
+into an AST and compiles them to one SELECT with EXISTS subqueries. Compiled
+plans are cached by query shape, so only the bound values change per request.
+"""
+
+import os
+import re
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import JSON, String, and_, bindparam, cast, exists, func, not_, or_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex
+
+import models
+from metrics import metrics
+
+FILTER_PLAN_CACHE_SIZE = int(os.getenv("FILTER_PLAN_CACHE_SIZE", "256"))
+
+_TOKEN = re.compile(r'(\()|(\))|([a-z_]+)\s*[:=]\s*(?:"([^"]*)"|([^\s()"]+))|([A-Za-z]+)')
+
+_profiles = models.Profile.__table__
+_skills = models.Skill.__table__
+_projects = models.Project.__table__
+_work = models.WorkExperience.__table__
+
+# Field -> (table, column, how the value matches); child tables are matched through EXISTS
+FIELDS = {
+    "name": (_profiles, _profiles.c.name, "contains"),
+    "email": (_profiles, _profiles.c.email, "contains"),
+    "location": (_profiles, _profiles.c.location, "contains"),
+    "education": (_profiles, _profiles.c.education, "contains"),
+    "skill": (_skills, _skills.c.name, "equals"),
+    "level": (_skills, _skills.c.level, "equals"),
+    "category": (_skills, _skills.c.category, "equals"),
+    "technology": (_projects, _projects.c.technologies, "json_item"),
+    "project": (_projects, _projects.c.title, "contains"),
+    "worked_at": (_work, _work.c.company, "equals"),
+    "position": (_work, _work.c.position, "contains"),
+}
+
+
+class FilterError(ValueError):
+    """Malformed filter expression"""
+
+
+def _tokenize(expression: str) -> List[Tuple[str, Any]]:
+    tokens, position = [], 0
+    while position < len(expression):
+        if expression[position].isspace():
+            position += 1
+            continue
+        match = _TOKEN.match(expression, position)
+        if not match:
+            raise FilterError(f"Unexpected character at position {position}: {expression[position]!r}")
+        position = match.end()
+        lparen, rparen, field, quoted, bare, keyword = match.groups()
+        if lparen or rparen:
+            tokens.append((lparen or rparen, None))
+        elif field:
+            if field not in FIELDS:
+                raise FilterError(f"Unknown field '{field}'; expected one of {', '.join(FIELDS)}")
+            tokens.append(("term", (field, quoted if quoted is not None else bare)))
+        elif keyword.upper() in ("AND", "OR", "NOT"):
+            tokens.append((keyword.upper(), None))
+        else:
+            raise FilterError(f"Expected field:value or AND/OR/NOT, found {keyword!r}")
+    return tokens
+
+
+class _Parser:
+    """
+    expr := and ("OR" and)* ; and := unary (["AND"] unary)* ;
+    unary := "NOT" unary | "(" expr ")" | field ":" value
+    """
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position][0] if self.position < len(self.tokens) else None
+
+    def take(self, kind):
+        if self.peek() != kind:
+            raise FilterError(f"Expected {kind} at token {self.position + 1}")
+        token = self.tokens[self.position]
+        self.position += 1
+        return token[1]
+
+    def parse(self):
+        if not self.tokens:
+            raise FilterError("Empty filter")
+        node = self.expr()
+        if self.peek() is not None:
+            raise FilterError(f"Unexpected {self.peek()} at token {self.position + 1}")
+        return node
+
+    def expr(self):
+        node = self.conjunction()
+        while self.peek() == "OR":
+            self.take("OR")
+            node = ("or", node, self.conjunction())
+        return node
+
+    def conjunction(self):
+        node = self.unary()
+        while self.peek() in ("AND", "NOT", "(", "term"):
+            if self.peek() == "AND":
+                self.take("AND")
+            node = ("and", node, self.unary())
+        return node
+
+    def unary(self):
+        if self.peek() == "NOT":
+            self.take("NOT")
+            return ("not", self.unary())
+        if self.peek() == "(":
+            self.take("(")
+            node = self.expr()
+            self.take(")")
+            return node
+        field, value = self.take("term")
+        return ("term", field, value)
+
+
+def parse(expression: str):
+    return _Parser(_tokenize(expression)).parse()
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _bind_value(field: str, value: str) -> Tuple[str, str]:
+    """(match kind used in the plan, bound parameter value) for one term"""
+    match = FIELDS[field][2]
+    value = value.strip().lower()
+    if match == "equals" and "*" in value:
+        return "like", _escape_like(value).replace("*", "%")
+    if match == "contains":
+        return "like", f"%{_escape_like(value)}%"
+    if match == "json_item":
+        # technologies is a JSON array serialized as text: ["Python", "Docker"]
+        return "like", f'%"{_escape_like(value)}"%'
+    return "equals", value
+
+
+def _shape_and_values(node, values: List[str]):
+    """The AST with literal values replaced by their match kind, collecting the values"""
+    if node[0] == "term":
+        kind, value = _bind_value(node[1], node[2])
+        values.append(value)
+        return ("term", node[1], kind)
+    return (node[0],) + tuple(_shape_and_values(child, values) for child in node[1:])
+
+
+def _compile_condition(shape, counter: List[int]):
+    kind = shape[0]
+    if kind == "and":
+        return and_(_compile_condition(shape[1], counter), _compile_condition(shape[2], counter))
+    if kind == "or":
+        return or_(_compile_condition(shape[1], counter), _compile_condition(shape[2], counter))
+    if kind == "not":
+        return not_(_compile_condition(shape[1], counter))
+    _, field, match = shape
+    table, column, _ = FIELDS[field]
+    param = bindparam(f"f{counter[0]}", type_=String)
+    counter[0] += 1
+    # lower(column) matches the expression indexes on skills and work_experiences
+    value = func.lower(cast(column, String) if isinstance(column.type, JSON) else column)
+    condition = value.like(param, escape="\\") if match == "like" else value == param
+    if table is _profiles:
+        return condition
+    return exists().where(table.c.profile_id == _profiles.c.id, condition)
+
+
+class PlanCache:
+    """LRU of compiled WHERE clauses keyed by query shape"""
+
+    def __init__(self, size: int = FILTER_PLAN_CACHE_SIZE):
+        self.size = size
+        self._plans: "OrderedDict[tuple, Any]" = OrderedDict()
+
+    def get(self, shape):
+        plan = self._plans.get(shape)
+        if plan is not None:
+            self._plans.move_to_end(shape)
+            metrics.inc("filters.plan_cache_hits")
+            return plan
+        metrics.inc("filters.plan_cache_misses")
+        plan = _compile_condition(shape, [0])
+        self._plans[shape] = plan
+        if len(self._plans) > self.size:
+            self._plans.popitem(last=False)
+        return plan
+
+    def __len__(self):
+        return len(self._plans)
+
+
+plan_cache = PlanCache()
+
+
+def compile_filter(expression: str) -> Tuple[Any, Dict[str, str]]:
+    """WHERE clause for a filter expression (shared per shape) and its bound values"""
+    values: List[str] = []
+    shape = _shape_and_values(parse(expression), values)
+    return plan_cache.get(shape), {f"f{i}": value for i, value in enumerate(values)}
+
+
+def filtered_profiles_query(condition):
+    """ORM select of profiles matching condition, for the default /profiles response"""
+    query = select(models.Profile).order_by(models.Profile.id)
+    return query.where(condition) if condition is not None else query
+
+
+def explain(db: Session, query, params: Dict[str, Any]) -> dict:
+    """Generated SQL, bound values and (on SQLite) EXPLAIN QUERY PLAN rows"""
+    bind = db.get_bind()
+    compiled = query.compile(dialect=bind.dialect)
+    parameters = dict(compiled.params, **params)
+    result = {"sql": str(compiled), "parameters": parameters, "plan": None}
+    if bind.dialect.name == "sqlite":
+        positional = tuple(parameters[name] for name in compiled.positiontup)
+        rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", positional).all()
+        result["plan"] = [{"id": row[0], "parent": row[1], "detail": row[3]} for row in rows]
+    return result
+
+
+def ensure_indexes(engine):
+    """Create the filter's expression indexes on databases created before they existed"""
+    # IF NOT EXISTS rather than checkfirst: reflection does not report expression indexes
+    with engine.begin() as connection:
+        for index in models.FILTER_INDEXES:
+            connection.execute(CreateIndex(index, if_not_exists=True))
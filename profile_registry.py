@@ -0,0 +1,64 @@
+"""
+In-memory registry of live profile IDs
+Lets routes answer "does profile N exist?" without a database round trip;
+only misses are confirmed against the database
+"""
+
+import threading
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import models
+
+
+class ProfileIdSet:
+    """
+    Set of existing profile IDs, loaded lazily on first use.
+
+    create_profile and delete_profile keep it in sync after they commit.
+    """
+
+    def __init__(self):
+        self._ids = set()
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self, db: Session):
+        """(Re)load every profile ID from the database"""
+        ids = set(db.execute(select(models.Profile.__table__.c.id)).scalars())
+        with self._lock:
+            self._ids = ids
+            self._loaded = True
+
+    def exists(self, db: Session, profile_id: int) -> bool:
+        if not self._loaded:
+            self.load(db)
+        if profile_id in self._ids:
+            return True
+        # A miss may be a profile another worker created since the last
+        # invalidation poll; confirm it so creates are visible immediately
+        p = models.Profile.__table__
+        if db.execute(select(p.c.id).where(p.c.id == profile_id)).first() is None:
+            return False
+        self.add(profile_id)
+        return True
+
+    def add(self, profile_id: int):
+        with self._lock:
+            self._ids.add(profile_id)
+
+    def discard(self, profile_id: int):
+        with self._lock:
+            self._ids.discard(profile_id)
+
+    def invalidate(self):
+        """Force a reload on next use"""
+        with self._lock:
+            self._loaded = False
+
+    def __len__(self):
+        return len(self._ids)
+
+
+profile_ids = ProfileIdSet()
@@ -161,15 +161,89 @@ class TopSkillsResponse(BaseModel):
     skills: List[Dict[str, Any]]
     total: int
 
+class RelatedSkill(BaseModel):
+    name: str
+    count: int
+    confidence: float
+    lift: float
+
+class RelatedSkillsResponse(BaseModel):
+    skill: str
+    profiles: int
+    related: List[RelatedSkill]
+
+class SimilarProfile(BaseModel):
+    profile_id: int
+    name: str
+    similarity: float
+
+class SimilarProfilesResponse(BaseModel):
+    profile_id: int
+    similar: List[SimilarProfile]
+
 class ProjectSearchResponse(BaseModel):
     projects: List[Project]
     total: int
 
+class WorkExperienceSearchResponse(BaseModel):
+    work_experiences: List[WorkExperience]
+    total: int
+
 class SearchResponse(BaseModel):
     results: List[Dict[str, Any]]
     total: int
     query: str
 
+class ProfileMatchResponse(BaseModel):
+    query: str
+    results: List[Profile]
+    total: int
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class FacetedSearchResponse(BaseModel):
+    results: List[Profile]
+    total: int
+    facets: Dict[str, List[FacetCount]]
+
+# Batch Schemas
+class BatchRequestItem(BaseModel):
+    id: Optional[str] = Field(None, description="Client-chosen identifier echoed in the response")
+    method: str = Field(default="GET", description="HTTP method of the sub-request")
+    path: str = Field(..., min_length=1, description="Path and query string, e.g. /profiles?limit=20")
+    headers: Optional[Dict[str, str]] = Field(None, description="Extra request headers")
+    body: Optional[Any] = Field(None, description="JSON body for write requests")
+
+class BatchRequest(BaseModel):
+    requests: List[BatchRequestItem] = Field(..., min_length=1, description="Sub-requests to execute")
+
+class BatchResponseItem(BaseModel):
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str] = {}
+    body: Any = None
+
+class BatchResponse(BaseModel):
+    responses: List[BatchResponseItem]
+    total: int
+
+# Change Log Schemas
+class ChangeEntry(BaseModel):
+    token: int
+    entity_type: str
+    entity_id: int
+    profile_id: Optional[int] = None
+    op: str
+    version: int
+    timestamp: datetime
+
+class ChangesResponse(BaseModel):
+    changes: List[ChangeEntry]
+    next: int = Field(..., description="Pass as ?since= to fetch the following changes")
+    has_more: bool
+
 # Health Check Schema
 class HealthCheck(BaseModel):
     status: str
@@ -0,0 +1,176 @@
+"""
+"Similar profiles" index for Me-API Playground
+MinHash signatures over each profile's skills, project technologies and
+companies, with LSH banding so candidates are found without comparing every pair
+"""
+
+import hashlib
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import models
+from background import SnapshotRefresher
+
+SIMILARITY_NUM_PERM = int(os.getenv("SIMILARITY_NUM_PERM", "128"))
+# 64 bands of 2 rows: pairs above ~(1/64)^(1/2) = 0.125 Jaccard are likely candidates
+SIMILARITY_BANDS = int(os.getenv("SIMILARITY_BANDS", "64"))
+SIMILARITY_REFRESH_INTERVAL = float(os.getenv("SIMILARITY_REFRESH_INTERVAL", "10"))
+SIMILARITY_SEED = 20240101
+
+# Change log entity types that alter a profile's feature set
+FEATURE_ENTITIES = {"profile", "skill", "project", "work_experience"}
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def load_features(db: Session, profile_ids: Optional[Iterable[int]] = None) -> Dict[int, Set[str]]:
+    """Feature tokens per profile: skill:<name>, tech:<technology>, company:<company>"""
+    skills, projects, work = models.Skill.__table__, models.Project.__table__, models.WorkExperience.__table__
+    queries = [
+        ("skill", select(skills.c.profile_id, skills.c.name)),
+        ("tech", select(projects.c.profile_id, projects.c.technologies)),
+        ("company", select(work.c.profile_id, work.c.company)),
+    ]
+    ids = None if profile_ids is None else list(profile_ids)
+    features: Dict[int, Set[str]] = defaultdict(set)
+    for kind, query in queries:
+        if ids is not None:
+            query = query.where(query.selected_columns[0].in_(ids))
+        for profile_id, value in db.execute(query):
+            values = value if isinstance(value, list) else [value]
+            for item in values:
+                if item:
+                    features[profile_id].add(f"{kind}:{str(item).strip().lower()}")
+    return features
+
+
+class MinHashIndex:
+    """
+    MinHash LSH index over profile feature sets.
+
+    Signatures live in one (capacity x num_perm) uint32 array; bands of
+    num_perm / bands rows are hashed into per-band buckets, so a query only
+    compares the profiles sharing at least one band with it.
+    """
+
+    def __init__(self, num_perm: int = SIMILARITY_NUM_PERM, bands: int = SIMILARITY_BANDS,
+                 seed: int = SIMILARITY_SEED):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: ((a * x + b) mod 2^64) >> 32, with a odd
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        self.signatures = np.zeros((0, num_perm), dtype=np.uint32)
+        self.row_of: Dict[int, int] = {}
+        self.profile_at: List[Optional[int]] = []
+        self._free: List[int] = []
+        self._buckets: List[Dict[bytes, Set[int]]] = [defaultdict(set) for _ in range(bands)]
+        self._token_hashes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.row_of)
+
+    def signature(self, tokens: Set[str]) -> np.ndarray:
+        hashes = np.fromiter((self._hash(t) for t in tokens), dtype=np.uint64, count=len(tokens))
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) >> np.uint64(32)
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def _hash(self, token: str) -> int:
+        value = self._token_hashes.get(token)
+        if value is None:
+            value = self._token_hashes[token] = _token_hash(token)
+        return value
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [band.tobytes() for band in signature.reshape(self.bands, self.rows_per_band)]
+
+    def upsert(self, profile_id: int, tokens: Set[str]):
+        """Index (or re-index) a profile; profiles without features are dropped"""
+        signature = self.signature(tokens) if tokens else None
+        with self._lock:
+            self._remove_locked(profile_id)
+            if signature is None:
+                return
+            if self._free:
+                row = self._free.pop()
+            else:
+                row = len(self.profile_at)
+                if row >= len(self.signatures):
+                    grown = np.zeros((max(16, 2 * len(self.signatures)), self.num_perm), dtype=np.uint32)
+                    grown[:len(self.signatures)] = self.signatures
+                    self.signatures = grown
+                self.profile_at.append(None)
+            self.signatures[row] = signature
+            self.row_of[profile_id] = row
+            self.profile_at[row] = profile_id
+            for band, key in enumerate(self._band_keys(signature)):
+                self._buckets[band][key].add(profile_id)
+
+    def remove(self, profile_id: int):
+        with self._lock:
+            self._remove_locked(profile_id)
+
+    def _remove_locked(self, profile_id: int):
+        row = self.row_of.pop(profile_id, None)
+        if row is None:
+            return
+        for band, key in enumerate(self._band_keys(self.signatures[row])):
+            bucket = self._buckets[band][key]
+            bucket.discard(profile_id)
+            if not bucket:
+                del self._buckets[band][key]
+        self.profile_at[row] = None
+        self._free.append(row)
+
+    def similar(self, profile_id: int, limit: int = 10) -> List[dict]:
+        """Profiles sharing an LSH band with profile_id, by estimated Jaccard similarity"""
+        with self._lock:
+            row = self.row_of.get(profile_id)
+            if row is None:
+                return []
+            signature = self.signatures[row]
+            candidates: Set[int] = set()
+            for band, key in enumerate(self._band_keys(signature)):
+                candidates.update(self._buckets[band].get(key, ()))
+            candidates.discard(profile_id)
+            if not candidates:
+                return []
+            ids = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            rows = np.fromiter((self.row_of[i] for i in ids), dtype=np.int64, count=len(ids))
+            scores = (self.signatures[rows] == signature).mean(axis=1)
+        order = np.lexsort((ids, -scores))[:limit]
+        return [{"profile_id": int(ids[k]), "similarity": round(float(scores[k]), 4)} for k in order]
+
+
+def build_index(db: Session) -> MinHashIndex:
+    index = MinHashIndex()
+    for profile_id, tokens in load_features(db).items():
+        index.upsert(profile_id, tokens)
+    return index
+
+
+def apply_changes(db: Session, index: MinHashIndex, changes: List[dict]):
+    """Re-sign only the profiles touched by the given change log entries"""
+    affected = {c["profile_id"] for c in changes if c["entity_type"] in FEATURE_ENTITIES and c["profile_id"]}
+    if not affected:
+        return
+    features = load_features(db, affected)
+    for profile_id in affected:
+        # Deleted profiles (and ones left without features) load no tokens and are dropped
+        index.upsert(profile_id, features.get(profile_id, set()))
+
+
+similarity_index = SnapshotRefresher("profile_similarity", build_index, SIMILARITY_REFRESH_INTERVAL, apply_changes)
@@ -0,0 +1,449 @@
+"""
+Array-backed in-memory read model of the profile graph (READ_MODEL=memory)
+Every table is held as parallel NumPy column arrays, with all strings
+interned in one pool. Child rows are sorted by profile, so a profile's
+skills, projects, work experiences and links are each one contiguous range
+found through an offsets array (CSR). Writes replace the touched profile in
+a small overlay that is merged back into the arrays once it grows.
+"""
+
+import json
+import os
+import sys
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import models
+from metrics import metrics
+
+READ_MODEL = os.getenv("READ_MODEL", "db").lower()  # "memory" serves GETs from the read model
+READ_MODEL_ENABLED = READ_MODEL == "memory"
+READ_MODEL_MAX_OVERLAY = int(os.getenv("READ_MODEL_MAX_OVERLAY", "1024"))
+
+# Column order matches the response schemas; kinds pick the array encoding
+PROFILE_FIELDS = (("name", "str"), ("email", "str"), ("education", "str"), ("bio", "str"), ("location", "str"),
+                  ("id", "int"), ("created_at", "datetime"), ("updated_at", "datetime"))
+CHILD_FIELDS = {
+    "skills": (models.Skill, (("name", "str"), ("level", "str"), ("category", "str"), ("id", "int"),
+                              ("profile_id", "int"), ("created_at", "datetime"))),
+    "projects": (models.Project, (("title", "str"), ("description", "str"), ("technologies", "json"),
+                                  ("github_url", "str"), ("live_url", "str"), ("image_url", "str"),
+                                  ("start_date", "datetime"), ("end_date", "datetime"), ("is_active", "bool"),
+                                  ("id", "int"), ("profile_id", "int"), ("created_at", "datetime"))),
+    "work_experiences": (models.WorkExperience, (("company", "str"), ("position", "str"), ("description", "str"),
+                                                 ("start_date", "datetime"), ("end_date", "datetime"),
+                                                 ("is_current", "bool"), ("location", "str"), ("id", "int"),
+                                                 ("profile_id", "int"), ("created_at", "datetime"))),
+    "links": (models.ProfileLink, (("platform", "str"), ("url", "str"), ("id", "int"), ("profile_id", "int"),
+                                   ("created_at", "datetime"))),
+}
+
+_NULL_TIME = np.iinfo(np.int64).min
+_EPOCH = datetime(1970, 1, 1)
+
+Document = Dict[str, object]  # one profile rendered as ProfileComplete
+
+
+class StringPool:
+    """Interned strings shared by every column; code 0 is NULL"""
+
+    def __init__(self):
+        self.values: List[Optional[str]] = [None]
+        self.codes: Dict[str, int] = {}
+
+    def intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return 0
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def containing(self, needle: str) -> np.ndarray:
+        """Codes whose value contains needle, ignoring case (like ILIKE '%needle%')"""
+        needle = needle.lower()
+        return np.array([code for value, code in self.codes.items() if needle in value.lower()], dtype=np.uint32)
+
+    @property
+    def nbytes(self) -> int:
+        return sys.getsizeof(self.values) + sys.getsizeof(self.codes) + sum(sys.getsizeof(v) for v in self.values[1:])
+
+
+def _micros(value: Optional[datetime]) -> int:
+    if value is None:
+        return _NULL_TIME
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def _encode(kind: str, values: List[object], pool: StringPool) -> np.ndarray:
+    if kind == "str":
+        return np.fromiter((pool.intern(v) for v in values), dtype=np.uint32, count=len(values))
+    if kind == "json":
+        return np.fromiter((pool.intern(None if v is None else json.dumps(v)) for v in values),
+                           dtype=np.uint32, count=len(values))
+    if kind == "datetime":
+        return np.fromiter((_micros(v) for v in values), dtype=np.int64, count=len(values))
+    if kind == "bool":
+        return np.fromiter((-1 if v is None else int(v) for v in values), dtype=np.int8, count=len(values))
+    return np.fromiter(values, dtype=np.int64, count=len(values))
+
+
+def _decode(kind: str, values: np.ndarray, pool: StringPool) -> list:
+    """Python values of one column slice"""
+    values = values.tolist()
+    if kind == "str":
+        strings = pool.values
+        return [strings[v] for v in values]
+    if kind == "json":
+        strings = pool.values
+        return [None if v == 0 else json.loads(strings[v]) for v in values]
+    if kind == "datetime":
+        return [None if v == _NULL_TIME else _EPOCH + timedelta(microseconds=v) for v in values]
+    if kind == "bool":
+        return [None if v < 0 else bool(v) for v in values]
+    return values
+
+
+class Table:
+    """Parallel column arrays of one entity"""
+
+    def __init__(self, fields, columns: Dict[str, np.ndarray]):
+        self.fields = fields
+        self.columns = columns
+
+    @classmethod
+    def from_rows(cls, fields, rows: List[tuple], pool: StringPool) -> "Table":
+        return cls(fields, {name: _encode(kind, [row[i] for row in rows], pool)
+                            for i, (name, kind) in enumerate(fields)})
+
+    def __len__(self):
+        return len(self.columns["id"])
+
+    def take(self, index: np.ndarray) -> "Table":
+        return Table(self.fields, {name: column[index] for name, column in self.columns.items()})
+
+    def concat(self, other: "Table") -> "Table":
+        return Table(self.fields, {name: np.concatenate([column, other.columns[name]])
+                                   for name, column in self.columns.items()})
+
+    def rows(self, index, pool: StringPool) -> List[Dict[str, object]]:
+        """Rows at index (an index array or slice) as dicts, decoded a column at a time"""
+        names = [name for name, _ in self.fields]
+        columns = [_decode(kind, self.columns[name][index], pool) for name, kind in self.fields]
+        return [dict(zip(names, values)) for values in zip(*columns)]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self.columns.values())
+
+
+class _Arrays:
+    """Profiles sorted by ID and, per relation, children sorted by (profile_id, id) with CSR offsets"""
+
+    def __init__(self, profiles: Table, children: Dict[str, Table]):
+        self.profiles = profiles.take(np.argsort(profiles.columns["id"], kind="stable"))
+        self.ids = self.profiles.columns["id"]
+        self.children: Dict[str, Table] = {}
+        self.offsets: Dict[str, np.ndarray] = {}
+        for relation, table in children.items():
+            owners = table.columns["profile_id"]
+            kept = np.flatnonzero(np.isin(owners, self.ids))  # orphans have no range to live in
+            order = kept[np.lexsort((table.columns["id"][kept], owners[kept]))]
+            table = table.take(order)
+            self.children[relation] = table
+            self.offsets[relation] = np.append(
+                np.searchsorted(table.columns["profile_id"], self.ids, "left"), len(table)
+            ).astype(np.int64)
+
+    def position(self, profile_id: int) -> Optional[int]:
+        i = int(np.searchsorted(self.ids, profile_id))
+        return i if i < len(self.ids) and self.ids[i] == profile_id else None
+
+    def child_rows(self, relation: str, position: int, pool: StringPool) -> List[Dict[str, object]]:
+        table, offsets = self.children[relation], self.offsets[relation]
+        return table.rows(slice(offsets[position], offsets[position + 1]), pool)
+
+    def document(self, position: int, pool: StringPool) -> Document:
+        document = self.profiles.rows(slice(position, position + 1), pool)[0]
+        for relation in CHILD_FIELDS:
+            document[relation] = self.child_rows(relation, position, pool)
+        _sort_work(document["work_experiences"])
+        return document
+
+    @property
+    def nbytes(self) -> int:
+        return (self.profiles.nbytes + sum(t.nbytes for t in self.children.values())
+                + sum(o.nbytes for o in self.offsets.values()))
+
+
+def _sort_work(work: List[Dict[str, object]]):
+    # Same order as the DB path: most recent start first
+    work.sort(key=lambda w: w["start_date"] or datetime.min, reverse=True)
+
+
+def load_rows(db: Session, profile_ids: Optional[Iterable[int]] = None) -> Tuple[List[tuple], Dict[str, List[tuple]]]:
+    """Profile rows and child rows per relation, as tuples in field order"""
+    ids = None if profile_ids is None else list(profile_ids)
+    p = models.Profile.__table__
+    query = select(*(p.c[name] for name, _ in PROFILE_FIELDS))
+    if ids is not None:
+        query = query.where(p.c.id.in_(ids))
+    profiles = [tuple(row) for row in db.execute(query)]
+    children = {}
+    for relation, (model, fields) in CHILD_FIELDS.items():
+        table = model.__table__
+        query = select(*(table.c[name] for name, _ in fields))
+        if ids is not None:
+            query = query.where(table.c.profile_id.in_(ids))
+        children[relation] = [tuple(row) for row in db.execute(query.order_by(table.c.profile_id, table.c.id))]
+    return profiles, children
+
+
+def load_documents(db: Session, profile_ids: Iterable[int]) -> Dict[int, Document]:
+    """The given profiles as ProfileComplete dicts (children by ID, work by start date), keyed by ID"""
+    profiles, children = load_rows(db, profile_ids)
+    documents = {}
+    for row in profiles:
+        document = dict(zip((name for name, _ in PROFILE_FIELDS), row))
+        for relation in CHILD_FIELDS:
+            document[relation] = []
+        documents[document["id"]] = document
+    for relation, (_, fields) in CHILD_FIELDS.items():
+        names = [name for name, _ in fields]
+        for row in children[relation]:
+            child = dict(zip(names, row))
+            if child["profile_id"] in documents:
+                documents[child["profile_id"]][relation].append(child)
+    for document in documents.values():
+        _sort_work(document["work_experiences"])
+    return documents
+
+
+class ReadModel:
+    """
+    The whole profile graph in memory, loaded lazily on first use.
+
+    profile_crud reloads a profile into the overlay after each write to it
+    (None marks a deleted profile); the invalidation bus does the same for
+    writes served by other workers. Once the overlay holds more than
+    max_overlay profiles it is merged into the arrays with vectorized
+    take/concatenate/sort, not a reload from the database.
+    """
+
+    def __init__(self, max_overlay: int = READ_MODEL_MAX_OVERLAY):
+        self.max_overlay = max_overlay
+        self.pool = StringPool()
+        self._arrays: Optional[_Arrays] = None
+        self._overlay: Dict[int, Optional[Document]] = {}
+        self._views: Dict[str, object] = {}  # derived orderings, dropped on every change
+        self._lock = threading.RLock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._arrays is not None
+
+    def load(self, db: Session):
+        """(Re)build the arrays from the database"""
+        profiles, children = load_rows(db)
+        pool = StringPool()
+        arrays = _Arrays(
+            Table.from_rows(PROFILE_FIELDS, profiles, pool),
+            {relation: Table.from_rows(CHILD_FIELDS[relation][1], rows, pool) for relation, rows in children.items()},
+        )
+        with self._lock:
+            self.pool, self._arrays, self._overlay, self._views = pool, arrays, {}, {}
+
+    def ensure_loaded(self, db: Session):
+        if self._arrays is None:
+            self.load(db)
+
+    def invalidate(self):
+        """Drop everything; the next read reloads"""
+        with self._lock:
+            self._arrays, self._overlay, self._views = None, {}, {}
+
+    # Writes
+    def reload_profiles(self, db: Session, profile_ids: Iterable[int]):
+        """Re-read the given profiles (with their children) into the overlay"""
+        if self._arrays is None:
+            return
+        ids = set(profile_ids)
+        if not ids:
+            return
+        documents = load_documents(db, ids)
+        with self._lock:
+            if self._arrays is None:
+                return
+            for profile_id in ids:
+                self._overlay[profile_id] = documents.get(profile_id)
+            self._views = {}
+            if len(self._overlay) > self.max_overlay:
+                self._compact_locked()
+
+    def reload_profile(self, db: Session, profile_id: int):
+        self.reload_profiles(db, (profile_id,))
+
+    def apply_changes(self, db: Session, changes: List[dict]):
+        """Invalidation bus handler: reload every profile the changes touch"""
+        self.reload_profiles(db, {c["profile_id"] for c in changes if c["profile_id"]})
+
+    def _compact_locked(self):
+        arrays, pool = self._arrays, self.pool
+        replaced = np.fromiter(self._overlay, dtype=np.int64, count=len(self._overlay))
+        live = [d for d in self._overlay.values() if d is not None]
+
+        def merged(table: Table, owners: np.ndarray, rows: List[tuple]) -> Table:
+            return table.take(np.flatnonzero(~np.isin(owners, replaced))).concat(
+                Table.from_rows(table.fields, rows, pool))
+
+        profiles = merged(arrays.profiles, arrays.ids,
+                          [tuple(d[name] for name, _ in PROFILE_FIELDS) for d in live])
+        children = {}
+        for relation, (_, fields) in CHILD_FIELDS.items():
+            table = arrays.children[relation]
+            rows = [tuple(child[name] for name, _ in fields) for d in live for child in d[relation]]
+            children[relation] = merged(table, table.columns["profile_id"], rows)
+        self._arrays, self._overlay, self._views = _Arrays(profiles, children), {}, {}
+        metrics.inc("read_model.compactions")
+
+    # Reads
+    def _lookup(self, db: Session, profile_id: int, relation: Optional[str]):
+        """The document (or one relation of it) of a profile, None if the profile does not exist"""
+        self.ensure_loaded(db)
+        for attempt in range(2):
+            with self._lock:
+                if profile_id in self._overlay:
+                    document = self._overlay[profile_id]
+                    if document is None or relation is None:
+                        return document
+                    return document[relation]
+                position = self._arrays.position(profile_id)
+                if position is not None:
+                    if relation is None:
+                        return self._arrays.document(position, self.pool)
+                    rows = self._arrays.child_rows(relation, position, self.pool)
+                    if relation == "work_experiences":
+                        _sort_work(rows)
+                    return rows
+            if attempt == 0:
+                # Confirm misses against the database: the profile may have been created
+                # through another worker moments ago; the lookup records the answer either way
+                self.reload_profile(db, profile_id)
+        return None
+
+    def get_document(self, db: Session, profile_id: int) -> Optional[Document]:
+        """A profile with its skills, projects, work experiences and links; None if it does not exist"""
+        return self._lookup(db, profile_id, None)
+
+    def get_children(self, db: Session, profile_id: int, relation: str) -> Optional[List[Dict[str, object]]]:
+        """One relation of a profile; None if the profile does not exist"""
+        return self._lookup(db, profile_id, relation)
+
+    def _id_order_locked(self, key: str, table: Table, visible: np.ndarray, extra: List[Dict[str, object]]):
+        """
+        Visible rows of table plus extra (overlay) rows in ID order, cached until the next change.
+
+        Entries are array row numbers, or -1 - i for extra[i].
+        """
+        view = self._views.get(key)
+        if view is None:
+            rows = np.flatnonzero(visible)
+            ids = np.concatenate([table.columns["id"][rows], np.array([r["id"] for r in extra], dtype=np.int64)])
+            sources = np.concatenate([rows, -1 - np.arange(len(extra))])
+            view = self._views[key] = (sources[np.argsort(ids, kind="stable")], extra)
+        return view
+
+    def _page_locked(self, table: Table, view, skip: int, limit: int) -> List[Dict[str, object]]:
+        sources, extra = view
+        sources = sources[skip:skip + limit]
+        decoded = iter(table.rows(sources[sources >= 0], self.pool))
+        return [next(decoded) if s >= 0 else extra[-1 - s] for s in sources.tolist()]
+
+    def _profiles_view_locked(self):
+        if "profiles" in self._views:
+            return self._views["profiles"]
+        arrays = self._arrays
+        replaced = np.fromiter(self._overlay, dtype=np.int64, count=len(self._overlay))
+        visible = ~np.isin(arrays.ids, replaced)
+        extra = [{name: d[name] for name, _ in PROFILE_FIELDS} for d in self._overlay.values() if d is not None]
+        return self._id_order_locked("profiles", arrays.profiles, visible, extra)
+
+    def list_profiles(self, db: Session, skip: int = 0, limit: int = 100) -> List[Dict[str, object]]:
+        """A page of profiles (without children) ordered by ID"""
+        self.ensure_loaded(db)
+        with self._lock:
+            return self._page_locked(self._arrays.profiles, self._profiles_view_locked(), skip, limit)
+
+    def _visible_locked(self, relation: str) -> Tuple[Table, np.ndarray, List[Dict[str, object]]]:
+        """Array rows of a relation not shadowed by the overlay, and the overlay's rows"""
+        table = self._arrays.children[relation]
+        replaced = np.fromiter(self._overlay, dtype=np.int64, count=len(self._overlay))
+        visible = ~np.isin(table.columns["profile_id"], replaced)
+        extra = [child for d in self._overlay.values() if d is not None for child in d[relation]]
+        return table, visible, extra
+
+    def list_projects(self, db: Session, skip: int = 0, limit: int = 100) -> List[Dict[str, object]]:
+        """A page of projects ordered by ID"""
+        self.ensure_loaded(db)
+        with self._lock:
+            view = self._views.get("projects") or self._id_order_locked("projects", *self._visible_locked("projects"))
+            return self._page_locked(self._arrays.children["projects"], view, skip, limit)
+
+    def search_skills(self, db: Session, skill_name: str, level: Optional[str] = None) -> List[Dict[str, object]]:
+        """Skills whose name contains skill_name (ignoring case), optionally at one level, ordered by ID"""
+        self.ensure_loaded(db)
+        with self._lock:
+            table, visible, extra = self._visible_locked("skills")
+            mask = visible & np.isin(table.columns["name"], self.pool.containing(skill_name))
+            if level:
+                mask &= table.columns["level"] == self.pool.codes.get(level, -1)
+            needle = skill_name.lower()
+            matches = table.rows(np.flatnonzero(mask), self.pool)
+            matches += [s for s in extra if needle in s["name"].lower() and (not level or s["level"] == level)]
+        matches.sort(key=lambda s: s["id"])
+        return matches
+
+    def top_skills(self, db: Session, limit: int = 10) -> List[Dict[str, object]]:
+        """Most common skill names with their counts"""
+        self.ensure_loaded(db)
+        with self._lock:
+            table, visible, extra = self._visible_locked("skills")
+            counts = np.bincount(table.columns["name"][visible], minlength=len(self.pool.values))
+            totals = Counter({self.pool.values[code]: int(counts[code]) for code in np.flatnonzero(counts).tolist()})
+        totals.update(skill["name"] for skill in extra)
+        ranked = sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+        return [{"name": name, "count": count} for name, count in ranked[:limit] if count]
+
+    def stats(self, db: Session) -> Dict[str, int]:
+        """Row counts shown on the dashboard"""
+        self.ensure_loaded(db)
+        with self._lock:
+            counts = {"profiles": len(self._profiles_view_locked()[0])}
+            for key, relation in (("skills", "skills"), ("projects", "projects")):
+                _, visible, extra = self._visible_locked(relation)
+                counts[key] = int(visible.sum()) + len(extra)
+            return counts
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Approximate bytes held: column arrays, the string pool and overlay size"""
+        with self._lock:
+            arrays = self._arrays.nbytes if self._arrays is not None else 0
+            return {
+                "arrays_bytes": arrays,
+                "string_pool_bytes": self.pool.nbytes,
+                "strings": len(self.pool.values) - 1,
+                "profiles": len(self._arrays.ids) if self._arrays is not None else 0,
+                "overlay_profiles": len(self._overlay),
+            }
+
+
+read_model = ReadModel()
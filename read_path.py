@@ -0,0 +1,127 @@
+"""
+ORM-free read path for list and search endpoints
+Selects only the response columns with Core select(), wraps each row in a
+__slots__ DTO and encodes the page to JSON bytes directly, skipping identity
+map bookkeeping and response model validation
+"""
+
+import json
+from datetime import date
+from typing import Any, Dict, List, Optional, Type
+
+from fastapi.responses import Response
+from sqlalchemy import literal, or_, select
+from sqlalchemy.orm import Session
+
+import models
+
+
+class RowDTO:
+    """Immutable-by-convention row; subclasses list their fields in __slots__ in response order"""
+
+    __slots__ = ()
+
+    def __init__(self, row):
+        for name, value in zip(self.__slots__, row):
+            setattr(self, name, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()})"
+
+
+class ProfileRow(RowDTO):
+    __slots__ = ("name", "email", "education", "bio", "location", "id", "created_at", "updated_at")
+
+
+class SkillRow(RowDTO):
+    __slots__ = ("name", "level", "category", "id", "profile_id", "created_at")
+
+
+class ProjectRow(RowDTO):
+    __slots__ = ("title", "description", "technologies", "github_url", "live_url", "image_url",
+                 "start_date", "end_date", "is_active", "id", "profile_id", "created_at")
+
+
+class ProfileHit(RowDTO):
+    __slots__ = ("type", "id", "name", "email", "bio")
+
+
+class SkillHit(RowDTO):
+    __slots__ = ("type", "id", "name", "level", "profile_id")
+
+
+class ProjectHit(RowDTO):
+    __slots__ = ("type", "id", "title", "description", "profile_id")
+
+
+def _columns(model, dto: Type[RowDTO], kind: Optional[str] = None):
+    """Columns in the DTO's field order; a "type" field is filled with the constant kind"""
+    table = model.__table__
+    return [literal(kind).label("type") if name == "type" else table.c[name] for name in dto.__slots__]
+
+
+def _fetch(db: Session, query, dto: Type[RowDTO], params: Optional[Dict[str, Any]] = None) -> List[RowDTO]:
+    return [dto(row) for row in db.execute(query, params or {})]
+
+
+def list_profiles(db: Session, skip: int = 0, limit: int = 100, where=None,
+                  params: Optional[Dict[str, Any]] = None) -> List[ProfileRow]:
+    """A page of profiles, optionally narrowed by a compiled profile_filters condition"""
+    query = select(*_columns(models.Profile, ProfileRow)).order_by(models.Profile.__table__.c.id)
+    if where is not None:
+        query = query.where(where)
+    return _fetch(db, query.offset(skip).limit(limit), ProfileRow, params)
+
+
+def list_projects(db: Session, skip: int = 0, limit: int = 100) -> List[ProjectRow]:
+    """A page of projects"""
+    query = select(*_columns(models.Project, ProjectRow)).order_by(models.Project.__table__.c.id)
+    return _fetch(db, query.offset(skip).limit(limit), ProjectRow)
+
+
+def search_skills(db: Session, skill_name: str, level: Optional[str] = None) -> List[SkillRow]:
+    """Skills whose name contains skill_name, optionally at one level"""
+    s = models.Skill.__table__
+    query = select(*_columns(models.Skill, SkillRow)).where(s.c.name.ilike(f"%{skill_name}%"))
+    if level:
+        query = query.where(s.c.level == level)
+    return _fetch(db, query.order_by(s.c.id), SkillRow)
+
+
+def global_search(db: Session, query: str, limit: int = 10) -> List[RowDTO]:
+    """Profiles, then skills, then projects matching query; at most limit hits in total"""
+    p, s, pr = models.Profile.__table__, models.Skill.__table__, models.Project.__table__
+    pattern = f"%{query}%"
+    searches = (
+        ("profile", models.Profile, ProfileHit, or_(p.c.name.ilike(pattern), p.c.bio.ilike(pattern), p.c.education.ilike(pattern))),
+        ("skill", models.Skill, SkillHit, s.c.name.ilike(pattern)),
+        ("project", models.Project, ProjectHit, or_(pr.c.title.ilike(pattern), pr.c.description.ilike(pattern))),
+    )
+    results: List[RowDTO] = []
+    for kind, model, dto, condition in searches:
+        remaining = limit - len(results)
+        if remaining <= 0:
+            break
+        results.extend(_fetch(db, select(*_columns(model, dto, kind)).where(condition).limit(remaining), dto))
+    return results
+
+
+def _default(value):
+    if isinstance(value, RowDTO):
+        return value.to_dict()
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def render(payload) -> bytes:
+    """JSON bytes for DTOs (or containers of them), formatted like JSONResponse"""
+    return json.dumps(payload, default=_default, ensure_ascii=False, allow_nan=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def json_response(payload) -> Response:
+    return Response(content=render(payload), media_type="application/json")
@@ -18,6 +18,8 @@ if not exist "meapi_playground.db" (
 )
 
 echo.
+if /i "%1"=="prod" goto prod
+
 echo 🌐 Starting FastAPI server...
 echo 📍 Server will be available at: http://localhost:8000
 echo 📚 API Documentation: http://localhost:8000/docs
@@ -26,4 +28,14 @@ echo ================================
 
 uvicorn main_profile:app --host 0.0.0.0 --port 8000 --reload
 
+pause
+exit /b 0
+
+:prod
+if "%WEB_CONCURRENCY%"=="" set WEB_CONCURRENCY=%NUMBER_OF_PROCESSORS%
+echo 🌐 Starting %WEB_CONCURRENCY% workers (production, no reload)...
+echo 📍 Server will be available at: http://localhost:8000
+echo ================================
+python start_app.py --prod --workers %WEB_CONCURRENCY%
+
 pause
\ No newline at end of file
@@ -223,12 +223,9 @@ def seed_database():
     try:
         # Clear existing data
         print("Clearing existing data...")
-        db.query(models.ProfileLink).delete()
-        db.query(models.WorkExperience).delete()
-        db.query(models.Project).delete()
-        db.query(models.Skill).delete()
-        db.query(models.Profile).delete()
-        db.commit()
+        # Delete through profile_crud so the change log records tombstones
+        for (profile_id,) in db.query(models.Profile.id).all():
+            profile_crud.delete_profile(db, profile_id)
         
         # Get sample data
         sample_data = create_sample_profile_data()
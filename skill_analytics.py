@@ -0,0 +1,121 @@
+"""
+Skill co-occurrence analytics for Me-API Playground
+Groups skills by profile once, counts skill pairs with NumPy and derives
+co-occurrence counts and lift for "people with X also list..." queries
+"""
+
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import models
+from background import SnapshotRefresher
+
+SKILL_ANALYTICS_REFRESH_INTERVAL = float(os.getenv("SKILL_ANALYTICS_REFRESH_INTERVAL", "30"))
+# Related skills precomputed per skill and ranking (count, lift)
+SKILL_ANALYTICS_TOP_K = int(os.getenv("SKILL_ANALYTICS_TOP_K", "50"))
+
+
+class SkillCooccurrence:
+    """
+    Precomputed co-occurrence of skills across profiles.
+
+    For skills a and b over N profiles:
+        count(a, b)      profiles listing both
+        confidence(a→b)  count(a, b) / count(a)
+        lift(a, b)       count(a, b) * N / (count(a) * count(b))
+    """
+
+    def __init__(self, names: List[str], totals: np.ndarray, rankings: Dict[str, Dict[int, Tuple[np.ndarray, np.ndarray]]],
+                 profiles: int):
+        self.names = names
+        self.index = {name.lower(): i for i, name in enumerate(names)}
+        self.totals = totals
+        # sort -> skill -> (related skill codes, pair counts), best first
+        self.rankings = rankings
+        self.profiles = profiles
+
+    def related(self, name: str, limit: int = 10, sort: str = "count") -> Optional[List[dict]]:
+        """Skills most often listed alongside name; None for an unknown skill"""
+        i = self.index.get(name.lower())
+        if i is None:
+            return None
+        ids, counts = self.rankings[sort][i]
+        lift = counts * self.profiles / (self.totals[i] * self.totals[ids])
+        return [
+            {
+                "name": self.names[ids[k]],
+                "count": int(counts[k]),
+                "confidence": round(float(counts[k] / self.totals[i]), 4),
+                "lift": round(float(lift[k]), 4),
+            }
+            for k in range(min(limit, len(ids)))
+        ]
+
+
+def _pair_counts(profiles: np.ndarray, skills: np.ndarray, n_skills: int):
+    """
+    Count ordered skill pairs (a != b) listed by the same profile.
+
+    profiles/skills are distinct (profile, skill) codes sorted by profile.
+    Work and memory are proportional to the pairs that actually occur (the
+    sum of k² over profiles with k skills), never to n_profiles x n_skills.
+    Returns (first skill, second skill, count) sorted by first then second.
+    """
+    group_start = np.flatnonzero(np.r_[True, profiles[1:] != profiles[:-1]])
+    group_size = np.diff(np.r_[group_start, len(profiles)])
+    # Per entry: where its profile's skills start and how many there are
+    starts, sizes = np.repeat(group_start, group_size), np.repeat(group_size, group_size)
+    # Pair every entry with each entry of its own profile
+    left = np.repeat(np.arange(len(profiles)), sizes)
+    within = np.arange(len(left)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    right = np.repeat(starts, sizes) + within
+    keep = left != right
+    codes, pair_counts = np.unique(skills[left[keep]] * n_skills + skills[right[keep]], return_counts=True)
+    return codes // n_skills, codes % n_skills, pair_counts.astype(np.int64)
+
+
+def build_cooccurrence(db: Session, top_k: int = SKILL_ANALYTICS_TOP_K) -> SkillCooccurrence:
+    """Load skills(profile_id, name) once and compute co-occurrence with vectorized ops"""
+    table = models.Skill.__table__
+    rows = db.execute(select(table.c.profile_id, table.c.name)).all()
+    if not rows:
+        return SkillCooccurrence([], np.zeros(0, dtype=np.int64), {"count": {}, "lift": {}}, 0)
+
+    profile_ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    raw_names = np.array([r[1] for r in rows], dtype=object)
+    lowered = np.array([n.lower() for n in raw_names], dtype=object)
+
+    _, profile_codes = np.unique(profile_ids, return_inverse=True)
+    keys, first_seen, skill_codes = np.unique(lowered, return_index=True, return_inverse=True)
+    names = [str(raw_names[i]) for i in first_seen]
+
+    # A profile listing a skill twice still counts once
+    pairs = np.unique(np.stack([profile_codes, skill_codes], axis=1), axis=0)
+    n_profiles, n_skills = int(profile_codes.max()) + 1, len(keys)
+    totals = np.bincount(pairs[:, 1], minlength=n_skills).astype(np.int64)
+    first, second, pair_counts = _pair_counts(pairs[:, 0], pairs[:, 1], n_skills)
+    # CSR over the first skill: pairs of skill i are first[indptr[i]:indptr[i + 1]]
+    indptr = np.searchsorted(first, np.arange(n_skills + 1))
+
+    def rows_of(i):
+        return second[indptr[i]:indptr[i + 1]], pair_counts[indptr[i]:indptr[i + 1]]
+
+    by_count, by_lift = {}, {}
+    for i in range(n_skills):
+        ids, values = rows_of(i)
+        # Ranked separately over every pair, so a rare pair with high lift is kept
+        # even when it is far from the top_k by count; ties broken by name order
+        order = np.lexsort((ids, -values))[:top_k]
+        by_count[i] = ids[order], values[order]
+        lift = values / totals[ids]  # proportional to lift for a fixed skill i
+        order = np.lexsort((ids, -values, -lift))[:top_k]
+        by_lift[i] = ids[order], values[order]
+    return SkillCooccurrence(names, totals, {"count": by_count, "lift": by_lift}, n_profiles)
+
+
+# Rebuilt off the request path whenever the change log moves
+cooccurrence = SnapshotRefresher("skill_cooccurrence", build_cooccurrence, SKILL_ANALYTICS_REFRESH_INTERVAL)
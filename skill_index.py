@@ -0,0 +1,246 @@
+"""
+Bitmap index for boolean multi-skill profile queries
+Maps each skill (and skill + level) to a compressed bitmap of profile IDs so
+queries like `python AND docker AND (aws OR gcp) AND python>=advanced` are
+answered with bitmap AND/OR/NOT instead of joins on skills
+"""
+
+import re
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import models
+from bitmaps import RoaringBitmap
+
+# Ordered from lowest to highest for >=, >, <=, < comparisons
+SKILL_LEVELS = ("beginner", "intermediate", "advanced", "expert")
+
+_TOKEN = re.compile(r'(\()|(\))|(>=|<=|!=|=|:|>|<)|"([^"]*)"|([\w.+#-]+)')
+
+Key = Tuple[str, str]  # (lowercased skill name, lowercased level)
+
+
+class MatchQueryError(ValueError):
+    """Malformed /profiles/match expression"""
+
+
+def _tokenize(query: str) -> List[Tuple[str, str]]:
+    tokens, position = [], 0
+    while position < len(query):
+        if query[position].isspace():
+            position += 1
+            continue
+        match = _TOKEN.match(query, position)
+        if not match:
+            raise MatchQueryError(f"Unexpected character at position {position}: {query[position]!r}")
+        position = match.end()
+        lparen, rparen, op, quoted, word = match.groups()
+        if lparen:
+            tokens.append(("(", lparen))
+        elif rparen:
+            tokens.append((")", rparen))
+        elif op:
+            tokens.append(("op", "=" if op == ":" else op))
+        elif quoted is not None:
+            tokens.append(("word", quoted))
+        elif word.upper() in ("AND", "OR", "NOT"):
+            tokens.append((word.upper(), word))
+        else:
+            tokens.append(("word", word))
+    return tokens
+
+
+class _Parser:
+    """
+    Recursive descent over:
+        expr  := and ("OR" and)*
+        and   := unary (["AND"] unary)*        adjacent terms are AND-ed
+        unary := "NOT" unary | "(" expr ")" | skill [op level]
+    """
+
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.position][0] if self.position < len(self.tokens) else None
+
+    def take(self, kind: str) -> str:
+        if self.peek() != kind:
+            found = self.tokens[self.position][1] if self.position < len(self.tokens) else "end of query"
+            raise MatchQueryError(f"Expected {kind} but found {found!r}")
+        value = self.tokens[self.position][1]
+        self.position += 1
+        return value
+
+    def parse(self):
+        if not self.tokens:
+            raise MatchQueryError("Empty query")
+        node = self.expr()
+        if self.peek() is not None:
+            raise MatchQueryError(f"Unexpected {self.tokens[self.position][1]!r}")
+        return node
+
+    def expr(self):
+        node = self.conjunction()
+        while self.peek() == "OR":
+            self.take("OR")
+            node = ("or", node, self.conjunction())
+        return node
+
+    def conjunction(self):
+        node = self.unary()
+        while self.peek() in ("AND", "NOT", "(", "word"):
+            if self.peek() == "AND":
+                self.take("AND")
+            node = ("and", node, self.unary())
+        return node
+
+    def unary(self):
+        kind = self.peek()
+        if kind == "NOT":
+            self.take("NOT")
+            return ("not", self.unary())
+        if kind == "(":
+            self.take("(")
+            node = self.expr()
+            self.take(")")
+            return node
+        name = self.take("word").strip().lower()
+        if self.peek() == "op":
+            op = self.take("op")
+            level = self.take("word").strip().lower()
+            if op != "=" and op != "!=" and level not in SKILL_LEVELS:
+                raise MatchQueryError(f"Unknown level {level!r}; expected one of {', '.join(SKILL_LEVELS)}")
+            return ("skill", name, op, level)
+        return ("skill", name, None, None)
+
+
+def parse_query(query: str):
+    """Parse a match expression into a tuple AST"""
+    return _Parser(_tokenize(query)).parse()
+
+
+class SkillBitmapIndex:
+    """
+    Skill name -> profile bitmap and (skill, level) -> profile bitmap, plus
+    the bitmap of all profiles for NOT. Loaded lazily on first use; the skill
+    and profile writes in profile_crud keep it in sync after they commit.
+    """
+
+    def __init__(self):
+        self._by_skill: Dict[str, RoaringBitmap] = {}
+        self._by_level: Dict[Key, RoaringBitmap] = {}
+        self._profiles = RoaringBitmap()
+        self._keys: Dict[int, Set[Key]] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self, db: Session):
+        """(Re)build the whole index from the database"""
+        p, s = models.Profile.__table__, models.Skill.__table__
+        profiles = db.execute(select(p.c.id)).scalars().all()
+        keys: Dict[int, Set[Key]] = {}
+        for profile_id, name, level in db.execute(select(s.c.profile_id, s.c.name, s.c.level)):
+            keys.setdefault(profile_id, set()).add(_key(name, level))
+        with self._lock:
+            self._by_skill, self._by_level, self._keys = {}, {}, {}
+            self._profiles = RoaringBitmap.of(profiles)
+            for profile_id, profile_keys in keys.items():
+                self._set_keys_locked(profile_id, profile_keys)
+            self._loaded = True
+
+    def ensure_loaded(self, db: Session):
+        if not self._loaded:
+            self.load(db)
+
+    def invalidate(self):
+        """Force a rebuild on next use"""
+        with self._lock:
+            self._loaded = False
+
+    def add_profile(self, profile_id: int):
+        with self._lock:
+            if self._loaded:
+                self._profiles.add(profile_id)
+
+    def remove_profile(self, profile_id: int):
+        with self._lock:
+            if self._loaded:
+                self._set_keys_locked(profile_id, set())
+                self._profiles.discard(profile_id)
+
+    def reindex_profile(self, db: Session, profile_id: int):
+        """Re-read one profile's skills after a skill write"""
+        if not self._loaded:
+            return
+        s = models.Skill.__table__
+        rows = db.execute(select(s.c.name, s.c.level).where(s.c.profile_id == profile_id))
+        keys = {_key(name, level) for name, level in rows}
+        with self._lock:
+            self._set_keys_locked(profile_id, keys)
+
+    def _set_keys_locked(self, profile_id: int, keys: Set[Key]):
+        old = self._keys.get(profile_id, set())
+        for key in old - keys:
+            _discard(self._by_level, key, profile_id)
+        for key in keys - old:
+            self._by_level.setdefault(key, RoaringBitmap()).add(profile_id)
+        old_names, new_names = {k[0] for k in old}, {k[0] for k in keys}
+        for name in old_names - new_names:
+            _discard(self._by_skill, name, profile_id)
+        for name in new_names - old_names:
+            self._by_skill.setdefault(name, RoaringBitmap()).add(profile_id)
+        if keys:
+            self._keys[profile_id] = keys
+        else:
+            self._keys.pop(profile_id, None)
+
+    def evaluate(self, db: Session, node) -> RoaringBitmap:
+        """Profiles matching a parsed expression"""
+        self.ensure_loaded(db)
+        with self._lock:
+            return self._evaluate_locked(node)
+
+    def _evaluate_locked(self, node) -> RoaringBitmap:
+        kind = node[0]
+        if kind == "and":
+            return self._evaluate_locked(node[1]) & self._evaluate_locked(node[2])
+        if kind == "or":
+            return self._evaluate_locked(node[1]) | self._evaluate_locked(node[2])
+        if kind == "not":
+            return self._profiles - self._evaluate_locked(node[1])
+        _, name, op, level = node
+        if op is None:
+            return self._by_skill.get(name, RoaringBitmap()).copy()
+        if op == "=":
+            return self._by_level.get((name, level), RoaringBitmap()).copy()
+        if op == "!=":
+            return self._by_skill.get(name, RoaringBitmap()) - self._by_level.get((name, level), RoaringBitmap())
+        rank = SKILL_LEVELS.index(level)
+        wanted = {
+            ">=": SKILL_LEVELS[rank:], ">": SKILL_LEVELS[rank + 1:],
+            "<=": SKILL_LEVELS[:rank + 1], "<": SKILL_LEVELS[:rank],
+        }[op]
+        result = RoaringBitmap()
+        for wanted_level in wanted:
+            result = result | self._by_level.get((name, wanted_level), RoaringBitmap())
+        return result
+
+
+def _key(name: str, level: Optional[str]) -> Key:
+    return name.strip().lower(), (level or "intermediate").strip().lower()
+
+
+def _discard(bitmaps: dict, key, profile_id: int):
+    bitmap = bitmaps.get(key)
+    if bitmap is not None:
+        bitmap.discard(profile_id)
+        if not bitmap:
+            del bitmaps[key]
+
+
+skill_index = SkillBitmapIndex()
@@ -4,19 +4,20 @@ Simple startup script for Me-API Playground
 This script handles the proper startup sequence
 """
 
+import argparse
+import logging
 import subprocess
 import sys
 import time
 import os
 
-def start_application():
-    """Start the Me-API Playground application"""
-    
-    print("🚀 Starting Me-API Playground...")
-    print("=" * 50)
-    
-    # Check if database exists and seed if needed
-    if not os.path.exists("meapi_playground.db"):
+def seed_if_needed():
+    """Create and seed the database on first run"""
+    database_url = os.getenv("DATABASE_URL", "sqlite:///./meapi_playground.db")
+    # Only a SQLite file can be checked for; other databases are seeded by hand
+    if not database_url.startswith("sqlite:///"):
+        return True
+    if not os.path.exists(database_url[len("sqlite:///"):]):
         print("📊 Database not found. Creating and seeding database...")
         try:
             subprocess.run([sys.executable, "seed_database.py"], check=True)
@@ -24,6 +25,17 @@ def start_application():
         except subprocess.CalledProcessError as e:
             print(f"❌ Error creating database: {e}")
             return False
+    return True
+
+def start_application():
+    """Start the Me-API Playground application"""
+    
+    print("🚀 Starting Me-API Playground...")
+    print("=" * 50)
+    
+    # Check if database exists and seed if needed
+    if not seed_if_needed():
+        return False
     
     # Start the application with uvicorn
     print("\n🌐 Starting FastAPI server...")
@@ -49,5 +61,73 @@ def start_application():
     
     return True
 
+def start_production(host, port, workers, max_requests, max_requests_jitter):
+    """Start a pre-forked multi-worker server (POSIX) without auto-reload"""
+
+    print("🚀 Starting Me-API Playground (production)...")
+    print("=" * 50)
+
+    if not seed_if_needed():
+        return False
+
+    if not hasattr(os, "fork"):
+        # No fork on Windows: uvicorn spawns workers that each import the app
+        print(f"🌐 Starting {workers} uvicorn workers on http://{host}:{port}")
+        command = [sys.executable, "-m", "uvicorn", "main_profile:app",
+                   "--host", host, "--port", str(port), "--workers", str(workers)]
+        if max_requests:
+            command += ["--limit-max-requests", str(max_requests)]
+        try:
+            subprocess.run(command)
+        except KeyboardInterrupt:
+            print("\n\n🛑 Server stopped by user")
+        return True
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s[%(process)d] %(message)s")
+    import prefork
+
+    # Import once in the parent so workers share the loaded code copy-on-write
+    import main_profile
+    from database import engine, write_engine
+
+    try:
+        prefork.check_sqlite_multiprocess(engine)
+    except prefork.StartupCheckError as e:
+        print(f"❌ {e}")
+        return False
+
+    sock = prefork.bind_socket(host, port)
+    print(f"🌐 Supervisor {os.getpid()} starting {workers} workers on http://{host}:{port}")
+    print("🔁 kill -HUP <pid> for a rolling restart; Ctrl+C or SIGTERM to stop")
+    print("=" * 50)
+    engines = (engine,) if write_engine is engine else (engine, write_engine)
+    supervisor = prefork.PreforkSupervisor(
+        main_profile.app, sock, workers=workers, max_requests=max_requests,
+        max_requests_jitter=max_requests_jitter, engines=engines,
+    )
+    supervisor.run()
+    print("\n🛑 Server stopped")
+    return True
+
+def parse_args(argv=None):
+    import prefork
+
+    parser = argparse.ArgumentParser(description="Start Me-API Playground")
+    parser.add_argument("--prod", action="store_true", help="run pre-forked workers without --reload")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=prefork.WEB_CONCURRENCY,
+                        help="worker processes in --prod (default: WEB_CONCURRENCY or CPU count)")
+    parser.add_argument("--max-requests", type=int, default=prefork.MAX_REQUESTS_PER_WORKER,
+                        help="recycle a worker after this many requests (0: never)")
+    parser.add_argument("--max-requests-jitter", type=int, default=prefork.MAX_REQUESTS_JITTER,
+                        help="random extra requests per worker so recycles do not line up")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    start_application()
\ No newline at end of file
+    args = parse_args()
+    if args.prod:
+        ok = start_production(args.host, args.port, args.workers, args.max_requests, args.max_requests_jitter)
+    else:
+        ok = start_application()
+    sys.exit(0 if ok else 1)
\ No newline at end of file
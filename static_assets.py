@@ -0,0 +1,179 @@
+"""
+In-memory frontend assets for Me-API Playground
+Files are read and compressed once, then served with ETag and Cache-Control
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import brotli  # optional, enables the "br" variant
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", "86400"))
+STATIC_RELOAD = os.getenv("STATIC_RELOAD", "false").lower() in ("1", "true", "yes")
+STATIC_RELOAD_INTERVAL = float(os.getenv("STATIC_RELOAD_INTERVAL", "1.0"))
+
+# Preference order used when the client accepts several encodings equally
+ENCODING_PREFERENCE = ("br", "gzip", "identity")
+
+
+class StaticAsset:
+    """A file held in memory with its precompressed variants"""
+
+    def __init__(self, path: str, media_type: str):
+        self.path = path
+        self.media_type = media_type
+        self.mtime: Optional[float] = None
+        # (etag, variants) replaced as one tuple so readers never pair new bytes with an old ETag
+        self.current: Tuple[str, Dict[str, bytes]] = ("", {})
+
+    def load(self):
+        """Read the file and rebuild every encoded variant"""
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        variants = {"identity": raw, "gzip": gzip.compress(raw, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants["br"] = brotli.compress(raw, quality=11)
+        # Swap in one assignment so concurrent readers never see a partial update
+        self.current = ('"%s"' % hashlib.sha256(raw).hexdigest()[:32], variants)
+        self.mtime = os.path.getmtime(self.path)
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self.current[0])
+
+    @property
+    def etag(self) -> str:
+        return self.current[0]
+
+    @property
+    def variants(self) -> Dict[str, bytes]:
+        return self.current[1]
+
+    def is_stale(self) -> bool:
+        """Whether the file on disk changed since the last load"""
+        try:
+            return os.path.getmtime(self.path) != self.mtime
+        except OSError:
+            return False
+
+    def respond(self, request: Request) -> Response:
+        """Build a response honouring If-None-Match and Accept-Encoding"""
+        etag, variants = self.current
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={STATIC_MAX_AGE}",
+            "Vary": "Accept-Encoding",
+        }
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""), variants)
+        if encoding is None:
+            return Response(status_code=406, headers={"Vary": "Accept-Encoding"})
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=variants[encoding], media_type=self.media_type, headers=headers)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison: W/"x" matches "x"
+    return "*" in candidates or any(tag.replace("W/", "", 1) == etag for tag in candidates)
+
+
+def negotiate_encoding(accept_encoding: str, available) -> Optional[str]:
+    """
+    Pick the best available encoding for an Accept-Encoding header.
+
+    identity is acceptable unless excluded with identity;q=0 (or *;q=0);
+    returns None when nothing available is acceptable.
+    """
+    qualities = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        qualities[token] = q
+
+    wildcard = qualities.get("*")
+    best, best_q = None, 0.0
+    for encoding in ENCODING_PREFERENCE:
+        if encoding not in available:
+            continue
+        q = qualities.get(encoding, wildcard if wildcard is not None else (1.0 if encoding == "identity" else 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class AssetStore:
+    """Registry of in-memory assets with optional file-watch reload for development"""
+
+    def __init__(self):
+        self.assets: Dict[str, StaticAsset] = {}
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def register(self, name: str, path: str, media_type: str) -> Optional[StaticAsset]:
+        """Load a file into memory; a missing file stays registered so the watcher loads it once it appears"""
+        asset = StaticAsset(path, media_type)
+        try:
+            asset.load()
+        except FileNotFoundError:
+            logger.warning(f"Static asset not found: {path}")
+        self.assets[name] = asset
+        return asset
+
+    def get(self, name: str) -> Optional[StaticAsset]:
+        """The asset, None when it is unknown or its file has not been loaded yet"""
+        asset = self.assets.get(name)
+        return asset if asset is not None and asset.loaded else None
+
+    def start_watching(self, interval: float = STATIC_RELOAD_INTERVAL):
+        """Poll file modification times and reload changed assets"""
+        if self._watcher is not None:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval,), name="static-watch", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=1)
+        self._watcher = None
+
+    def _watch(self, interval: float):
+        while not self._stop.wait(interval):
+            for asset in list(self.assets.values()):
+                if asset.is_stale():
+                    try:
+                        asset.load()
+                        logger.info(f"Reloaded static asset: {asset.path}")
+                    except OSError as e:
+                        logger.error(f"Failed to reload {asset.path}: {e}")
+
+
+asset_store = AssetStore()
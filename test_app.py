@@ -135,5 +135,259 @@ def test_application():
         except:
             pass
 
+def test_cross_worker_invalidation():
+    """A write served by one worker is visible to reads served by every worker"""
+    
+    print("\n🔁 Testing cross-worker cache invalidation")
+    print("=" * 50)
+    if not hasattr(os, "fork"):
+        print("⚠️  Skipped: start_app.py --prod needs fork")
+        return
+    
+    poll_interval = 0.2
+    workers = 3
+    reads = 30  # per check, enough to land on every worker
+    
+    process, base_url = _start_server(workers=workers, INVALIDATION_POLL_INTERVAL=str(poll_interval))
+    try:
+        # Load the profile registry and skill index in every worker before writing
+        for _ in range(reads):
+            requests.get(f"{base_url}/profiles/0/skills", timeout=5)
+            requests.get(f"{base_url}/profiles/match?q=zigzaglang", timeout=5)
+        
+        profile = requests.post(f"{base_url}/profiles", json={
+            "name": "Worker Test", "email": "workers@example.com",
+        }, timeout=5).json()
+        response = requests.post(f"{base_url}/profiles/{profile['id']}/skills", json={
+            "name": "Zigzaglang", "level": "expert", "category": "programming",
+        }, timeout=5)
+        assert response.status_code == 200, response.text
+        time.sleep(poll_interval * 5)
+        
+        found = [requests.get(f"{base_url}/profiles/{profile['id']}/skills", timeout=5).status_code for _ in range(reads)]
+        assert found == [200] * reads, f"stale profile registry: {found}"
+        matched = [requests.get(f"{base_url}/profiles/match?q=zigzaglang", timeout=5).json()["total"] for _ in range(reads)]
+        assert matched == [1] * reads, f"stale skill index: {matched}"
+        print(f"✅ Create visible on all {workers} workers")
+        
+        assert requests.delete(f"{base_url}/profiles/{profile['id']}", timeout=5).status_code == 200
+        time.sleep(poll_interval * 5)
+        
+        found = [requests.get(f"{base_url}/profiles/{profile['id']}/skills", timeout=5).status_code for _ in range(reads)]
+        assert found == [404] * reads, f"stale profile registry: {found}"
+        matched = [requests.get(f"{base_url}/profiles/match?q=zigzaglang", timeout=5).json()["total"] for _ in range(reads)]
+        assert matched == [0] * reads, f"stale skill index: {matched}"
+        print(f"✅ Delete visible on all {workers} workers")
+    finally:
+        _stop_server(process)
+
+def test_child_ordering():
+    """Nested routes, complete profiles and sparse fieldsets list a profile's children in the same order"""
+    
+    print("\n🔢 Testing child ordering")
+    print("=" * 50)
+    if not hasattr(os, "fork"):
+        print("⚠️  Skipped: start_app.py --prod needs fork")
+        return
+    
+    process, base_url = _start_server()
+    try:
+        routes = {"skills": "skills", "projects": "projects", "work_experiences": "work", "links": "links"}
+        profiles = requests.get(f"{base_url}/profiles", timeout=5).json()
+        assert profiles, "seeded database has no profiles"
+        for profile in profiles:
+            complete = requests.get(f"{base_url}/profiles/{profile['id']}", timeout=5).json()
+            sparse = requests.get(f"{base_url}/profiles/{profile['id']}?include={','.join(routes)}", timeout=5).json()
+            for relation, route in routes.items():
+                nested = requests.get(f"{base_url}/profiles/{profile['id']}/{route}", timeout=5).json()
+                ids = [child["id"] for child in nested]
+                assert ids == [child["id"] for child in complete[relation]], f"{relation} of {profile['id']}: {ids}"
+                assert ids == [child["id"] for child in sparse[relation]], f"{relation} of {profile['id']}: {ids}"
+                if relation == "work_experiences":
+                    expected = sorted(nested, key=lambda w: w["id"])
+                    expected.sort(key=lambda w: w["start_date"], reverse=True)
+                    assert ids == [w["id"] for w in expected], f"work of {profile['id']}: {ids}"
+                else:
+                    assert ids == sorted(ids), f"{relation} of {profile['id']} not in insertion order: {ids}"
+        print("✅ Children listed in the same order on every path")
+    finally:
+        _stop_server(process)
+
+def test_profile_filters():
+    """The filter expression language on GET /profiles: operators, quoting, wildcards, escaping and plans"""
+    
+    print("\n🔎 Testing profile filters")
+    print("=" * 50)
+    if not hasattr(os, "fork"):
+        print("⚠️  Skipped: start_app.py --prod needs fork")
+        return
+    
+    process, base_url = _start_server()
+    try:
+        def names(expression):
+            response = requests.get(f"{base_url}/profiles", params={"filter": expression}, timeout=5)
+            assert response.status_code == 200, f"{expression}: {response.text}"
+            return sorted(profile["name"] for profile in response.json())
+        
+        everyone = sorted(profile["name"] for profile in requests.get(f"{base_url}/profiles", timeout=5).json())
+        assert everyone, "seeded database has no profiles"
+        assert names("skill:python") == ["Jane Smith", "John Doe"]
+        assert names("NOT skill:python") == [n for n in everyone if n not in ("Jane Smith", "John Doe")]
+        # AND binds tighter than OR; juxtaposition is AND
+        assert names('(location:seattle OR location:"los angeles") skill:python') == ["Jane Smith"]
+        assert names('location:seattle OR location:"los angeles" skill:python') == ["Jane Smith"]
+        assert names('location:"San Francisco" AND skill:python') == ["John Doe"]
+        assert names("skill:py*") == ["Jane Smith", "John Doe"]
+        assert names("skill:*script") == ["John Doe"]
+        # % and _ are literals, not LIKE wildcards
+        assert names("name:%") == []
+        assert names("name:_") == []
+        assert names("skill:p%") == []
+        print("✅ Operators, quoting, wildcards and LIKE escaping")
+        
+        for expression in ("skill:", "skill:python AND", "(skill:python", "colour:red", "skill:python XOR level:expert"):
+            response = requests.get(f"{base_url}/profiles", params={"filter": expression}, timeout=5)
+            assert response.status_code == 400, f"{expression}: {response.status_code}"
+        print("✅ Malformed expressions rejected with 400")
+        
+        def counter(name):
+            return requests.get(f"{base_url}/metrics", timeout=5).json()["counters"].get(name, 0)
+        
+        hits = counter("filters.plan_cache_hits")
+        assert names("skill:rust AND location:austin") == []
+        assert names("skill:swift AND location:angeles") == ["Mike Johnson"]
+        assert counter("filters.plan_cache_hits") == hits + 1, "same shape should reuse the compiled plan"
+        explained = requests.get(f"{base_url}/profiles", params={"filter": "skill:python", "explain": "true"}, timeout=5).json()
+        assert "EXISTS" in explained["sql"].upper(), explained["sql"]
+        assert "python" in explained["parameters"].values(), explained["parameters"]
+        assert explained["plan"], "SQLite should report a query plan"
+        print("✅ Plans cached by shape and explained")
+    finally:
+        _stop_server(process)
+
+def test_read_model():
+    """READ_MODEL=memory answers like the database path, before and after writes and overlay compactions"""
+    
+    print("\n🧠 Testing in-memory read model")
+    print("=" * 50)
+    if not hasattr(os, "fork"):
+        print("⚠️  Skipped: start_app.py --prod needs fork")
+        return
+    
+    # Slow enough that the change log cannot repair the read model's own writes before they are compared
+    poll_interval = 3
+    database_url = _seeded_database()
+    # Both servers share one database; the second only reads through SQL
+    memory, memory_url = _start_server(database_url=database_url, READ_MODEL="memory", READ_MODEL_MAX_OVERLAY="1",
+                                       INVALIDATION_POLL_INTERVAL=str(poll_interval))
+    try:
+        sql, sql_url = _start_server(database_url=database_url)
+    except Exception:
+        _stop_server(memory)
+        raise
+    try:
+        def compare(step):
+            profiles = requests.get(f"{sql_url}/profiles", timeout=5).json()
+            paths = ["/profiles", "/profiles?skip=1&limit=2", "/skills/search?skill=a", "/skills/search?skill=py&level=expert",
+                     "/skills/top?limit=100", "/stats", "/profiles/999999"]
+            paths += [f"/profiles/{profile['id']}" for profile in profiles]
+            for path in paths:
+                expected = requests.get(f"{sql_url}{path}", timeout=5)
+                actual = requests.get(f"{memory_url}{path}", timeout=5)
+                assert actual.status_code == expected.status_code, f"{step}: {path} {actual.status_code} != {expected.status_code}"
+                assert actual.json() == expected.json(), f"{step}: {path} differs"
+        
+        def compactions():
+            return requests.get(f"{memory_url}/metrics", timeout=5).json()["counters"].get("read_model.compactions", 0)
+        
+        compare("initial load")
+        print("✅ Initial load matches the database")
+        
+        # One changed profile stays in the overlay; a second one exceeds READ_MODEL_MAX_OVERLAY=1
+        before = compactions()
+        response = requests.post(f"{memory_url}/profiles/1/skills", json={
+            "name": "Haskell", "level": "beginner", "category": "programming",
+        }, timeout=5)
+        assert response.status_code == 200, response.text
+        compare("overlay write")
+        assert compactions() == before, "a single changed profile should not compact"
+        response = requests.put(f"{memory_url}/profiles/2", json={"location": "Portland, OR"}, timeout=5)
+        assert response.status_code == 200, response.text
+        compare("compacting write")
+        assert compactions() > before, "overlay larger than READ_MODEL_MAX_OVERLAY should compact"
+        print("✅ Writes match the database before and after compaction")
+        
+        created = requests.post(f"{memory_url}/profiles", json={"name": "Read Model", "email": "read-model@example.com"}, timeout=5).json()
+        requests.post(f"{memory_url}/profiles/{created['id']}/skills", json={
+            "name": "Python", "level": "expert", "category": "programming",
+        }, timeout=5)
+        assert requests.delete(f"{memory_url}/profiles/3", timeout=5).status_code == 200
+        compare("create and delete")
+        
+        # Writes served by another process reach the read model through the change log
+        response = requests.post(f"{sql_url}/profiles/{created['id']}/projects", json={
+            "title": "Columnar", "description": "Arrays", "technologies": ["NumPy"],
+        }, timeout=5)
+        assert response.status_code == 200, response.text
+        assert requests.delete(f"{sql_url}/profiles/1", timeout=5).status_code == 200
+        time.sleep(poll_interval * 2)
+        compare("writes from another process")
+        print("✅ Creates, deletes and other processes' writes match the database")
+    finally:
+        _stop_server(sql)
+        _stop_server(memory)
+
+def _seeded_database():
+    """Create and seed a throwaway SQLite database; returns its URL"""
+    import tempfile
+    
+    database_url = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+    env = dict(os.environ, DATABASE_URL=database_url)
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    for script in ("create_tables.py", "seed_database.py"):
+        subprocess.run([sys.executable, script], cwd=cwd, env=env, check=True, stdout=subprocess.DEVNULL)
+    return database_url
+
+def _start_server(workers=1, database_url=None, **env_overrides):
+    """Serve a database (a fresh seeded one by default) with start_app.py --prod on a free port; returns (process, base_url)"""
+    import socket
+    
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}"
+    
+    env = dict(os.environ, DATABASE_URL=database_url or _seeded_database(), ADMISSION_RATE="1000", ADMISSION_BURST="1000",
+               **env_overrides)
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    process = subprocess.Popen(
+        [sys.executable, "start_app.py", "--prod", "--workers", str(workers), "--host", "127.0.0.1", "--port", str(port)],
+        cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while True:
+        try:
+            if requests.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return process, base_url
+        except requests.ConnectionError:
+            pass
+        if time.time() > deadline:
+            _stop_server(process)
+            raise AssertionError("server did not start")
+        time.sleep(0.5)
+
+def _stop_server(process):
+    import signal
+    
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
 if __name__ == "__main__":
-    test_application()
\ No newline at end of file
+    test_application()
+    test_cross_worker_invalidation()
+    test_child_ordering()
+    test_profile_filters()
+    test_read_model()
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""
+Write coalescing queue for Me-API Playground
+A single writer task group-commits concurrent small writes in one transaction
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Callable, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from database import SessionLocal, write_engine
+from metrics import metrics
+from profile_registry import profile_ids
+from read_model import read_model
+from skill_index import skill_index
+
+logger = logging.getLogger(__name__)
+
+WRITE_COALESCING = os.getenv("WRITE_COALESCING", "true").lower() in ("1", "true", "yes")
+WRITE_BATCH_SIZE = int(os.getenv("WRITE_BATCH_SIZE", "32"))
+WRITE_BATCH_WINDOW_MS = float(os.getenv("WRITE_BATCH_WINDOW_MS", "5"))
+WRITE_QUEUE_SIZE = int(os.getenv("WRITE_QUEUE_SIZE", "1000"))
+
+
+class QueueFullError(Exception):
+    """Raised when the write queue is at capacity"""
+
+
+class _PendingWrite:
+    __slots__ = ("fn", "args", "future", "enqueued_at")
+
+    def __init__(self, fn: Callable, args: tuple, future: asyncio.Future):
+        self.fn = fn
+        self.args = args
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+
+class WriteCoalescer:
+    """
+    Collects write operations and runs them in batches.
+
+    An operation is any profile_crud function taking a Session as its first
+    argument. Each operation runs inside its own SAVEPOINT, so one failure
+    only affects its own caller; the batch is committed once at the end.
+
+    Args:
+        batch_size: Maximum operations per transaction
+        window_ms: How long to wait for more operations after the first one
+        maxsize: Queue capacity; submit() raises QueueFullError beyond it
+    """
+
+    def __init__(self, batch_size: int = WRITE_BATCH_SIZE, window_ms: float = WRITE_BATCH_WINDOW_MS,
+                 maxsize: int = WRITE_QUEUE_SIZE):
+        self.batch_size = batch_size
+        self.window = window_ms / 1000.0
+        self.maxsize = maxsize
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._task = asyncio.create_task(self._run(), name="write-coalescer")
+
+    async def stop(self):
+        """Finish queued writes, then stop the writer task"""
+        if not self.running:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def submit(self, fn: Callable, *args) -> Any:
+        """Queue fn(session, *args) and wait for its result (or exception)"""
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait(_PendingWrite(fn, args, future))
+        except asyncio.QueueFull:
+            metrics.inc("write_queue.rejected")
+            raise QueueFullError("Write queue is full")
+        return await future
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = time.perf_counter() + self.window
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            started = time.perf_counter()
+            metrics.observe("write_queue.batch_size", len(batch))
+            for pending in batch:
+                metrics.observe("write_queue.wait_seconds", started - pending.enqueued_at)
+            try:
+                outcomes = await run_in_threadpool(self._execute, batch)
+            except Exception as e:
+                logger.error(f"Write batch of {len(batch)} failed: {e}")
+                metrics.inc("write_queue.failed_batches")
+                # Registry updates made inside the failed transaction may be wrong
+                profile_ids.invalidate()
+                skill_index.invalidate()
+                read_model.invalidate()
+                outcomes = [(False, e)] * len(batch)
+            metrics.observe("write_queue.batch_seconds", time.perf_counter() - started)
+
+            for pending, (ok, value) in zip(batch, outcomes):
+                if not pending.future.done():
+                    if ok:
+                        pending.future.set_result(value)
+                    else:
+                        pending.future.set_exception(value)
+                self._queue.task_done()
+
+    def _execute(self, batch: List[_PendingWrite]):
+        """Run a batch in one transaction; returns (ok, result_or_exception) per item"""
+        outcomes = []
+        with write_engine.connect() as connection:
+            transaction = connection.begin()
+            for pending in batch:
+                # commit()/rollback() inside profile_crud only touch this SAVEPOINT
+                db = SessionLocal(bind=connection, join_transaction_mode="create_savepoint")
+                try:
+                    outcomes.append((True, pending.fn(db, *pending.args)))
+                except Exception as e:
+                    db.rollback()
+                    outcomes.append((False, e))
+                finally:
+                    db.close()
+            transaction.commit()
+        metrics.inc("write_queue.batches")
+        metrics.inc("write_queue.operations", len(batch))
+        return outcomes
+
+
+write_queue = WriteCoalescer()